@@ -0,0 +1,57 @@
+"""
+Medições do ajuste automático: custo de cada combinação e perfil escolhido
+
+Carrega o detector, mede largura x entrada x threads (com frames sintéticos
+ou de um clipe gravado) e mostra as estimativas de FPS e latência de cada
+intervalo de detecção, marcando as que atendem às metas. Não grava o perfil,
+a menos que --save seja informado.
+
+Uso:
+    python benchmarks/auto_tuner.py --target-fps 15 --latency-budget 250
+    python benchmarks/auto_tuner.py --clip gravacao_porta.mp4 --detector yunet --save
+"""
+import argparse
+import os
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.auto_tuner import AutoTuner, PROFILE_FILE
+from modules.face_detector import create_face_detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste automático: medições e perfil escolhido")
+    parser.add_argument("--target-fps", type=float, default=15.0)
+    parser.add_argument("--latency-budget", type=float, default=250.0, help="Meta de latência (ms)")
+    parser.add_argument("--clip", help="Clipe gravado (padrão: frames sintéticos 1280x720)")
+    parser.add_argument("--detector", default="ssd", choices=["ssd", "ssd_onnx", "yunet"])
+    parser.add_argument("--model", help="Modelo do detector (obrigatório para ssd_onnx)")
+    parser.add_argument("--threads", help="Threads do OpenCV a testar, separadas por vírgula")
+    parser.add_argument("--save", action="store_true", help=f"Grava o perfil em {PROFILE_FILE}")
+    args = parser.parse_args()
+    
+    threads = [int(n) for n in args.threads.split(",")] if args.threads else None
+    tuner = AutoTuner(args.target_fps, args.latency_budget, clip=args.clip,
+                      profile_path=PROFILE_FILE if args.save else None, thread_counts=threads)
+    detector = create_face_detector(args.detector, model_path=args.model)
+    tuner.measure(detector, args.detector)
+    
+    print(f"Meta: {args.target_fps:.1f} FPS, {args.latency_budget:.0f} ms  CPUs: {os.cpu_count()}  "
+          f"Threads testadas: {tuner.thread_counts}\n")
+    print(f"{'largura':>8}{'entrada':>9}{'intervalo':>11}{'threads':>9}{'FPS':>9}{'lat. ms':>9}  meta")
+    for profile in tuner.candidates():
+        print(f"{profile.max_width:>8}{profile.input_size:>9}{profile.detection_interval:>11}"
+              f"{profile.num_threads:>9}{profile.fps_estimado:>9.1f}{profile.latencia_estimada_ms:>9.1f}"
+              f"  {'sim' if profile.atende_meta else ''}")
+    
+    profile = tuner.choose()
+    print(f"\nEscolhido: {profile.describe()}" + ("" if profile.atende_meta else " (nenhum atende às metas)"))
+    if args.save:
+        tuner.save_profile(profile)
+        print(f"Perfil gravado em {PROFILE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compara a vazão da detecção frame a frame com a detecção em lote
+
+Simula N câmeras (threads) enviando frames ao mesmo tempo.
+
+Uso:
+    python benchmarks/batch_detection.py --streams 4 --frames 50 --batch 4 --wait 0.01
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from modules.face_detector import create_face_detector
+from modules.batch_detection import BatchDetectionService
+
+
+def make_frames(count: int, width: int, height: int):
+    """Frames sintéticos (o custo do forward não depende do conteúdo)"""
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def run_streams(detect, streams: int, frames):
+    """Roda 'streams' threads chamando detect() em todos os frames; retorna frames/s"""
+    def stream():
+        for frame in frames:
+            detect(frame)
+    
+    threads = [threading.Thread(target=stream) for _ in range(streams)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return streams * len(frames) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detecção frame a frame vs em lote")
+    parser.add_argument("--streams", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=50, help="Frames por stream")
+    parser.add_argument("--batch", type=int, default=4, help="Tamanho máximo do lote")
+    parser.add_argument("--wait", type=float, default=0.01, help="Espera máxima do lote (s)")
+    parser.add_argument("--threads", type=int, default=None, help="Threads do OpenCV")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+    
+    frames = make_frames(args.frames, args.width, args.height)
+    detector = create_face_detector("ssd", num_threads=args.threads)
+    detector.detect(frames[0])  # Aquecimento
+    
+    # Frame a frame: um forward por chamada (serializado, como num único detector)
+    lock = threading.Lock()
+    def detect_single(frame):
+        with lock:
+            detector.detect(frame)
+    
+    fps_single = run_streams(detect_single, args.streams, frames)
+    
+    service = BatchDetectionService(detector, max_batch_size=args.batch, max_wait=args.wait)
+    service.start()
+    try:
+        fps_batch = run_streams(service.detect, args.streams, frames)
+        stats = service.stats()
+    finally:
+        service.stop()
+    
+    print(f"Streams: {args.streams}  Frames/stream: {args.frames}  Lote: {args.batch}  Espera: {args.wait * 1000:.0f} ms")
+    print(f"Frame a frame : {fps_single:8.1f} frames/s")
+    print(f"Em lote       : {fps_batch:8.1f} frames/s  ({stats['frames_por_lote']:.2f} frames/lote)")
+    print(f"Ganho         : {fps_batch / fps_single:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compara detectores de faces (velocidade na CPU e concordância com o SSD padrão)
+
+Uso:
+    python benchmarks/compare_detectors.py --frames 100
+    python benchmarks/compare_detectors.py --images pasta_com_fotos --yunet face_detection_yunet_2023mar.onnx
+"""
+import argparse
+import os
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+
+from modules.face_detector import create_face_detector, compare_detectors
+
+
+def load_frames(args):
+    """Carrega frames de uma pasta de imagens, de um vídeo ou da webcam"""
+    frames = []
+    if args.images:
+        for name in sorted(os.listdir(args.images)):
+            if name.lower().endswith(('.jpg', '.jpeg', '.png')):
+                image = cv2.imread(os.path.join(args.images, name))
+                if image is not None:
+                    frames.append(image)
+        return frames[:args.frames]
+    
+    camera = cv2.VideoCapture(args.video if args.video else 0)
+    while len(frames) < args.frames:
+        ret, frame = camera.read()
+        if not ret:
+            break
+        frames.append(frame)
+    camera.release()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparação de detectores de faces")
+    parser.add_argument("--frames", type=int, default=100, help="Número de frames avaliados")
+    parser.add_argument("--images", help="Pasta de imagens (padrão: webcam)")
+    parser.add_argument("--video", help="Arquivo de vídeo (padrão: webcam)")
+    parser.add_argument("--threads", type=int, default=None, help="Threads do OpenCV")
+    parser.add_argument("--backend", default="default")
+    parser.add_argument("--target", default="cpu")
+    parser.add_argument("--yunet", help="Modelo ONNX do YuNet")
+    parser.add_argument("--ssd-onnx", help="Modelo ONNX do SSD (ex: quantizado)")
+    parser.add_argument("--sizes", default="300,240,160",
+                        help="Tamanhos de entrada do SSD a comparar")
+    args = parser.parse_args()
+    
+    frames = load_frames(args)
+    if not frames:
+        print("Nenhum frame disponível para comparação.")
+        sys.exit(1)
+    
+    options = dict(backend=args.backend, target=args.target, num_threads=args.threads)
+    reference = create_face_detector("ssd", **options)
+    
+    candidates = {}
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        if size != 300:
+            candidates[f"ssd_{size}"] = create_face_detector("ssd", input_size=(size, size), **options)
+    if args.ssd_onnx:
+        candidates["ssd_onnx"] = create_face_detector("ssd_onnx", model_path=args.ssd_onnx, **options)
+    if args.yunet:
+        candidates["yunet"] = create_face_detector("yunet", model_path=args.yunet, **options)
+    
+    print(f"Comparando {len(candidates) + 1} detector(es) em {len(frames)} frame(s)...\n")
+    report = compare_detectors(reference, candidates, frames)
+    
+    print(f"{'detector':<14} {'ms médio':>9} {'ms p95':>8} {'FPS':>7} {'precisão':>9} {'recall':>7}")
+    for name, stats in report.items():
+        print(f"{name:<14} {stats['ms_medio']:9.2f} {stats['ms_p95']:8.2f} {stats['fps']:7.1f} "
+              f"{stats['precisao']:9.2%} {stats['recall']:7.2%}")
+    print("\nPrecisão/recall medidos contra o SSD padrão (300x300) como referência.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Banda e latência do modo borda (recortes) comparado ao envio de frames
+
+Sobe um servidor central substituto local (classificação simulada com custo
+fixo, sem modelos nem banco) ou usa um central real, e simula N portas
+enviando recortes de M trilhas por frame.
+
+Uso:
+    python benchmarks/edge_protocol.py --doors 4 --frames 100 --faces 2
+    python benchmarks/edge_protocol.py --central 127.0.0.1:8766
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from modules.edge_protocol import EdgeClient, EdgeRecognitionServer, FACE_HEIGHT, FACE_WIDTH
+
+
+class StandInService:
+    """Central substituto: classifica pelo brilho médio após um custo fixo"""
+    
+    def __init__(self, cost: float, workers: int):
+        self.cost = cost
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers * 4)
+    
+    def submit_async(self, fn, *args, block: bool = True):
+        self._slots.acquire()
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+    
+    def classify(self, crop):
+        time.sleep(self.cost)
+        return int(crop.mean()) % 3, 42.0
+    
+    def decide(self, face_id, conf, door_id, register=False):
+        if face_id is None:
+            return {'resultado': 'desconhecido', 'usuario_id': None, 'confianca': conf,
+                    'nome_face': None, 'nome': 'Desconhecido'}
+        return {'resultado': 'liberado', 'usuario_id': face_id, 'confianca': conf,
+                'nome_face': f"pessoa_{face_id}", 'nome': f"Pessoa {face_id}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modo borda: banda e latência")
+    parser.add_argument("--central", help="HOST:PORTA de um central real (padrão: substituto local)")
+    parser.add_argument("--doors", type=int, default=4, help="Portas simultâneas")
+    parser.add_argument("--frames", type=int, default=100, help="Frames por porta")
+    parser.add_argument("--faces", type=int, default=2, help="Faces (trilhas) por frame")
+    parser.add_argument("--fps", type=float, default=15.0, help="Frames por segundo de cada porta")
+    parser.add_argument("--cost", type=float, default=0.002, help="Custo simulado do predict (s)")
+    parser.add_argument("--workers", type=int, default=4, help="Workers do central substituto")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+    
+    server = None
+    if args.central:
+        host, _, port = args.central.rpartition(":")
+        port = int(port)
+    else:
+        server = EdgeRecognitionServer(StandInService(args.cost, args.workers), port=0)
+        host, port = "127.0.0.1", server.start()
+    
+    rng = np.random.default_rng(0)
+    # Ruído suavizado: comprime em JPEG mais perto de uma cena real do que ruído puro
+    frame = cv2.GaussianBlur(rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8), (0, 0), 3)
+    crops = [rng.integers(0, 255, (FACE_HEIGHT, FACE_WIDTH), dtype=np.uint8) for _ in range(args.faces)]
+    jpeg_frame = len(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])[1])
+    
+    latencies = []
+    decided = set()
+    lock = threading.Lock()
+    
+    def on_decision(decision):
+        with lock:
+            if 'latencia' in decision:
+                latencies.append(decision['latencia'])
+            if decision['resultado'] not in ('pendente', 'erro'):
+                decided.add(decision['track_id'])
+    
+    clients = [EdgeClient(host, port, door_id=f"bench-{i}", on_decision=on_decision)
+               for i in range(args.doors)]
+    
+    def door(client, index):
+        interval = 1.0 / args.fps if args.fps > 0 else 0.0
+        for n in range(args.frames):
+            start = time.perf_counter()
+            for face, crop in enumerate(crops):
+                # Uma trilha nova a cada 30 frames (nova passagem pela porta);
+                # como na porta real, trilhas decididas param de enviar recortes
+                track_id = index * 100000 + (n // 30) * 100 + face
+                if track_id not in decided:
+                    client.send_face(track_id, crop, 0.9)
+            remaining = interval - (time.perf_counter() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+    
+    threads = [threading.Thread(target=door, args=(c, i)) for i, c in enumerate(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    deadline = time.time() + 5.0
+    while any(c.pending() for c in clients) and time.time() < deadline:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    
+    stats = [c.stats() for c in clients]
+    for c in clients:
+        c.close()
+    if server:
+        server.stop()
+    
+    sent = sum(s['recortes'] for s in stats)
+    dropped = sum(s['descartados'] for s in stats)
+    bytes_sent = sum(s['bytes_enviados'] for s in stats)
+    frames = args.doors * args.frames
+    
+    print(f"Portas: {args.doors}  Frames/porta: {args.frames}  Faces/frame: {args.faces}  "
+          f"FPS/porta: {args.fps:g}  Central: {'real' if args.central else 'substituto'}")
+    print(f"Recortes enviados: {sent}  descartados: {dropped}  respostas: {len(latencies)}")
+    print(f"Banda (recortes)  : {bytes_sent / frames / 1024:8.1f} KB/frame  "
+          f"{bytes_sent / elapsed / 1024:8.1f} KB/s")
+    print(f"Banda (JPEG q=90) : {jpeg_frame / 1024:8.1f} KB/frame  "
+          f"{jpeg_frame * frames / elapsed / 1024:8.1f} KB/s  ({args.width}x{args.height})")
+    print(f"Banda (bruto)     : {frame.nbytes / 1024:8.1f} KB/frame")
+    if latencies:
+        ms = np.array(latencies) * 1000
+        print(f"Latência ida e volta: p50 {np.percentile(ms, 50):.2f} ms  "
+              f"p95 {np.percentile(ms, 95):.2f} ms  máx {ms.max():.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Vazão do anel de frames em memória compartilhada (modo multiprocesso)
+
+Compara o processo único (captura e trabalho no mesmo laço) com o anel +
+N processos leitores. O trabalho por frame mistura OpenCV (cinza, blur,
+redimensionamento) e Python puro sobre os pixels, como a cola do
+pipeline real; a captura é sintética, na taxa pedida (0 = o mais rápido
+possível, para medir overruns).
+
+Uso:
+    python benchmarks/frame_ring.py --processes 1 2 4 --seconds 5
+    python benchmarks/frame_ring.py --fps 30 --work 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from utils.frame_ring import FrameRing, RingReader
+
+
+def make_frames(width: int, height: int, count: int = 8):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def work(frame: np.ndarray, reps: int) -> int:
+    """Trabalho simulado de um frame (parte no OpenCV, parte em Python)"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    total = 0
+    for _ in range(reps):
+        blurred = cv2.GaussianBlur(gray, (9, 9), 0)
+        small = cv2.resize(blurred, (90, 120))
+        total += sum(int(v) for v in small[::2, ::2].ravel())
+    return total
+
+
+def _writer(ring_name, width, height, fps, seconds, start_event):
+    ring = FrameRing.attach(ring_name)
+    frames = make_frames(width, height)
+    start_event.wait()
+    interval = 1.0 / fps if fps > 0 else 0.0
+    start = time.perf_counter()
+    n = 0
+    while time.perf_counter() - start < seconds:
+        frame_no, slot = ring.reserve(height, width)
+        slot[...] = frames[n % len(frames)]
+        ring.commit(frame_no)
+        n += 1
+        if interval:
+            delay = start + n * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    slot = None
+    ring.close()
+
+
+def _reader(ring_name, index, count, reps, stop_event, start_event, results):
+    cv2.setNumThreads(1)
+    ring = FrameRing.attach(ring_name)
+    reader = RingReader(ring, index, count)
+    start_event.wait()
+    useful = 0
+    while not stop_event.is_set():
+        view = reader.next(timeout=0.05)
+        if view is None:
+            continue
+        work(view.frame, reps)
+        if reader.check(view):
+            useful += 1
+        view = None
+    results.put(dict(reader.stats(), uteis=useful))
+    ring.close()
+
+
+def run_single(width, height, fps, seconds, reps):
+    """Processo único: captura e trabalho em sequência"""
+    cv2.setNumThreads(1)
+    frames = make_frames(width, height)
+    interval = 1.0 / fps if fps > 0 else 0.0
+    start = time.perf_counter()
+    captured = processed = 0
+    next_capture = start
+    while time.perf_counter() - start < seconds:
+        now = time.perf_counter()
+        if interval:
+            # Frames que a câmera entregou enquanto o laço trabalhava são perdidos
+            if now < next_capture:
+                time.sleep(next_capture - now)
+            missed = int((time.perf_counter() - next_capture) // interval)
+            captured += missed + 1
+            next_capture += (missed + 1) * interval
+        else:
+            captured += 1
+        frame = frames[captured % len(frames)].copy()
+        work(frame, reps)
+        processed += 1
+    elapsed = time.perf_counter() - start
+    return captured, processed, 0, 0, elapsed
+
+
+def run_ring(processes, width, height, fps, seconds, reps, slots):
+    """Anel + N processos leitores"""
+    ctx = mp.get_context("spawn")
+    ring = FrameRing.create(slots, height, width)
+    stop_event, start_event = ctx.Event(), ctx.Event()
+    results = ctx.Queue()
+    readers = [ctx.Process(target=_reader, args=(ring.name, i, processes, reps, stop_event, start_event, results))
+               for i in range(processes)]
+    writer = ctx.Process(target=_writer, args=(ring.name, width, height, fps, seconds, start_event))
+    for p in readers + [writer]:
+        p.start()
+    
+    time.sleep(1.0)  # Processos importam cv2/numpy antes de começar
+    start = time.perf_counter()
+    start_event.set()
+    writer.join()
+    elapsed = time.perf_counter() - start
+    stop_event.set()
+    stats = [results.get() for _ in readers]
+    for p in readers:
+        p.join()
+    
+    captured = ring.latest
+    ring.close()
+    ring.unlink()
+    useful = sum(s['uteis'] for s in stats)
+    return (captured, useful, sum(s['overruns'] for s in stats), sum(s['rasgados'] for s in stats), elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão do anel de frames")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4],
+                        help="Números de processos leitores a medir")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=30.0, help="Taxa da captura (0 = sem limite)")
+    parser.add_argument("--work", type=int, default=4, help="Repetições do trabalho por frame")
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+    
+    frame = make_frames(args.width, args.height, 1)[0]
+    start = time.perf_counter()
+    for _ in range(10):
+        work(frame, args.work)
+    cost = (time.perf_counter() - start) / 10
+    
+    print(f"Frame {args.width}x{args.height}  captura {args.fps:g} fps  slots {args.slots}  "
+          f"trabalho {cost * 1000:.1f} ms/frame  CPUs {os.cpu_count()}")
+    print(f"{'modo':<18}{'capturados/s':>14}{'processados/s':>15}{'overruns':>10}{'sobrescritos':>14}")
+    
+    rows = [("processo único", run_single(args.width, args.height, args.fps, args.seconds, args.work))]
+    for n in args.processes:
+        rows.append((f"anel + {n} proc.", run_ring(n, args.width, args.height, args.fps, args.seconds,
+                                                    args.work, args.slots)))
+    
+    for name, (captured, processed, overruns, torn, elapsed) in rows:
+        print(f"{name:<18}{captured / elapsed:>14.1f}{processed / elapsed:>15.1f}{overruns:>10}{torn:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Acurácia e latência do reconhecimento por número de protótipos por pessoa
+
+Usa o dataset cadastrado (dataset_packed/ e dataset/), separa parte das
+amostras de cada pessoa para teste e compara a galeria completa com
+galerias compactadas em k protótipos (medoides do k-means).
+
+Uso:
+    python benchmarks/gallery_compaction.py --ks 1,3,5,10 --recognizer lbph
+"""
+import argparse
+import os
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.training_module import TrainingModule, RECOGNIZER_FACTORIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compactação da galeria de faces")
+    parser.add_argument("--ks", default="1,3,5,10", help="Protótipos por pessoa a avaliar")
+    parser.add_argument("--recognizer", default="lbph", choices=sorted(RECOGNIZER_FACTORIES))
+    parser.add_argument("--test-fraction", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dataset", default="dataset/")
+    parser.add_argument("--store", default="dataset_packed")
+    args = parser.parse_args()
+    
+    ks = [None] + [int(k) for k in args.ks.split(",") if k.strip()]
+    training = TrainingModule(args.dataset, args.store)
+    
+    try:
+        results = training.evaluate_compaction(ks, args.recognizer, args.test_fraction, args.seed)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Não foi possível avaliar: {e}")
+        sys.exit(1)
+    
+    print(f"Reconhecedor: {args.recognizer}  Teste: {args.test_fraction:.0%} das amostras de cada pessoa\n")
+    print(f"{'k':>9} {'amostras':>9} {'acurácia':>9} {'ms médio':>9} {'ms p95':>8} {'treino s':>9}")
+    for r in results:
+        k = "completa" if r['k'] is None else str(r['k'])
+        print(f"{k:>9} {r['amostras']:9d} {r['acuracia']:9.2%} {r['ms_medio']:9.3f} "
+              f"{r['ms_p95']:8.3f} {r['treino_s']:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
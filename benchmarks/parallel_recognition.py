@@ -0,0 +1,120 @@
+"""
+Predict das faces de um frame: sequencial, threads e processos
+
+Treina um reconhecedor com faces sintéticas num diretório temporário (ou usa
+o modelo treinado do diretório atual com --trained) e mede o tempo para
+classificar de 1 a 20 faces por frame em cada modo. Confere também que os
+modos paralelos devolvem exatamente os mesmos resultados, na mesma ordem.
+
+Uso:
+    python benchmarks/parallel_recognition.py --faces 1,2,4,8,12,16,20 --workers 4
+    python benchmarks/parallel_recognition.py --recognizer eigenfaces --frames 50
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from modules.face_recognition_module import FaceRecognitionModule
+from modules.parallel_recognition import create_recognition_executor
+from modules.training_module import RECOGNIZER_FACTORIES
+
+
+TRAINING_FILES = {
+    "eigenfaces": "eigen_classifier.yml",
+    "fisherfaces": "fisher_classifier.yml",
+    "lbph": "lbph_classifier.yml",
+}
+
+
+def synthetic_faces(people: int, samples: int, rng):
+    """Um padrão suavizado por pessoa, com ruído em cada amostra"""
+    faces, ids = [], []
+    for person in range(people):
+        base = cv2.GaussianBlur(rng.integers(0, 255, (120, 90), dtype=np.uint8), (0, 0), 4)
+        for _ in range(samples):
+            noise = rng.normal(0, 12, base.shape)
+            faces.append(np.clip(base + noise, 0, 255).astype(np.uint8))
+            ids.append(person)
+    return faces, ids
+
+
+def train_synthetic(recognizer: str, people: int, samples: int):
+    """Grava modelo e face_names.pickle sintéticos no diretório atual"""
+    rng = np.random.default_rng(0)
+    faces, ids = synthetic_faces(people, samples, rng)
+    model = RECOGNIZER_FACTORIES[recognizer]()
+    model.train(faces, np.array(ids))
+    model.write(TRAINING_FILES[recognizer])
+    with open("face_names.pickle", "wb") as f:
+        pickle.dump({f"pessoa_{i}": i for i in range(people)}, f)
+    return synthetic_faces(people, 1, np.random.default_rng(1))[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconhecimento paralelo por face")
+    parser.add_argument("--recognizer", default="lbph", choices=sorted(RECOGNIZER_FACTORIES))
+    parser.add_argument("--faces", default="1,2,4,8,12,16,20", help="Faces por frame a medir")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=20, help="Frames medidos por ponto")
+    parser.add_argument("--people", type=int, default=20, help="Pessoas no modelo sintético")
+    parser.add_argument("--samples", type=int, default=30, help="Amostras por pessoa no modelo sintético")
+    parser.add_argument("--trained", action="store_true",
+                        help="Usa o modelo treinado do diretório atual em vez do sintético")
+    args = parser.parse_args()
+    
+    counts = [int(n) for n in args.faces.split(",") if n.strip()]
+    if args.trained:
+        probes = synthetic_faces(max(counts), 1, np.random.default_rng(1))[0]
+    else:
+        # Os workers de processo leem o modelo do diretório atual, que eles herdam
+        os.chdir(tempfile.mkdtemp(prefix="bench_paralelo_"))
+        probes = train_synthetic(args.recognizer, args.people, args.samples)
+    
+    module = FaceRecognitionModule(None, recognizer_type=args.recognizer, speech_backend="none",
+                                   background_load=True)
+    module.load_recognizer()
+    options = {'recognizer_type': args.recognizer, 'threshold': module.threshold}
+    executors = {
+        'thread': create_recognition_executor('thread', module.classify_face, args.workers, options),
+        'process': create_recognition_executor('process', module.classify_face, args.workers, options),
+    }
+    for name, executor in executors.items():
+        print(f"Aquecimento {name}: {executor.warm_up() * 1000:.0f} ms")
+    
+    print(f"\nReconhecedor: {args.recognizer}  Workers: {args.workers}  CPUs: {os.cpu_count()}  "
+          f"Frames por ponto: {args.frames}")
+    print(f"{'faces':>6}{'sequencial ms':>15}{'threads ms':>12}{'processos ms':>14}"
+          f"{'ganho thr':>11}{'ganho proc':>12}  iguais")
+    
+    for count in counts:
+        rois = [probes[i % len(probes)] for i in range(count)]
+        timings = {}
+        outputs = {}
+        for name, classify_many in (('sequencial', lambda r: [module.classify_face(x) for x in r]),
+                                    ('thread', executors['thread'].classify_many),
+                                    ('process', executors['process'].classify_many)):
+            start = time.perf_counter()
+            for _ in range(args.frames):
+                outputs[name] = classify_many(rois)
+            timings[name] = (time.perf_counter() - start) / args.frames * 1000
+        
+        same = outputs['thread'] == outputs['sequencial'] == outputs['process']
+        print(f"{count:>6}{timings['sequencial']:>15.2f}{timings['thread']:>12.2f}{timings['process']:>14.2f}"
+              f"{timings['sequencial'] / timings['thread']:>10.2f}x{timings['sequencial'] / timings['process']:>11.2f}x"
+              f"  {'sim' if same else 'NÃO'}")
+    
+    for executor in executors.values():
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Carga no serviço local de reconhecimento (recognition_server.py)
+
+Simula N portas enviando frames (ou recortes) ao mesmo tempo e mede a vazão
+e a latência vista pelo cliente.
+
+Uso:
+    python recognition_server.py --port 8765 &
+    python benchmarks/recognition_service.py --url http://127.0.0.1:8765 --doors 8 --requests 50
+    python benchmarks/recognition_service.py --image foto.jpg --faces
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from modules.recognition_service import RecognitionClient
+
+
+def load_payload(path, width: int, height: int, face: bool) -> bytes:
+    """Imagem do disco ou sintética, já em JPEG"""
+    if path:
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE if face else cv2.IMREAD_COLOR)
+        if image is None:
+            raise SystemExit(f"Não foi possível ler {path}")
+    else:
+        rng = np.random.default_rng(0)
+        shape = (120, 90) if face else (height, width, 3)
+        image = rng.integers(0, 255, shape, dtype=np.uint8)
+    ok, buffer = cv2.imencode(".jpg", image)
+    return buffer.tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga no serviço de reconhecimento")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--doors", type=int, default=4, help="Clientes simultâneos")
+    parser.add_argument("--requests", type=int, default=50, help="Pedidos por cliente")
+    parser.add_argument("--image", help="Imagem enviada (padrão: ruído sintético)")
+    parser.add_argument("--faces", action="store_true", help="Envia recortes de face em vez de frames")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+    
+    payload = load_payload(args.image, args.width, args.height, args.faces)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    
+    def door(index: int):
+        client = RecognitionClient(args.url, door_id=f"bench-{index}")
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            try:
+                if args.faces:
+                    client.recognize_face(payload)
+                else:
+                    client.recognize_frame(payload)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+    
+    print(f"Serviço: {RecognitionClient(args.url).health()}")
+    threads = [threading.Thread(target=door, args=(i,)) for i in range(args.doors)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    
+    if latencies:
+        ms = np.array(latencies) * 1000
+        print(f"Portas: {args.doors}  Pedidos/porta: {args.requests}  "
+              f"{'Recortes' if args.faces else 'Frames'}: {len(payload) / 1024:.1f} KB")
+        print(f"Vazão   : {len(latencies) / elapsed:8.1f} pedidos/s")
+        print(f"Latência: p50 {np.percentile(ms, 50):.1f} ms  p95 {np.percentile(ms, 95):.1f} ms  "
+              f"máx {ms.max():.1f} ms")
+    print(f"Erros   : {len(errors)}" + (f" (ex.: {errors[0]})" if errors else ""))
+    print(f"Serviço: {RecognitionClient(args.url).health()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Memória por worker: reconhecedor privado (.yml) x galeria compartilhada (mmap)
+
+Treina um reconhecedor com faces sintéticas num diretório temporário (ou usa
+o .yml do diretório atual com --trained), publica a galeria e sobe N
+processos em cada modo. Cada worker mede RSS, PSS e USS antes de carregar
+o modelo e depois de carregar e classificar as faces de teste, com todos os
+workers vivos ao mesmo tempo (o PSS divide as páginas compartilhadas entre
+eles). Confere também que os dois modos dão os mesmos rótulos.
+
+Uso:
+    python benchmarks/shared_gallery.py --workers 4 --people 20 --samples 30
+    python benchmarks/shared_gallery.py --recognizer eigenfaces
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from modules.shared_gallery import FACTORIES, TRAINING_FILES, SharedGallery, export_recognizer
+from utils.resource_usage import memory_breakdown
+
+
+def synthetic_faces(people: int, samples: int, seed: int, noise: float = 12.0):
+    """Um padrão suavizado por pessoa, com ruído em cada amostra"""
+    rng = np.random.default_rng(0)
+    bases = [cv2.GaussianBlur(rng.integers(0, 255, (120, 90), dtype=np.uint8), (0, 0), 4)
+             for _ in range(people)]
+    rng = np.random.default_rng(seed)
+    faces, ids = [], []
+    for person, base in enumerate(bases):
+        for _ in range(samples):
+            faces.append(np.clip(base + rng.normal(0, noise, base.shape), 0, 255).astype(np.uint8))
+            ids.append(person + 1)
+    return faces, np.array(ids)
+
+
+def _worker(mode, recognizer, root, probes, barrier, results):
+    cv2.setNumThreads(1)
+    before = memory_breakdown()
+    if mode == "privado":
+        model = FACTORIES[recognizer]()
+        model.read(TRAINING_FILES[recognizer])
+    else:
+        model = SharedGallery(recognizer, root)
+        model.refresh()
+    labels = [model.predict(face)[0] for face in probes]
+    # Mede com todos os workers carregados: o PSS divide as páginas compartilhadas entre eles
+    barrier.wait()
+    after = memory_breakdown()
+    barrier.wait()
+    results.put((mode, os.getpid(), before, after, labels))
+
+
+def run(mode, workers, recognizer, root, probes):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_worker, args=(mode, recognizer, root, probes, barrier, results))
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
+    rows = [results.get() for _ in processes]
+    for p in processes:
+        p.join()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Galeria compartilhada: memória por worker")
+    parser.add_argument("--recognizer", default="lbph", choices=sorted(FACTORIES))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--people", type=int, default=20, help="Pessoas no modelo sintético")
+    parser.add_argument("--samples", type=int, default=30, help="Amostras por pessoa no modelo sintético")
+    parser.add_argument("--probes", type=int, default=20, help="Faces classificadas por worker")
+    parser.add_argument("--trained", action="store_true",
+                        help="Usa o .yml treinado do diretório atual em vez do sintético")
+    args = parser.parse_args()
+    
+    root = "gallery_shared"
+    if args.trained:
+        model = FACTORIES[args.recognizer]()
+        model.read(TRAINING_FILES[args.recognizer])
+        root = tempfile.mkdtemp(prefix="bench_galeria_")
+    else:
+        # Os workers leem do diretório atual, que eles herdam
+        os.chdir(tempfile.mkdtemp(prefix="bench_galeria_"))
+        faces, ids = synthetic_faces(args.people, args.samples, seed=1)
+        model = FACTORIES[args.recognizer]()
+        model.train(faces, ids)
+        model.write(TRAINING_FILES[args.recognizer])
+    version = export_recognizer(model, args.recognizer, root)
+    gallery = SharedGallery(args.recognizer, root)
+    gallery.refresh()
+    probes, _ = synthetic_faces(max(args.people, 1), 1, seed=2, noise=25.0)
+    probes = probes[:args.probes]
+    del model
+    
+    print(f"Reconhecedor: {args.recognizer}  Galeria: {len(gallery)} amostras, "
+          f"{gallery.nbytes() / 1048576:.1f} MB ({version})  Workers: {args.workers}\n")
+    print(f"{'modo':<14}{'pid':>8}{'RSS antes':>11}{'RSS depois':>12}{'PSS depois':>12}{'USS depois':>12}  (MB)")
+    
+    totals = {}
+    labels = {}
+    for mode in ("privado", "compartilhado"):
+        rows = run(mode, args.workers, args.recognizer, root, probes)
+        for _, pid, before, after, worker_labels in rows:
+            print(f"{mode:<14}{pid:>8}{before['rss_mb']:>11.1f}{after['rss_mb']:>12.1f}"
+                  f"{after['pss_mb'] or 0:>12.1f}{after['uss_mb'] or 0:>12.1f}")
+            labels.setdefault(mode, worker_labels)
+        totals[mode] = (sum(r[3]['rss_mb'] - r[2]['rss_mb'] for r in rows),
+                        sum((r[3]['pss_mb'] or 0) - (r[2]['pss_mb'] or 0) for r in rows))
+    
+    print()
+    for mode, (rss, pss) in totals.items():
+        print(f"{mode:<14} acréscimo somado dos workers: RSS {rss:8.1f} MB   PSS {pss:8.1f} MB")
+    print(f"Mesmos rótulos nos dois modos: {'sim' if labels['privado'] == labels['compartilhado'] else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
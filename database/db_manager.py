@@ -3,8 +3,18 @@ Gerenciador do banco de dados SQLite para o sistema de controle de acesso
 """
 import sqlite3
 import os
+import time
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
+from utils.metrics import REGISTRY
+
+
+# Escritas de histórico pendentes (atualizado pelo assinante do barramento de
+# eventos que grava os acessos) e latência do commit (utils/metrics.py)
+DB_FILA_ESCRITA = REGISTRY.gauge(
+    "webcam_db_fila_escrita", "Registros de acesso aguardando gravação no banco")
+DB_LATENCIA_COMMIT = REGISTRY.histogram(
+    "webcam_db_commit_latencia_segundos", "Latência de gravação de um registro de acesso")
 
 
 class DatabaseManager:
@@ -205,6 +215,29 @@ class DatabaseManager:
         
         return [dict(row) for row in rows]
     
+    def contar_usuarios(self, apenas_ativos: bool = False) -> int:
+        """
+        Conta os usuários sem carregá-los
+        
+        Args:
+            apenas_ativos: Se True, conta apenas usuários ativos
+        
+        Returns:
+            Quantidade de usuários
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if apenas_ativos:
+            cursor.execute("SELECT COUNT(*) FROM usuarios WHERE ativo = 1")
+        else:
+            cursor.execute("SELECT COUNT(*) FROM usuarios")
+        
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
+    
     def atualizar_usuario(self, usuario_id: int, nome: Optional[str] = None, 
                          numero_identificacao: Optional[str] = None,
                          tipo_identificacao: Optional[str] = None,
@@ -299,20 +332,24 @@ class DatabaseManager:
         Returns:
             ID do registro criado
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        data_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        cursor.execute("""
-            INSERT INTO historico_acessos 
-            (usuario_id, data_hora, tipo_evento, status, confianca, motivo_negacao)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (usuario_id, data_hora, tipo_evento, status, confianca, motivo_negacao))
-        
-        registro_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        write_start = time.perf_counter()
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            data_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            
+            cursor.execute("""
+                INSERT INTO historico_acessos 
+                (usuario_id, data_hora, tipo_evento, status, confianca, motivo_negacao)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (usuario_id, data_hora, tipo_evento, status, confianca, motivo_negacao))
+            
+            registro_id = cursor.lastrowid
+            conn.commit()
+            conn.close()
+        finally:
+            DB_LATENCIA_COMMIT.observe(time.perf_counter() - write_start)
         
         return registro_id
     
@@ -0,0 +1,99 @@
+"""
+Script para avaliar os reconhecedores (Eigenfaces, Fisherfaces, LBPH) sobre
+o dataset cadastrado e escolher o threshold de cada um
+
+Usa k-fold (ou um conjunto de teste fixo) com pessoas reservadas como
+impostoras, varre os thresholds e mostra acurácia, EER, o threshold
+sugerido para um FAR máximo e a latência por face. As curvas FAR/FRR
+completas podem ser gravadas em CSV.
+
+Uso:
+    python evaluate_recognizers.py --folds 5 --impostors 0.2 --target-far 0.01
+    python evaluate_recognizers.py --test-fraction 0.3 --recognizers lbph --thresholds 100 --curves curvas.csv
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.training_module import TrainingModule
+from modules.recognizer_evaluation import RECOGNIZERS, at_threshold, evaluate, write_curves
+
+
+def evaluate_recognizers(args):
+    """Carrega o dataset, avalia e imprime o relatório"""
+    print("=" * 60)
+    print("AVALIAÇÃO DOS RECONHECEDORES")
+    print("=" * 60)
+    
+    ids, faces, face_names = TrainingModule(args.dataset, args.store).load_training_data()
+    if len(face_names) < 2:
+        print("\n✗ São necessárias pelo menos 2 pessoas cadastradas para avaliar")
+        return 1
+    
+    split = (f"conjunto de teste com {args.test_fraction:.0%} de cada pessoa" if args.test_fraction
+             else f"{args.folds} dobras")
+    print(f"\n{len(faces)} faces de {len(face_names)} pessoas; {split}; "
+          f"{args.impostors:.0%} das pessoas como impostoras\n")
+    
+    try:
+        results = evaluate(ids, faces, args.recognizers, args.folds, args.test_fraction,
+                           args.impostors, args.target_far, args.points, args.thresholds,
+                           args.latency_probes, args.workers, args.seed)
+    except ValueError as e:
+        print(f"✗ Não foi possível avaliar: {e}")
+        return 1
+    
+    print(f"{'reconhecedor':<13}{'rank-1':>8}{'EER':>8}{'thr EER':>10}{'thr sugerido':>14}"
+          f"{'FAR':>7}{'FRR':>7}{'ms/face':>9}{'p95':>7}{'lote ms':>9}{'treino s':>10}")
+    for recognizer, result in results.items():
+        if 'erro' in result:
+            print(f"{recognizer:<13}  ✗ {result['erro']}")
+            continue
+        summary = result['resumo']
+        suggested = summary['threshold_sugerido']
+        print(f"{recognizer:<13}{summary['rank1']:>8.1%}{summary['eer']:>8.1%}{summary['threshold_eer']:>10.1f}"
+              + (f"{suggested:>14.1f}{summary['far_sugerido']:>7.1%}{summary['frr_sugerido']:>7.1%}"
+                 if suggested is not None else f"{'-':>14}{'-':>7}{'-':>7}")
+              + f"{result['latencia_ms'][0]:>9.2f}{result['latencia_ms'][1]:>7.2f}"
+                f"{result['lote_ms_por_face']:>9.2f}{result['treino_s']:>10.2f}")
+    
+    for threshold in args.thresholds:
+        print(f"\nCom threshold = {threshold:g}:")
+        for recognizer, result in results.items():
+            if 'curva' in result:
+                point = at_threshold(result['curva'], threshold)
+                print(f"   {recognizer:<13} FAR {point['far']:6.1%}  FRR {point['frr']:6.1%}  "
+                      f"erro de identificação {point['erro_identificacao']:6.1%}  acurácia {point['acuracia']:6.1%}")
+    
+    if args.curves:
+        write_curves(args.curves, results)
+        print(f"\n✓ Curvas FAR/FRR gravadas em {args.curves}")
+    
+    if args.impostors > 0:
+        print(f"\nThreshold sugerido: o maior com FAR <= {args.target_far:.1%} (impostores aceitos).")
+    else:
+        print("\nSem impostores (--impostors 0), o FAR não é medido e o threshold sugerido não vale.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avalia os reconhecedores sobre o dataset cadastrado")
+    parser.add_argument("--dataset", default="dataset/", help="Pasta do dataset")
+    parser.add_argument("--store", default="dataset_packed", help="Pasta do dataset empacotado")
+    parser.add_argument("--recognizers", nargs="+", default=list(RECOGNIZERS), choices=RECOGNIZERS)
+    parser.add_argument("--folds", type=int, default=5, help="Dobras do k-fold")
+    parser.add_argument("--test-fraction", type=float,
+                        help="Usa um conjunto de teste fixo com essa fração de cada pessoa (em vez do k-fold)")
+    parser.add_argument("--impostors", type=float, default=0.2,
+                        help="Fração das pessoas deixadas fora da galeria como impostoras")
+    parser.add_argument("--target-far", type=float, default=0.01, help="FAR máximo do threshold sugerido")
+    parser.add_argument("--thresholds", type=float, nargs="*", default=[],
+                        help="Thresholds a reportar (ex.: o que está em uso)")
+    parser.add_argument("--points", type=int, default=200, help="Pontos da varredura de thresholds")
+    parser.add_argument("--latency-probes", type=int, default=50, help="Faces na medição de latência")
+    parser.add_argument("--workers", type=int, help="Threads da avaliação (padrão: uma por reconhecedor e dobra)")
+    parser.add_argument("--curves", help="Arquivo CSV para as curvas FAR/FRR")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(evaluate_recognizers(parser.parse_args()))
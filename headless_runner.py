@@ -0,0 +1,250 @@
+"""
+Controlador de porta sem interface gráfica
+
+Roda o reconhecimento contínuo sem Tkinter, PIL ou conversões de exibição
+(para caixas de porta sem monitor). As opções vêm de um arquivo JSON
+(ver config/headless.example.json) e podem ser sobrepostas pela linha de
+comando.
+
+Uso:
+    python headless_runner.py --config config/headless.json
+    python headless_runner.py --camera 0 --door portaria --speech none --metrics-port 9108
+    python headless_runner.py --door portaria --central 192.168.0.10:8766
+    python headless_runner.py --door portaria --processes 3
+    python headless_runner.py --door portaria --auto-tune --target-fps 15 --latency-budget 250
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_manager import DatabaseManager
+from modules.face_recognition_module import FaceRecognitionModule
+from modules.edge_protocol import EdgeClient
+from modules.auto_tuner import AutoTuner, PROFILE_FILE
+from utils.metrics import MetricsServer
+from utils.resource_usage import resource_snapshot, format_snapshot
+from utils.startup import StartupTimer
+
+
+DEFAULT_CONFIG = {
+    "db_path": "database/access_control.db",
+    "metrics_port": None,
+    "metrics_host": "127.0.0.1",
+    "report_interval": 300.0,
+    # Modo borda: {"host": ..., "port": 8766, "register": false}; None = reconhecimento local
+    "central": None,
+    # Ajuste automático: {"target_fps": 15, "latency_budget_ms": 250, "profile": ..., "clip": ...}
+    "ajuste_automatico": None,
+    "reconhecimento": {
+        "recognizer_type": "lbph",
+        "threshold": 100,
+        "max_width": 640,
+        "camera_source": 0,
+        "door_id": "principal",
+        "speech_backend": "auto",
+    },
+}
+
+
+def parse_args():
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description="Controle de acesso sem interface gráfica")
+    parser.add_argument("--config", help="Arquivo JSON de configuração")
+    parser.add_argument("--db", dest="db_path", help="Caminho do banco de dados")
+    parser.add_argument("--camera", help="Índice da câmera ou URL/arquivo do stream")
+    parser.add_argument("--door", help="Identificação da porta")
+    parser.add_argument("--recognizer", choices=["lbph", "eigenfaces", "fisherfaces"])
+    parser.add_argument("--threshold", type=float)
+    parser.add_argument("--max-width", type=int)
+    parser.add_argument("--speech", choices=["auto", "win32", "pyttsx3", "none"],
+                        help="Síntese de voz ('none' em caixas sem áudio)")
+    parser.add_argument("--metrics-port", type=int, help="Porta do endpoint /metrics")
+    parser.add_argument("--metrics-host", help="Interface do endpoint de métricas")
+    parser.add_argument("--report-interval", type=float,
+                        help="Segundos entre relatórios de uso de memória/CPU (0 = só no fim)")
+    parser.add_argument("--central", help="HOST[:PORTA] do servidor central (modo borda; porta padrão 8766)")
+    parser.add_argument("--processes", type=int,
+                        help="Processos de reconhecimento (modo multiprocesso; 0 = processo único)")
+    parser.add_argument("--parallel-recognition", choices=["thread", "process"],
+                        help="Predict das faces de um frame em paralelo")
+    parser.add_argument("--recognition-workers", type=int,
+                        help="Threads ou processos do reconhecimento paralelo")
+    parser.add_argument("--shared-gallery",
+                        help="Diretório da galeria compartilhada entre processos (ex.: gallery_shared)")
+    parser.add_argument("--auto-tune", action="store_true",
+                        help="Escolhe largura, entrada do detector, intervalo e threads para as metas")
+    parser.add_argument("--target-fps", type=float, help="Meta de FPS do ajuste automático")
+    parser.add_argument("--latency-budget", type=float, help="Meta de latência (ms) do ajuste automático")
+    parser.add_argument("--tuning-clip", help="Clipe gravado usado nas medições do ajuste automático")
+    parser.add_argument("--tuning-profile", help=f"Arquivo do perfil de ajuste (padrão: {PROFILE_FILE})")
+    parser.add_argument("--retune", action="store_true",
+                        help="Mede de novo mesmo com perfil gravado para este host")
+    parser.add_argument("--detection-interval", type=int, help="Detecta faces a cada N frames")
+    args = parser.parse_args()
+    
+    # --central HOST ou HOST:PORTA (sem porta, vale a do arquivo ou a padrão)
+    args.central_host, args.central_port = None, None
+    if args.central:
+        host, sep, port = args.central.rpartition(":")
+        if not sep:
+            host, port = args.central, ""
+        if not host or (sep and not (port.isdigit() and 0 < int(port) < 65536)):
+            parser.error(f"--central inválido: '{args.central}' (use HOST ou HOST:PORTA)")
+        args.central_host = host
+        args.central_port = int(port) if port else None
+    return args
+
+
+def load_config(args) -> dict:
+    """Combina padrões, arquivo JSON e argumentos de linha de comando (nesta ordem)"""
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        config["reconhecimento"].update(data.pop("reconhecimento", {}))
+        config.update(data)
+    
+    for key in ("db_path", "metrics_port", "metrics_host", "report_interval"):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+    
+    recognition = config["reconhecimento"]
+    overrides = {
+        "camera_source": args.camera,
+        "door_id": args.door,
+        "recognizer_type": args.recognizer,
+        "threshold": args.threshold,
+        "max_width": args.max_width,
+        "speech_backend": args.speech,
+        "processes": args.processes,
+        "parallel_recognition": args.parallel_recognition,
+        "recognition_workers": args.recognition_workers,
+        "shared_gallery": args.shared_gallery,
+        "detection_interval": args.detection_interval,
+    }
+    for key, value in overrides.items():
+        if value is not None:
+            recognition[key] = value
+    
+    tuning = {
+        "target_fps": args.target_fps,
+        "latency_budget_ms": args.latency_budget,
+        "clip": args.tuning_clip,
+        "profile": args.tuning_profile,
+        "retune": args.retune or None,
+    }
+    if args.auto_tune or config.get("ajuste_automatico") is not None:
+        config["ajuste_automatico"] = dict(config.get("ajuste_automatico") or {},
+                                           **{k: v for k, v in tuning.items() if v is not None})
+    
+    if args.central_host:
+        central = dict(config.get("central") or {}, host=args.central_host)
+        if args.central_port is not None:
+            central["port"] = args.central_port
+        config["central"] = central
+    
+    # Câmera pode ser índice ("0") ou URL/arquivo
+    source = recognition.get("camera_source", 0)
+    if isinstance(source, str) and source.isdigit():
+        recognition["camera_source"] = int(source)
+    
+    return config
+
+
+def log(message: str):
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+def main():
+    """Função principal"""
+    args = parse_args()
+    config = load_config(args)
+    started = time.time()
+    stop_event = threading.Event()
+    
+    def request_stop(signum, frame):
+        log(f"Sinal {signum} recebido, encerrando...")
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    metrics_server = None
+    recognition = None
+    edge_client = None
+    exit_code = 0
+    
+    try:
+        if config["metrics_port"] is not None:
+            metrics_server = MetricsServer(config["metrics_port"], config["metrics_host"])
+            port = metrics_server.start()
+            log(f"Métricas disponíveis em http://{config['metrics_host']}:{port}/metrics")
+        
+        startup = StartupTimer()
+        with startup.measure("banco"):
+            db_manager = DatabaseManager(config["db_path"])
+        central = config.get("central")
+        if central:
+            door_id = config["reconhecimento"].get("door_id", "principal")
+            edge_client = EdgeClient(central["host"], central.get("port", 8766), door_id,
+                                     register=central.get("register", False))
+            log(f"Modo borda: recortes enviados a {central['host']}:{central.get('port', 8766)}")
+        
+        tuning = config.get("ajuste_automatico")
+        auto_tuner = None
+        if tuning is not None:
+            auto_tuner = AutoTuner(tuning.get("target_fps", 15.0), tuning.get("latency_budget_ms", 250.0),
+                                   profile_path=tuning.get("profile", PROFILE_FILE),
+                                   clip=tuning.get("clip"), retune=tuning.get("retune", False))
+            log(f"Ajuste automático: meta de {auto_tuner.target_fps:.0f} FPS e "
+                f"{auto_tuner.latency_budget_ms:.0f} ms")
+        
+        # Detector, reconhecedor e nomes carregam em paralelo dentro do construtor
+        recognition = FaceRecognitionModule(db_manager, startup_timer=startup,
+                                            edge_client=edge_client, auto_tuner=auto_tuner,
+                                            **config["reconhecimento"])
+        recognition.set_log_callback(log)
+        log(startup.report())
+        # Sem frame_callback: nenhum frame é copiado ou desenhado
+        
+        recognition.start_recognition()
+        log(f"Uso de recursos após iniciar: {format_snapshot(resource_snapshot())}")
+        
+        interval = config["report_interval"]
+        last_report = time.time()
+        while not stop_event.wait(1.0):
+            if not recognition.is_running:
+                log("Reconhecimento parou (falha na câmera?)")
+                exit_code = 1
+                break
+            if interval and time.time() - last_report >= interval:
+                log(f"Uso de recursos: {format_snapshot(resource_snapshot(), time.time() - started)}")
+                last_report = time.time()
+    
+    except Exception as e:
+        log(f"Erro fatal: {e}")
+        exit_code = 1
+    finally:
+        if recognition is not None:
+            recognition.stop_recognition()
+            recognition.notification_manager.close()
+        if edge_client is not None:
+            edge_client.close()
+        if metrics_server:
+            metrics_server.stop()
+        log(f"Uso de recursos ao encerrar: {format_snapshot(resource_snapshot(), time.time() - started)}")
+    
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 """
 Aplicação principal do Sistema de Controle de Acesso com Reconhecimento Facial
 """
+import time
+_INICIO = time.perf_counter()  # Antes das importações pesadas (OpenCV, Tk, PIL)
+
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 import sys
@@ -11,19 +15,55 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from database.db_manager import DatabaseManager
 from ui.main_window import MainWindow
+from utils.metrics import MetricsServer
+from utils.resource_usage import resource_snapshot, format_snapshot
+from utils.startup import StartupTimer
+
+_IMPORTADO = time.perf_counter()
+
+
+def parse_args():
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description="Sistema de Controle de Acesso")
+    parser.add_argument(
+        "--metrics-port", type=int, default=None,
+        help="Expõe métricas Prometheus em http://<host>:<porta>/metrics"
+    )
+    parser.add_argument(
+        "--metrics-host", default="127.0.0.1",
+        help="Interface do endpoint de métricas (padrão: apenas local)"
+    )
+    parser.add_argument(
+        "--shared-gallery", default=None,
+        help="Publica cada treino do cadastro nesta galeria compartilhada "
+             "(o mesmo diretório de --shared-gallery dos workers)"
+    )
+    return parser.parse_args()
 
 
 def main():
     """Função principal"""
+    args = parse_args()
+    metrics_server = None
+    started = time.time()
+    startup = StartupTimer(origin=_INICIO)
+    startup.record("importacoes", _INICIO, _IMPORTADO)
+    
     try:
-        # Inicializa banco de dados
-        db_manager = DatabaseManager("database/access_control.db")
+        # Endpoint de métricas opcional
+        if args.metrics_port is not None:
+            metrics_server = MetricsServer(args.metrics_port, args.metrics_host)
+            port = metrics_server.start()
+            print(f"Métricas disponíveis em http://{args.metrics_host}:{port}/metrics")
         
-        # Cria interface gráfica
-        root = tk.Tk()
+        # Inicializa banco de dados
+        with startup.measure("banco"):
+            db_manager = DatabaseManager("database/access_control.db")
         
-        # Cria janela principal
-        app = MainWindow(root, db_manager)
+        # Cria janela principal (os modelos carregam em segundo plano)
+        with startup.measure("interface"):
+            root = tk.Tk()
+            app = MainWindow(root, db_manager, startup, shared_gallery=args.shared_gallery)
         
         # Tratamento de fechamento
         def on_closing():
@@ -49,6 +89,11 @@ def main():
             "Verifique se todos os arquivos necessários estão presentes."
         )
         sys.exit(1)
+    finally:
+        if metrics_server:
+            metrics_server.stop()
+        # Para comparar com o modo headless (headless_runner.py)
+        print(f"Uso de recursos ao encerrar: {format_snapshot(resource_snapshot(), time.time() - started)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+"""
+Script para migrar o dataset de pastas (dataset/<nome>/*.jpg) para o
+formato empacotado (dataset_packed/<nome>.faces)
+"""
+import argparse
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.dataset_store import DatasetStore
+
+
+def migrate_dataset(source: str = "dataset", target: str = "dataset_packed",
+                    remove: bool = False, overwrite: bool = False):
+    """Converte cada pasta de identidade em um arquivo .faces"""
+    
+    print("=" * 60)
+    print("MIGRANDO DATASET PARA O FORMATO EMPACOTADO")
+    print("=" * 60)
+    
+    if not os.path.isdir(source):
+        print(f"\n✗ Pasta '{source}' não encontrada")
+        return
+    
+    store = DatasetStore(target)
+    total = 0
+    
+    for name in sorted(os.listdir(source)):
+        folder = os.path.join(source, name)
+        if not os.path.isdir(folder):
+            continue
+        
+        if store.exists(name):
+            if not overwrite:
+                print(f"   - '{name}' já migrado ({store.count(name)} amostras), pulando")
+                continue
+            store.remove(name)
+        
+        try:
+            imported, errors = store.import_folder(name, folder)
+        except Exception as e:
+            print(f"   ✗ Erro ao migrar '{name}': {e}")
+            continue
+        
+        total += imported
+        print(f"   ✓ '{name}': {imported} amostras")
+        for path in errors:
+            print(f"      ✗ Não foi possível ler {path}")
+        
+        if remove and imported and not errors:
+            shutil.rmtree(folder)
+            print(f"      Pasta '{folder}' removida")
+    
+    print("\n" + "=" * 60)
+    print(f"✓ MIGRAÇÃO CONCLUÍDA: {total} amostras em '{target}'")
+    print("=" * 60)
+    print("\nTreine novamente os reconhecedores para usar o novo dataset.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migra dataset/ para dataset_packed/")
+    parser.add_argument("--source", default="dataset", help="Pasta do dataset antigo")
+    parser.add_argument("--target", default="dataset_packed", help="Pasta do dataset empacotado")
+    parser.add_argument("--remove", action="store_true",
+                        help="Remove as pastas migradas sem erros")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Refaz identidades já migradas")
+    args = parser.parse_args()
+    migrate_dataset(args.source, args.target, args.remove, args.overwrite)
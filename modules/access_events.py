@@ -0,0 +1,51 @@
+"""
+Eventos publicados pelo reconhecimento no barramento (utils/event_bus.py)
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class RecognitionEvent:
+    """Uma face foi reconhecida (por votação) e precisa de uma decisão de acesso"""
+    door_id: str
+    nome_face: str
+    face_id: int
+    confianca: float
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class AccessEvent:
+    """
+    Decisão de acesso tomada
+
+    resultado: 'liberado', 'negado' (usuário sem permissão), 'nao_cadastrado'
+    (face treinada sem usuário no banco) ou 'desconhecido'
+    """
+    door_id: str
+    resultado: str
+    status: str
+    confianca: float
+    usuario_id: Optional[int] = None
+    nome: str = ''
+    numero_identificacao: str = ''
+    tipo_identificacao: str = ''
+    motivo: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict:
+        """Dicionário no formato do access_callback"""
+        data = {
+            'usuario_id': self.usuario_id,
+            'nome': self.nome,
+            'numero_identificacao': self.numero_identificacao,
+            'tipo_identificacao': self.tipo_identificacao,
+            'status': self.status,
+            'confianca': self.confianca,
+            'porta': self.door_id,
+        }
+        if self.motivo is not None:
+            data['motivo'] = self.motivo
+        return data
@@ -0,0 +1,397 @@
+"""
+Ajuste automático do desempenho para uma meta de FPS e de latência
+
+Largura do vídeo, tamanho de entrada do detector e threads do OpenCV eram
+fixos, iguais em qualquer caixa de porta. O AutoTuner mede o custo de cada
+combinação neste host (com frames sintéticos ou de um clipe gravado), estima
+FPS e latência para cada intervalo de detecção e escolhe a combinação de
+melhor qualidade que atende às metas. O perfil escolhido é gravado em JSON e
+reaproveitado enquanto host e metas forem os mesmos; sob sobrecarga
+sustentada, o tuner troca para uma combinação mais barata.
+
+Estimativas por frame (d = intervalo de detecção):
+    frame com detecção = redimensionamento + detecção + faces x predict
+    frame médio        = redimensionamento + (detecção + faces x predict) / d
+    latência           = frame com detecção + (d - 1) x frame médio
+"""
+import json
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from modules.face_detector import configure_threads
+from helper_functions import resize_video
+from utils.metrics import REGISTRY
+
+
+PROFILE_FILE = "tuning_profile.json"
+
+WIDTHS = (960, 800, 640, 480, 320)
+INPUT_SIZES = {
+    "ssd": (300, 256, 224, 192, 160),
+    "ssd_onnx": (300, 256, 224, 192, 160),
+    "yunet": (320, 256, 224, 192, 160),
+}
+INTERVALS = (1, 2, 3, 4)
+
+AJUSTES = REGISTRY.counter(
+    "webcam_ajuste_automatico_total", "Perfis escolhidos pelo ajuste automático", ["motivo"])
+FPS_ESTIMADO = REGISTRY.gauge(
+    "webcam_ajuste_fps_estimado", "FPS estimado do perfil ativo")
+FPS_OBSERVADO = REGISTRY.gauge(
+    "webcam_ajuste_fps_observado", "Capacidade de processamento medida (frames por segundo)")
+
+
+@dataclass
+class TuningProfile:
+    """Combinação escolhida e as estimativas que a justificaram"""
+    max_width: int
+    input_size: int
+    detection_interval: int
+    num_threads: int
+    fps_estimado: float
+    latencia_estimada_ms: float
+    atende_meta: bool = True
+    meta_fps: float = 0.0
+    meta_latencia_ms: float = 0.0
+    host: Dict = field(default_factory=dict)
+    origem: str = "sintetico"
+    motivo: str = "inicial"
+    criado_em: float = field(default_factory=time.time)
+    
+    def describe(self) -> str:
+        return (f"largura {self.max_width}, entrada {self.input_size}x{self.input_size}, "
+                f"detecção a cada {self.detection_interval} frame(s), {self.num_threads} thread(s): "
+                f"~{self.fps_estimado:.1f} FPS, ~{self.latencia_estimada_ms:.0f} ms")
+
+
+@dataclass
+class _Measurement:
+    width: int
+    input_size: int
+    threads: int
+    resize_s: float
+    detect_s: float
+    faces: float
+
+
+def host_signature() -> Dict:
+    """Identificação do host: um perfil gravado só vale no mesmo tipo de máquina"""
+    return {
+        'cpus': os.cpu_count(),
+        'maquina': platform.machine(),
+        'processador': platform.processor() or platform.machine(),
+        'opencv': cv2.__version__,
+    }
+
+
+def load_frames(source: Optional[str] = None, count: int = 20) -> Tuple[List[np.ndarray], str]:
+    """
+    Frames usados nas medições
+    
+    Args:
+        source: Clipe gravado (arquivo ou URL); None usa frames sintéticos 1280x720
+        count: Frames lidos do início do clipe
+    
+    Returns:
+        (frames, origem)
+    """
+    if source:
+        capture = cv2.VideoCapture(source)
+        frames = []
+        while capture.isOpened() and len(frames) < count:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            frames.append(frame)
+        capture.release()
+        if frames:
+            return frames, os.path.basename(str(source))
+        print(f"⚠ Não foi possível ler o clipe {source}; usando frames sintéticos.")
+    
+    rng = np.random.default_rng(0)
+    frames = [cv2.GaussianBlur(rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8), (0, 0), 3)
+              for _ in range(4)]
+    return frames, "sintetico"
+
+
+class AutoTuner:
+    """
+    Escolhe largura, entrada do detector, intervalo de detecção e threads
+    
+    Ordem de preferência entre as combinações que atendem às metas: detectar
+    em mais frames, depois entrada maior, depois vídeo mais largo. Se nenhuma
+    atender, fica a mais rápida (atende_meta = False).
+    """
+    
+    def __init__(self, target_fps: float = 15.0, latency_budget_ms: float = 250.0,
+                 profile_path: Optional[str] = PROFILE_FILE, clip: Optional[str] = None,
+                 retune: bool = False, thread_counts: Optional[Sequence[int]] = None,
+                 overload_window: float = 10.0, overload_tolerance: float = 0.8):
+        """
+        Args:
+            target_fps: Frames por segundo que o processamento deve sustentar
+            latency_budget_ms: Tempo máximo da face aparecer até a classificação
+            profile_path: Arquivo JSON do perfil (None = não grava)
+            clip: Clipe gravado para as medições (None = frames sintéticos)
+            retune: Se True, mede de novo mesmo havendo perfil gravado compatível
+            thread_counts: Threads do OpenCV a testar (padrão: 1, metade e todos os núcleos)
+            overload_window: Segundos abaixo da meta para considerar sobrecarga
+            overload_tolerance: Fração da meta abaixo da qual há sobrecarga
+        """
+        self.target_fps = target_fps
+        self.latency_budget_ms = latency_budget_ms
+        self.profile_path = profile_path
+        self.clip = clip
+        self.retune = retune
+        cpus = os.cpu_count() or 1
+        self.thread_counts = sorted(set(thread_counts or (1, max(1, cpus // 2), cpus)))
+        self.overload_window = overload_window
+        self.overload_tolerance = overload_tolerance
+        
+        self.profile: Optional[TuningProfile] = None
+        self._measurements: List[_Measurement] = []
+        self._predict_s = 0.0
+        self._origin = "sintetico"
+        
+        # Sobrecarga: tempo de processamento acumulado na janela atual
+        self._window_start: Optional[float] = None
+        self._window_busy = 0.0
+        self._window_frames = 0
+        self._overloaded_since: Optional[float] = None
+    
+    # ========== Perfil gravado ==========
+    
+    def load_profile(self) -> Optional[TuningProfile]:
+        """Perfil gravado, se for deste host e das mesmas metas e tiver vindo de uma medição"""
+        if not self.profile_path or not os.path.exists(self.profile_path):
+            return None
+        try:
+            with open(self.profile_path, "r", encoding="utf-8") as f:
+                profile = TuningProfile(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"⚠ Perfil de ajuste inválido ({self.profile_path}): {e}")
+            return None
+        if (profile.host != host_signature() or profile.meta_fps != self.target_fps
+                or profile.meta_latencia_ms != self.latency_budget_ms):
+            return None
+        if profile.motivo == "sobrecarga":
+            return None  # Rebaixamento por uma sobrecarga passageira não vale para a próxima execução
+        return profile
+    
+    def save_profile(self, profile: TuningProfile):
+        """Grava o perfil (arquivo temporário + troca atômica)"""
+        if not self.profile_path:
+            return
+        directory = os.path.dirname(self.profile_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.profile_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(profile), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.profile_path)
+    
+    # ========== Medição ==========
+    
+    def measure(self, detector, detector_type: str = "ssd",
+                classify: Optional[Callable[[np.ndarray], object]] = None,
+                frames: Optional[Sequence[np.ndarray]] = None, repeats: int = 3):
+        """
+        Mede redimensionamento, detecção e predict para cada combinação
+        
+        Args:
+            detector: Detector já carregado (detect(image, input_size))
+            detector_type: Tipo do detector (escolhe os tamanhos de entrada)
+            classify: Classificação de um recorte 90x120 (None = sem predict, ex.: modo borda)
+            frames: Frames de medição (padrão: load_frames(self.clip))
+            repeats: Passadas sobre os frames por combinação
+        """
+        if frames is None:
+            frames, self._origin = load_frames(self.clip)
+        else:
+            self._origin = "frames"
+        
+        self._predict_s = 0.0
+        if classify is not None:
+            face = np.full((120, 90), 128, dtype=np.uint8)
+            start = time.perf_counter()
+            try:
+                for _ in range(10):
+                    classify(face)
+                self._predict_s = (time.perf_counter() - start) / 10
+            except Exception:
+                # Classificador vazio (nada treinado): o predict não entra na conta
+                pass
+        
+        sizes = INPUT_SIZES.get(detector_type, INPUT_SIZES["ssd"])
+        source_width = frames[0].shape[1]
+        widths = [w for w in WIDTHS if w <= source_width] or [source_width]
+        
+        self._measurements = []
+        previous_threads = cv2.getNumThreads()
+        try:
+            for threads in self.thread_counts:
+                configure_threads(threads)
+                for width in widths:
+                    size = resize_video(frames[0].shape[1], frames[0].shape[0], width)
+                    start = time.perf_counter()
+                    resized = [cv2.resize(frame, size) for frame in frames]
+                    resize_s = (time.perf_counter() - start) / len(frames)
+                    
+                    for input_size in sizes:
+                        if input_size > width:
+                            continue
+                        detector.detect(resized[0], (input_size, input_size))
+                        faces = 0
+                        start = time.perf_counter()
+                        for _ in range(repeats):
+                            for frame in resized:
+                                # Conversão para cinza: feita em todo frame com detecção
+                                cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                                faces += len(detector.detect(frame, (input_size, input_size)))
+                        runs = repeats * len(resized)
+                        self._measurements.append(_Measurement(
+                            width, input_size, threads, resize_s,
+                            (time.perf_counter() - start) / runs,
+                            faces / runs if self._origin != "sintetico" else 1.0))
+        finally:
+            configure_threads(previous_threads)
+    
+    def _estimate(self, m: _Measurement, interval: int, scale: float = 1.0) -> Tuple[float, float]:
+        """(FPS, latência em ms) estimados para uma medição e um intervalo"""
+        detection = (m.detect_s + m.faces * self._predict_s) * scale
+        resize = m.resize_s * scale
+        average = resize + detection / interval
+        latency = resize + detection + (interval - 1) * average
+        return 1.0 / average, latency * 1000
+    
+    def candidates(self, scale: float = 1.0) -> List[TuningProfile]:
+        """Combinações em ordem de preferência (melhor qualidade primeiro)"""
+        # Para cada largura e entrada, fica o número de threads mais rápido
+        # (com folga de 10% a favor de menos threads, que sobram para o resto do processo)
+        best: Dict[Tuple[int, int], _Measurement] = {}
+        for m in sorted(self._measurements, key=lambda m: m.threads):
+            key = (m.width, m.input_size)
+            current = best.get(key)
+            if current is None or m.detect_s + m.resize_s < 0.9 * (current.detect_s + current.resize_s):
+                best[key] = m
+        
+        candidates = []
+        for (width, input_size), m in best.items():
+            for interval in INTERVALS:
+                fps, latency = self._estimate(m, interval, scale)
+                candidates.append(TuningProfile(
+                    max_width=width, input_size=input_size, detection_interval=interval,
+                    num_threads=m.threads, fps_estimado=round(fps, 2),
+                    latencia_estimada_ms=round(latency, 1),
+                    atende_meta=fps >= self.target_fps and latency <= self.latency_budget_ms,
+                    meta_fps=self.target_fps, meta_latencia_ms=self.latency_budget_ms,
+                    host=host_signature(), origem=self._origin))
+        candidates.sort(key=lambda p: (p.detection_interval, -p.input_size, -p.max_width))
+        return candidates
+    
+    def choose(self, scale: float = 1.0, motivo: str = "inicial") -> TuningProfile:
+        """
+        Escolhe o perfil a partir das medições
+        
+        Args:
+            scale: Correção das estimativas (custo observado / estimado)
+            motivo: 'inicial' ou 'sobrecarga' (gravado no perfil e na métrica)
+        """
+        candidates = self.candidates(scale)
+        if not candidates:
+            raise RuntimeError("Nenhuma medição disponível para o ajuste automático")
+        chosen = next((p for p in candidates if p.atende_meta), None)
+        if chosen is None:
+            chosen = max(candidates, key=lambda p: p.fps_estimado)
+        chosen.motivo = motivo
+        return chosen
+    
+    def tune(self, detector, detector_type: str = "ssd",
+             classify: Optional[Callable[[np.ndarray], object]] = None) -> TuningProfile:
+        """
+        Perfil gravado compatível ou, se não houver, mede o host e escolhe um
+        
+        Returns:
+            Perfil ativo (também em self.profile)
+        """
+        profile = None if self.retune else self.load_profile()
+        if profile is None:
+            self.measure(detector, detector_type, classify)
+            profile = self.choose()
+            self.save_profile(profile)
+            AJUSTES.inc(motivo=profile.motivo)
+        self._activate(profile)
+        return profile
+    
+    def _activate(self, profile: TuningProfile):
+        self.profile = profile
+        FPS_ESTIMADO.set(profile.fps_estimado)
+        self._window_start = None
+        self._overloaded_since = None
+    
+    # ========== Sobrecarga ==========
+    
+    def observe(self, busy_s: float, now: Optional[float] = None) -> Optional[TuningProfile]:
+        """
+        Registra o tempo de processamento de um frame
+        
+        A capacidade é medida em janelas de 1 s (frames / tempo ocupado). Se
+        ficar abaixo de overload_tolerance x meta por overload_window
+        segundos, as estimativas são corrigidas pelo custo observado e um
+        perfil mais barato é escolhido.
+        
+        Returns:
+            Novo perfil, se houve reajuste (o chamador aplica)
+        """
+        if self.profile is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if self._window_start is None:
+            self._window_start, self._window_busy, self._window_frames = now, 0.0, 0
+        self._window_busy += busy_s
+        self._window_frames += 1
+        if now - self._window_start < 1.0 or self._window_busy <= 0:
+            return None
+        
+        capacity = self._window_frames / self._window_busy
+        self._window_start = None
+        FPS_OBSERVADO.set(capacity)
+        if capacity >= self.target_fps * self.overload_tolerance:
+            self._overloaded_since = None
+            return None
+        if self._overloaded_since is None:
+            self._overloaded_since = now
+        if now - self._overloaded_since < self.overload_window:
+            return None
+        return self._retune(capacity)
+    
+    def _retune(self, capacity: float) -> Optional[TuningProfile]:
+        """Escolhe um perfil mais barato com as estimativas corrigidas pelo observado"""
+        self._overloaded_since = None
+        current = self.profile
+        if not self._measurements:
+            # Perfil veio do arquivo: sem medições, só dá para detectar menos vezes
+            if current.detection_interval >= INTERVALS[-1]:
+                return None
+            profile = TuningProfile(**dict(asdict(current), motivo="sobrecarga", criado_em=time.time(),
+                                           detection_interval=current.detection_interval + 1))
+            profile.fps_estimado = round(capacity * (current.detection_interval + 1)
+                                         / current.detection_interval, 2)
+            profile.atende_meta = profile.fps_estimado >= self.target_fps
+        else:
+            scale = current.fps_estimado / capacity
+            profile = self.choose(scale, motivo="sobrecarga")
+            if profile.fps_estimado <= capacity:
+                return None
+        
+        print(f"⚠ Sobrecarga: {capacity:.1f} FPS para meta de {self.target_fps:.1f}; "
+              f"novo perfil: {profile.describe()}")
+        AJUSTES.inc(motivo="sobrecarga")
+        self._activate(profile)
+        return profile
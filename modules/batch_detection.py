@@ -0,0 +1,142 @@
+"""
+Serviço de detecção em lote para várias câmeras
+
+Junta frames de várias fontes dentro de um prazo curto e roda um único
+forward (cv2.dnn.blobFromImages) para todos, devolvendo as detecções a
+cada fonte por meio de um Future.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, List, Dict
+
+import numpy as np
+
+from modules.face_detector import Detection
+from utils.metrics import REGISTRY
+
+
+TAMANHO_LOTE = REGISTRY.histogram(
+    "webcam_deteccao_lote_tamanho", "Frames por forward no serviço de detecção em lote",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16))
+ESPERA_LOTE = REGISTRY.histogram(
+    "webcam_deteccao_lote_espera_segundos", "Tempo de espera de um frame até entrar em um lote")
+
+
+class BatchDetectionService:
+    """Agrupa pedidos de detecção de várias fontes em forwards em lote"""
+    
+    def __init__(self, detector, max_batch_size: int = 4, max_wait: float = 0.010,
+                 max_pending: int = 64):
+        """
+        Inicializa o serviço
+        
+        Args:
+            detector: Detector com detect_batch(images) (ver modules/face_detector.py)
+            max_batch_size: Máximo de frames por forward
+            max_wait: Prazo máximo (segundos) que o primeiro frame espera por companhia
+            max_pending: Tamanho máximo da fila de pedidos
+        """
+        self.detector = detector
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        
+        # Estatísticas
+        self.batches = 0
+        self.frames = 0
+    
+    def start(self):
+        """Inicia a thread de detecção"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Para a thread; pedidos pendentes recebem erro"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        
+        while True:
+            try:
+                _, future, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError("Serviço de detecção parado"))
+    
+    def submit(self, frame: np.ndarray) -> Future:
+        """
+        Enfileira um frame para detecção
+        
+        Returns:
+            Future que recebe a lista de detecções do frame
+        """
+        if not self._running:
+            raise RuntimeError("Serviço de detecção não iniciado")
+        future: Future = Future()
+        self._queue.put((frame, future, time.perf_counter()))
+        return future
+    
+    def detect(self, frame: np.ndarray, timeout: Optional[float] = 5.0) -> List[Detection]:
+        """Versão bloqueante de submit(): mesma interface de um detector comum"""
+        return self.submit(frame).result(timeout=timeout)
+    
+    def _collect(self) -> List:
+        """Aguarda o primeiro pedido e junta outros até encher o lote ou vencer o prazo"""
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _worker(self):
+        """Loop da thread de detecção"""
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+            
+            now = time.perf_counter()
+            for _, _, enqueued in batch:
+                ESPERA_LOTE.observe(now - enqueued)
+            TAMANHO_LOTE.observe(len(batch))
+            
+            frames = [item[0] for item in batch]
+            try:
+                results = self.detector.detect_batch(frames)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.frames += len(batch)
+            for (_, future, _), detections in zip(batch, results):
+                future.set_result(detections)
+    
+    def stats(self) -> Dict[str, float]:
+        """Estatísticas acumuladas do serviço"""
+        return {
+            'lotes': self.batches,
+            'frames': self.frames,
+            'frames_por_lote': self.frames / self.batches if self.batches else 0.0,
+        }
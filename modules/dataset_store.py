@@ -0,0 +1,201 @@
+"""
+Armazenamento compacto do dataset de faces
+
+Cada identidade vira um único arquivo <nome>.faces com um cabeçalho fixo
+seguido de registros de tamanho fixo (metadados + face 90x120 em tons de
+cinza já pré-processada). Acrescentar amostras é um append no fim do
+arquivo e a leitura para o treinamento é um np.memmap, sem decodificar
+imagem por imagem.
+"""
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+FACE_WIDTH = 90
+FACE_HEIGHT = 120
+
+MAGIC = b"WCFACES1"
+HEADER = struct.Struct("<8sHHHH")  # magic, versão, largura, altura, reservado
+VERSION = 1
+EXTENSION = ".faces"
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('quality', '<f4'),
+    ('flags', '<u4'),
+    ('pixels', 'u1', (FACE_HEIGHT, FACE_WIDTH)),
+])
+
+
+def prepare_face(image: np.ndarray) -> np.ndarray:
+    """Converte uma face para tons de cinza 90x120 (mesmo pré-processamento do treinamento)"""
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if image.shape[:2] != (FACE_HEIGHT, FACE_WIDTH):
+        image = cv2.resize(image, (FACE_WIDTH, FACE_HEIGHT))
+    return image.astype(np.uint8, copy=False)
+
+
+class DatasetStore:
+    """Dataset de faces empacotado, um arquivo por identidade"""
+    
+    def __init__(self, root: str = "dataset_packed"):
+        """
+        Inicializa o armazenamento
+        
+        Args:
+            root: Diretório dos arquivos .faces
+        """
+        self.root = root
+        self._lock = threading.Lock()
+    
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name + EXTENSION)
+    
+    def _check_header(self, f, path: str):
+        """Valida o cabeçalho de um arquivo aberto"""
+        data = f.read(HEADER.size)
+        if len(data) < HEADER.size:
+            raise ValueError(f"Arquivo de dataset truncado: {path}")
+        magic, version, width, height, _ = HEADER.unpack(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Arquivo de dataset inválido: {path}")
+        if (width, height) != (FACE_WIDTH, FACE_HEIGHT):
+            raise ValueError(f"Tamanho de face inesperado em {path}: {width}x{height}")
+    
+    def identities(self) -> List[str]:
+        """Identidades presentes no armazenamento (ordem alfabética)"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(f[:-len(EXTENSION)] for f in os.listdir(self.root)
+                      if f.endswith(EXTENSION))
+    
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+    
+    def count(self, name: str) -> int:
+        """Número de amostras de uma identidade"""
+        path = self._path(name)
+        if not os.path.exists(path):
+            return 0
+        return (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+    
+    def append(self, name: str, faces: Iterable[np.ndarray],
+               qualities: Optional[Iterable[float]] = None) -> int:
+        """
+        Acrescenta amostras a uma identidade (cria o arquivo se necessário)
+        
+        Args:
+            name: Nome da identidade (mesmo nome da pasta em dataset/)
+            faces: Faces BGR ou em tons de cinza, de qualquer tamanho
+            qualities: Nota de qualidade de cada face (opcional)
+        
+        Returns:
+            Número de amostras gravadas
+        """
+        faces = [prepare_face(face) for face in faces]
+        if not faces:
+            return 0
+        
+        records = np.zeros(len(faces), dtype=RECORD_DTYPE)
+        records['timestamp'] = time.time()
+        if qualities is not None:
+            records['quality'] = list(qualities)
+        records['pixels'] = np.stack(faces)
+        
+        path = self._path(name)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            new_file = not os.path.exists(path)
+            with open(path, "ab") as f:
+                if new_file:
+                    f.write(HEADER.pack(MAGIC, VERSION, FACE_WIDTH, FACE_HEIGHT, 0))
+                else:
+                    # Descarta um registro parcial deixado por uma gravação interrompida
+                    size = f.seek(0, os.SEEK_END)
+                    excess = (size - HEADER.size) % RECORD_DTYPE.itemsize
+                    if excess:
+                        f.truncate(size - excess)
+                        f.seek(0, os.SEEK_END)
+                f.write(records.tobytes())
+        return len(faces)
+    
+    def records(self, name: str) -> np.ndarray:
+        """
+        Registros de uma identidade mapeados em memória (somente leitura)
+        
+        Returns:
+            Array estruturado com os campos timestamp, quality, flags e pixels
+        """
+        path = self._path(name)
+        with open(path, "rb") as f:
+            self._check_header(f, path)
+        
+        count = self.count(name)
+        if count == 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r",
+                         offset=HEADER.size, shape=(count,))
+    
+    def faces(self, name: str) -> np.ndarray:
+        """Faces de uma identidade como array (N, 120, 90) mapeado em memória"""
+        return self.records(name)['pixels']
+    
+    def load_all(self, names: Optional[List[str]] = None
+                 ) -> Tuple[np.ndarray, List[np.ndarray], Dict[str, int]]:
+        """
+        Carrega todas as identidades no formato usado pelo treinamento
+        
+        Returns:
+            Tupla (ids, faces, face_names), como TrainingModule.get_image_data
+        """
+        ids: List[int] = []
+        faces: List[np.ndarray] = []
+        face_names: Dict[str, int] = {}
+        
+        for name in (names if names is not None else self.identities()):
+            pixels = self.faces(name)
+            if len(pixels) == 0:
+                continue
+            face_id = len(face_names) + 1
+            face_names[name] = face_id
+            faces.extend(pixels)
+            ids.extend([face_id] * len(pixels))
+        
+        return np.array(ids), faces, face_names
+    
+    def remove(self, name: str) -> bool:
+        """Remove uma identidade; retorna False se ela não existia"""
+        with self._lock:
+            try:
+                os.remove(self._path(name))
+                return True
+            except FileNotFoundError:
+                return False
+    
+    def import_folder(self, name: str, folder: str) -> Tuple[int, List[str]]:
+        """
+        Importa as imagens de uma pasta do formato antigo (dataset/<nome>/)
+        
+        Returns:
+            Tupla (amostras importadas, arquivos com erro)
+        """
+        faces = []
+        errors = []
+        for filename in sorted(os.listdir(folder)):
+            if not filename.lower().endswith(('.jpg', '.jpeg', '.png')):
+                continue
+            path = os.path.join(folder, filename)
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                errors.append(path)
+                continue
+            faces.append(image)
+        
+        return self.append(name, faces), errors
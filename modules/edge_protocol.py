@@ -0,0 +1,494 @@
+"""
+Divisão borda/central: a porta envia recortes de face, não frames
+
+A porta (borda) roda só a detecção e o rastreamento; para cada trilha ainda
+sem decisão ela envia o recorte normalizado (90x120, tons de cinza) ao
+servidor central, que classifica, vota por trilha e devolve a decisão de
+forma assíncrona.
+
+Protocolo binário sobre TCP. Toda mensagem começa com um cabeçalho fixo
+(MESSAGE_HEADER) com o tipo e o tamanho do corpo:
+
+    HELLO     borda -> central  flags (B) + identificação da porta (UTF-8)
+    FACE      borda -> central  FACE_HEADER + pixels (altura x largura bytes)
+    DECISION  central -> borda  DECISION_HEADER + 3 textos (H + UTF-8):
+                                nome_face, nome, motivo
+
+Cada FACE recebe exatamente um DECISION com o mesmo seq; enquanto a trilha
+não tem votos suficientes o resultado é 'pendente'.
+"""
+import itertools
+import math
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from modules.face_tracker import FaceTrack, FaceTracker
+from utils.metrics import REGISTRY
+
+
+BORDA_BYTES = REGISTRY.counter(
+    "webcam_borda_bytes_total", "Bytes trocados com o servidor central", ["direcao"])
+BORDA_LATENCIA = REGISTRY.histogram(
+    "webcam_borda_latencia_segundos", "Tempo entre enviar um recorte e receber a resposta")
+BORDA_DESCARTADOS = REGISTRY.counter(
+    "webcam_borda_recortes_descartados_total", "Recortes não enviados ao central", ["motivo"])
+
+MAGIC = b"WCE1"
+MESSAGE_HEADER = struct.Struct("<4sBI")     # magic, tipo, tamanho do corpo
+FACE_HEADER = struct.Struct("<IIdfHH")      # seq, trilha, timestamp, conf. detecção, largura, altura
+DECISION_HEADER = struct.Struct("<IIiifB")  # seq, trilha, face_id, usuario_id, confiança, resultado
+TEXT_LENGTH = struct.Struct("<H")
+
+MSG_HELLO = 1
+MSG_FACE = 2
+MSG_DECISION = 3
+
+FLAG_REGISTER = 0x01  # O central grava as decisões no histórico
+
+FACE_WIDTH, FACE_HEIGHT = 90, 120
+MAX_BODY = 1024 * 1024
+
+RESULTADOS = ('pendente', 'liberado', 'negado', 'nao_cadastrado', 'desconhecido', 'erro')
+RESULTADO_CODES = {name: code for code, name in enumerate(RESULTADOS)}
+
+
+class ProtocolError(Exception):
+    """Mensagem malformada ou fora do protocolo"""
+
+
+# ========== Codificação ==========
+
+def pack_message(msg_type: int, body: bytes) -> bytes:
+    return MESSAGE_HEADER.pack(MAGIC, msg_type, len(body)) + body
+
+
+def read_message(stream: BinaryIO) -> Optional[Tuple[int, bytes]]:
+    """
+    Lê uma mensagem completa
+    
+    Returns:
+        (tipo, corpo) ou None se a conexão foi fechada
+    """
+    header = stream.read(MESSAGE_HEADER.size)
+    if len(header) < MESSAGE_HEADER.size:
+        return None
+    magic, msg_type, length = MESSAGE_HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ProtocolError("Cabeçalho inválido")
+    if length > MAX_BODY:
+        raise ProtocolError(f"Mensagem grande demais ({length} bytes)")
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return msg_type, body
+
+
+def pack_hello(door_id: str, register: bool = False) -> bytes:
+    flags = FLAG_REGISTER if register else 0
+    return pack_message(MSG_HELLO, bytes([flags]) + door_id.encode("utf-8"))
+
+
+def unpack_hello(body: bytes) -> Tuple[str, bool]:
+    if not body:
+        raise ProtocolError("HELLO vazio")
+    return body[1:].decode("utf-8"), bool(body[0] & FLAG_REGISTER)
+
+
+def pack_face(seq: int, track_id: int, timestamp: float, detection_conf: float,
+              crop: np.ndarray) -> bytes:
+    """Mensagem FACE com o recorte 90x120 em tons de cinza (uint8)"""
+    if crop.shape != (FACE_HEIGHT, FACE_WIDTH):
+        raise ValueError(f"Recorte deve ser {FACE_WIDTH}x{FACE_HEIGHT} em tons de cinza")
+    header = FACE_HEADER.pack(seq, track_id, timestamp, detection_conf, FACE_WIDTH, FACE_HEIGHT)
+    return pack_message(MSG_FACE, header + np.ascontiguousarray(crop, dtype=np.uint8).tobytes())
+
+
+def unpack_face(body: bytes) -> Tuple[int, int, float, float, np.ndarray]:
+    """
+    Returns:
+        (seq, trilha, timestamp, confiança da detecção, recorte) - o recorte é
+        uma visão somente leitura sobre o corpo da mensagem
+    """
+    seq, track_id, timestamp, detection_conf, width, height = FACE_HEADER.unpack_from(body)
+    if len(body) != FACE_HEADER.size + width * height:
+        raise ProtocolError("Tamanho do recorte não confere com o cabeçalho")
+    crop = np.frombuffer(body, dtype=np.uint8, offset=FACE_HEADER.size).reshape(height, width)
+    return seq, track_id, timestamp, detection_conf, crop
+
+
+def _pack_text(text: Optional[str]) -> bytes:
+    data = (text or "").encode("utf-8")[:0xFFFF]
+    return TEXT_LENGTH.pack(len(data)) + data
+
+
+def pack_decision(seq: int, track_id: int, resultado: str, face_id: Optional[int] = None,
+                  usuario_id: Optional[int] = None, confianca: Optional[float] = None,
+                  nome_face: Optional[str] = None, nome: str = "",
+                  motivo: Optional[str] = None) -> bytes:
+    header = DECISION_HEADER.pack(
+        seq, track_id,
+        -1 if face_id is None else face_id,
+        -1 if usuario_id is None else usuario_id,
+        math.nan if confianca is None else confianca,
+        RESULTADO_CODES[resultado],
+    )
+    body = header + _pack_text(nome_face) + _pack_text(nome) + _pack_text(motivo)
+    return pack_message(MSG_DECISION, body)
+
+
+def unpack_decision(body: bytes) -> Dict:
+    seq, track_id, face_id, usuario_id, confianca, code = DECISION_HEADER.unpack_from(body)
+    offset = DECISION_HEADER.size
+    texts = []
+    for _ in range(3):
+        (length,) = TEXT_LENGTH.unpack_from(body, offset)
+        offset += TEXT_LENGTH.size
+        texts.append(body[offset:offset + length].decode("utf-8"))
+        offset += length
+    nome_face, nome, motivo = texts
+    return {
+        'seq': seq,
+        'track_id': track_id,
+        'resultado': RESULTADOS[code],
+        'face_id': None if face_id < 0 else face_id,
+        'usuario_id': None if usuario_id < 0 else usuario_id,
+        'confianca': None if math.isnan(confianca) else confianca,
+        'nome_face': nome_face or None,
+        'nome': nome,
+        'motivo': motivo or None,
+    }
+
+
+# ========== Servidor central ==========
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _EdgeSession:
+    """Estado de uma porta conectada: trilhas e votos"""
+    
+    def __init__(self, service, sock: socket.socket, door_id: str, register: bool,
+                 voter: FaceTracker, track_timeout: float):
+        self.service = service
+        self.sock = sock
+        self.door_id = door_id
+        self.register = register
+        self.voter = voter
+        self.track_timeout = track_timeout
+        self.tracks: Dict[int, FaceTrack] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+    
+    def process(self, seq: int, track_id: int, crop: np.ndarray):
+        """Classifica o recorte, vota na trilha e responde (roda no pool do serviço)"""
+        try:
+            face_id, conf = self.service.classify(crop)
+            
+            now = time.time()
+            with self._lock:
+                for stale in [t for t, track in self.tracks.items()
+                              if now - track.last_seen > self.track_timeout]:
+                    del self.tracks[stale]
+                track = self.tracks.get(track_id)
+                if track is None:
+                    track = FaceTrack(track_id, (0, 0, 0, 0), self.voter.window, now)
+                    self.tracks[track_id] = track
+                track.last_seen = now
+                decision = self.voter.vote(track, face_id, conf)
+            
+            if decision is None:
+                message = pack_decision(seq, track_id, 'pendente', face_id, confianca=conf)
+            else:
+                _, voted_id, mean_conf = decision
+                result = self.service.decide(voted_id, mean_conf, self.door_id, self.register)
+                message = pack_decision(
+                    seq, track_id, result['resultado'], voted_id, result['usuario_id'],
+                    result['confianca'], result['nome_face'], result['nome'], result.get('motivo'))
+        except Exception as e:
+            message = pack_decision(seq, track_id, 'erro', motivo=str(e))
+        
+        try:
+            with self._send_lock:
+                self.sock.sendall(message)
+        except OSError:
+            pass  # Porta desconectou; a leitura encerra a sessão
+
+
+class EdgeRecognitionServer:
+    """
+    Servidor central que recebe recortes das portas
+    
+    Usa o RecognitionService (modules/recognition_service.py) para classificar
+    e decidir; a votação temporal é feita aqui, por trilha de cada porta.
+    """
+    
+    def __init__(self, service, port: int = 8766, host: str = "127.0.0.1",
+                 window: int = 7, min_votes: int = 4, track_timeout: float = 5.0):
+        """
+        Args:
+            service: Objeto com classify(recorte), decide(face_id, conf, porta, registrar)
+                     e submit_async(fn, *args, block=True)
+            port: Porta TCP (0 escolhe uma porta livre)
+            host: Interface de escuta (padrão apenas local)
+            window: Janela de votos por trilha
+            min_votes: Votos na mesma identidade para decidir
+            track_timeout: Segundos sem recortes para esquecer uma trilha
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self.window = window
+        self.min_votes = min_votes
+        self.track_timeout = track_timeout
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def _make_handler(self):
+        server = self
+        
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                sock = self.request
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                stream = sock.makefile("rb")
+                try:
+                    message = read_message(stream)
+                    if message is None or message[0] != MSG_HELLO:
+                        return
+                    door_id, register = unpack_hello(message[1])
+                    session = _EdgeSession(
+                        server.service, sock, door_id, register,
+                        FaceTracker(window=server.window, min_votes=server.min_votes),
+                        server.track_timeout)
+                    
+                    while True:
+                        message = read_message(stream)
+                        if message is None:
+                            break
+                        msg_type, body = message
+                        if msg_type != MSG_FACE:
+                            raise ProtocolError(f"Tipo de mensagem inesperado: {msg_type}")
+                        seq, track_id, _, _, crop = unpack_face(body)
+                        # Bloqueia a leitura quando o pool está cheio (contrapressão via TCP)
+                        server.service.submit_async(session.process, seq, track_id, crop, block=True)
+                except (OSError, ProtocolError, struct.error) as e:
+                    print(f"⚠ Conexão de borda encerrada: {e}")
+                finally:
+                    stream.close()
+        
+        return _Handler
+    
+    def start(self) -> int:
+        """
+        Inicia o servidor em thread daemon
+        
+        Returns:
+            Porta efetivamente em uso
+        """
+        if self._server is not None:
+            return self.port
+        
+        self._server = _TCPServer((self.host, self.port), self._make_handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.port
+    
+    def stop(self):
+        """Para o servidor"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+
+# ========== Cliente da porta ==========
+
+class EdgeClient:
+    """
+    Conexão da porta com o servidor central
+    
+    send_face() não bloqueia esperando a resposta: as decisões chegam numa
+    thread de leitura e são entregues a on_decision. Se o central cair, os
+    recortes são descartados e a reconexão é tentada a cada reconnect_interval.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8766, door_id: str = "principal",
+                 register: bool = False, on_decision: Optional[Callable[[Dict], None]] = None,
+                 max_in_flight: int = 32, reconnect_interval: float = 2.0,
+                 connect_timeout: float = 5.0):
+        """
+        Args:
+            host, port: Endereço do servidor central
+            door_id: Identificação da porta
+            register: Se True, o central grava as decisões no histórico dele
+            on_decision: Chamado (na thread de leitura) com cada resposta decodificada,
+                         acrescida de 'latencia' (segundos desde o envio)
+            max_in_flight: Recortes sem resposta antes de começar a descartar
+            reconnect_interval: Segundos entre tentativas de reconexão
+            connect_timeout: Prazo para conectar
+        """
+        self.host = host
+        self.port = port
+        self.door_id = door_id
+        self.register = register
+        self.on_decision = on_decision
+        self.max_in_flight = max_in_flight
+        self.reconnect_interval = reconnect_interval
+        self.connect_timeout = connect_timeout
+        
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[threading.Thread] = None
+        self._seq = itertools.count(1)
+        self._sent_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._last_attempt = 0.0
+        self._closed = False
+        
+        # Estatísticas
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.faces_sent = 0
+        self.dropped = 0
+        
+        self._connect()
+    
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+    
+    def _connect(self) -> bool:
+        self._last_attempt = time.monotonic()
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        except OSError as e:
+            print(f"⚠ Servidor central indisponível ({self.host}:{self.port}): {e}")
+            return False
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        hello = pack_hello(self.door_id, self.register)
+        sock.sendall(hello)
+        self.bytes_sent += len(hello)
+        
+        with self._lock:
+            self._sent_at.clear()
+        self._sock = sock
+        self._reader = threading.Thread(target=self._read_loop, args=(sock,),
+                                        name="borda-leitura", daemon=True)
+        self._reader.start()
+        return True
+    
+    def _disconnect(self, sock: socket.socket):
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+        try:
+            sock.close()
+        except OSError:
+            pass
+    
+    def _drop(self, motivo: str) -> None:
+        self.dropped += 1
+        BORDA_DESCARTADOS.inc(motivo=motivo)
+    
+    def send_face(self, track_id: int, crop: np.ndarray, detection_conf: float = 0.0,
+                  timestamp: Optional[float] = None) -> Optional[int]:
+        """
+        Envia o recorte 90x120 de uma trilha
+        
+        Returns:
+            Número de sequência, ou None se o recorte foi descartado
+        """
+        sock = self._sock
+        if sock is None:
+            if self._closed or time.monotonic() - self._last_attempt < self.reconnect_interval:
+                self._drop("desconectado")
+                return None
+            if not self._connect():
+                self._drop("desconectado")
+                return None
+            sock = self._sock
+        
+        with self._lock:
+            if len(self._sent_at) >= self.max_in_flight:
+                self._drop("fila_cheia")
+                return None
+            seq = next(self._seq)
+            self._sent_at[seq] = time.perf_counter()
+        
+        message = pack_face(seq, track_id, time.time() if timestamp is None else timestamp,
+                            detection_conf, crop)
+        try:
+            sock.sendall(message)
+        except OSError:
+            self._disconnect(sock)
+            self._drop("desconectado")
+            return None
+        
+        self.bytes_sent += len(message)
+        self.faces_sent += 1
+        BORDA_BYTES.inc(len(message), direcao="enviados")
+        return seq
+    
+    def _read_loop(self, sock: socket.socket):
+        stream = sock.makefile("rb")
+        try:
+            while True:
+                message = read_message(stream)
+                if message is None:
+                    break
+                msg_type, body = message
+                if msg_type != MSG_DECISION:
+                    continue
+                size = MESSAGE_HEADER.size + len(body)
+                self.bytes_received += size
+                BORDA_BYTES.inc(size, direcao="recebidos")
+                
+                decision = unpack_decision(body)
+                with self._lock:
+                    sent_at = self._sent_at.pop(decision['seq'], None)
+                if sent_at is not None:
+                    decision['latencia'] = time.perf_counter() - sent_at
+                    BORDA_LATENCIA.observe(decision['latencia'])
+                if self.on_decision:
+                    self.on_decision(decision)
+        except (OSError, ProtocolError, struct.error):
+            pass
+        finally:
+            stream.close()
+            self._disconnect(sock)
+    
+    def pending(self) -> int:
+        """Recortes enviados ainda sem resposta"""
+        with self._lock:
+            return len(self._sent_at)
+    
+    def close(self):
+        self._closed = True
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._disconnect(sock)
+        if self._reader is not None:
+            self._reader.join(timeout=2.0)
+    
+    def stats(self) -> Dict[str, float]:
+        return {
+            'recortes': self.faces_sent,
+            'descartados': self.dropped,
+            'bytes_enviados': self.bytes_sent,
+            'bytes_recebidos': self.bytes_received,
+            'bytes_por_recorte': self.bytes_sent / self.faces_sent if self.faces_sent else 0.0,
+        }
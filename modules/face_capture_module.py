@@ -6,38 +6,81 @@ import numpy as np
 import os
 import re
 import time
-import winsound
 from typing import Optional, Callable, Tuple
 from helper_functions import resize_video
+from modules.face_detector import create_face_detector
+from modules.sample_writer import SampleWriter
+from modules.sample_quality import SampleQualityGate
+from modules.dataset_store import DatasetStore
+
+# winsound só existe no Windows
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+
+# Cascades disponíveis para a captura (o LBP é mais rápido que o Haar). O
+# lbpcascade_frontalface_improved.xml não vem no pacote do OpenCV para Python:
+# copie-o de data/lbpcascades/ do repositório do OpenCV para a raiz do projeto
+# ou informe cascade_path
+CASCADE_FILES = {
+    "haarcascade": "haarcascade_frontalface_default.xml",
+    "lbp": "lbpcascade_frontalface_improved.xml",
+}
 
 
 class FaceCaptureModule:
     """Módulo para captura de faces via webcam"""
     
-    def __init__(self, detector_type: str = "haarcascade", max_width: int = 800):
+    def __init__(self, detector_type: str = "haarcascade", max_width: int = 800,
+                 detector_options: Optional[dict] = None,
+                 detection_scale: float = 0.5,
+                 min_face_ratio: float = 0.15,
+                 max_face_ratio: float = 0.9,
+                 cascade_path: Optional[str] = None):
         """
         Inicializa o módulo de captura
         
         Args:
-            detector_type: Tipo de detector ('ssd' ou 'haarcascade')
+            detector_type: Tipo de detector ('ssd', 'haarcascade' ou 'lbp')
             max_width: Largura máxima do vídeo
+            detector_options: Opções repassadas a create_face_detector no modo 'ssd'
+            detection_scale: Escala da imagem usada pelo cascade (caixas são
+                             mapeadas de volta para o frame original)
+            min_face_ratio: Menor face aceita, como fração da altura do frame
+            max_face_ratio: Maior face aceita, como fração da altura do frame
+            cascade_path: Arquivo XML do cascade (padrão: CASCADE_FILES[detector_type]
+                          na raiz do projeto); se não existir, usa o Haar Cascade
         """
         self.detector_type = detector_type
         self.max_width = max_width
+        self.detection_scale = detection_scale
+        self.min_face_ratio = min_face_ratio
+        self.max_face_ratio = max_face_ratio
+        
+        # Última face encontrada (x, y, w, h), usada para restringir a busca
+        self.last_face: Optional[Tuple[int, int, int, int]] = None
         
         # Carrega detector
         if detector_type == "ssd":
-            self.network = cv2.dnn.readNetFromCaffe(
-                "deploy.prototxt.txt",
-                "res10_300x300_ssd_iter_140000.caffemodel"
-            )
+            self.dnn_detector = create_face_detector("ssd", **(detector_options or {}))
             self.face_detector = None
         else:
-            self.face_detector = cv2.CascadeClassifier('haarcascade_frontalface_default.xml')
-            self.network = None
+            if detector_type not in CASCADE_FILES:
+                print(f"⚠ Detector '{detector_type}' desconhecido. Usando Haar Cascade.")
+                detector_type = self.detector_type = "haarcascade"
+            cascade_file = cascade_path or CASCADE_FILES[detector_type]
+            if not os.path.exists(cascade_file):
+                print(f"⚠ Cascade {cascade_file} não encontrado. Usando Haar Cascade.")
+                cascade_file = CASCADE_FILES["haarcascade"]
+                self.detector_type = "haarcascade"
+            self.face_detector = cv2.CascadeClassifier(cascade_file)
+            self.dnn_detector = None
         
         self.camera: Optional[cv2.VideoCapture] = None
         self.is_capturing = False
+        self.last_write_report: Optional[dict] = None
         self.frame_callback: Optional[Callable[[np.ndarray], None]] = None
     
     def set_frame_callback(self, callback: Callable[[np.ndarray], None]):
@@ -50,61 +93,133 @@ class FaceCaptureModule:
         name = re.sub(r"\s+", '_', name)
         return name
     
-    def detect_face_haarcascade(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], np.ndarray]:
-        """Detecta face usando Haar Cascade"""
-        processed_frame = frame.copy()
+    def _cascade_search(self, gray_small: np.ndarray, min_side: int, max_side: int,
+                        region: Optional[Tuple[int, int, int, int]] = None) -> list:
+        """
+        Roda o cascade na imagem reduzida (opcionalmente só em uma janela)
+        
+        Returns:
+            Lista de (x, y, w, h) em coordenadas da imagem reduzida
+        """
+        offset_x, offset_y = 0, 0
+        image = gray_small
+        if region is not None:
+            (x1, y1, x2, y2) = region
+            image = gray_small[y1:y2, x1:x2]
+            offset_x, offset_y = x1, y1
+        
+        faces = self.face_detector.detectMultiScale(
+            image, 1.1, 5, minSize=(min_side, min_side), maxSize=(max_side, max_side)
+        )
+        return [(x + offset_x, y + offset_y, w, h) for (x, y, w, h) in faces]
+    
+    def _search_window(self, small_w: int, small_h: int) -> Optional[Tuple[int, int, int, int]]:
+        """Janela ao redor da última face (em coordenadas reduzidas)"""
+        if self.last_face is None:
+            return None
+        
+        scale = self.detection_scale
+        (x, y, w, h) = [int(v * scale) for v in self.last_face]
+        x1, y1 = max(0, x - w), max(0, y - h)
+        x2, y2 = min(small_w, x + 2 * w), min(small_h, y + 2 * h)
+        return (x1, y1, x2, y2)
+    
+    def detect_face_haarcascade(self, frame: np.ndarray,
+                                draw: bool = True) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Detecta face usando o cascade carregado (Haar ou LBP)
+        
+        A busca roda em uma versão reduzida do frame, limitada a tamanhos
+        plausíveis de face para cadastro e, quando possível, só perto da
+        última face encontrada. Se houver mais de uma face, a maior é usada.
+        
+        Args:
+            frame: Frame BGR
+            draw: Se True, devolve uma cópia do frame com a face marcada;
+                  se False, devolve o próprio frame (sem cópia)
+        """
+        (frame_h, frame_w) = frame.shape[:2]
+        scale = self.detection_scale
+        
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_detector.detectMultiScale(gray, 1.1, 5)
+        small = cv2.resize(gray, (int(frame_w * scale), int(frame_h * scale)),
+                           interpolation=cv2.INTER_AREA) if scale != 1.0 else gray
+        (small_h, small_w) = small.shape[:2]
         
-        face_roi = None
-        for (x, y, w, h) in faces:
+        min_side = max(20, int(small_h * self.min_face_ratio))
+        max_side = max(min_side + 1, int(small_h * self.max_face_ratio))
+        
+        faces = []
+        window = self._search_window(small_w, small_h)
+        if window is not None:
+            faces = self._cascade_search(small, min_side, max_side, window)
+        if not faces:
+            faces = self._cascade_search(small, min_side, max_side)
+        
+        processed_frame = frame.copy() if draw else frame
+        
+        if not faces:
+            self.last_face = None
+            return None, processed_frame
+        
+        # Maior face; empates resolvidos pela posição (mais à esquerda/acima)
+        (x, y, w, h) = max(faces, key=lambda f: (f[2] * f[3], -f[0], -f[1]))
+        (x, y, w, h) = [int(round(v / scale)) for v in (x, y, w, h)]
+        x, y = max(0, x), max(0, y)
+        w, h = min(w, frame_w - x), min(h, frame_h - y)
+        self.last_face = (x, y, w, h)
+        
+        face_roi = cv2.resize(frame[y:y + h, x:x + w], (140, 140))
+        
+        if draw:
             cv2.rectangle(processed_frame, (x, y), (x + w, y + h), (0, 255, 255), 2)
-            face_roi = frame[y:y + h, x:x + w]
-            face_roi = cv2.resize(face_roi, (140, 140))
         
         return face_roi, processed_frame
     
     def detect_face_ssd(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], np.ndarray]:
         """Detecta face usando SSD"""
         processed_frame = frame.copy()
-        (h, w) = frame.shape[:2]
-        blob = cv2.dnn.blobFromImage(
-            cv2.resize(frame, (300, 300)), 
-            1.0,
-            (300, 300), 
-            (104.0, 117.0, 123.0)
-        )
-        self.network.setInput(blob)
-        detections = self.network.forward()
+        detections = self.dnn_detector.detect(frame)
         
         face_roi = None
-        for i in range(0, detections.shape[2]):
-            confidence = detections[0, 0, i, 2]
-            if confidence > 0.7:
-                bbox = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-                (start_x, start_y, end_x, end_y) = bbox.astype("int")
-                
-                if (start_x < 0 or start_y < 0 or end_x > w or end_y > h):
-                    continue
-                
-                face_roi = frame[start_y:end_y, start_x:end_x]
-                face_roi = cv2.resize(face_roi, (90, 120))
-                
-                cv2.rectangle(processed_frame, (start_x, start_y), 
-                            (end_x, end_y), (0, 255, 0), 2)
-                text_conf = "{:.2f}%".format(confidence * 100)
-                cv2.putText(processed_frame, text_conf, (start_x, start_y - 10),
-                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+        self.last_face = None
+        for (start_x, start_y, end_x, end_y, confidence) in detections:
+            face_roi = frame[start_y:end_y, start_x:end_x]
+            face_roi = cv2.resize(face_roi, (90, 120))
+            self.last_face = (start_x, start_y, end_x - start_x, end_y - start_y)
+            
+            cv2.rectangle(processed_frame, (start_x, start_y), 
+                        (end_x, end_y), (0, 255, 0), 2)
+            text_conf = "{:.2f}%".format(confidence * 100)
+            cv2.putText(processed_frame, text_conf, (start_x, start_y - 10),
+                      cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
         
         return face_roi, processed_frame
     
     def capture_faces(self, person_name: str, output_path: str, 
                      output_path_full: str, max_samples: int = 10,
                      capture_interval: float = 1.0,
-                     progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     save_full_frame: bool = True,
+                     image_format: str = "jpg",
+                     jpeg_quality: int = 95,
+                     writer_workers: int = 2,
+                     quality_gate: Optional[SampleQualityGate] = None,
+                     dataset_store: Optional[DatasetStore] = None,
+                     max_capture_time: Optional[float] = 120.0) -> int:
         """
         Captura faces da webcam
         
+        As imagens são gravadas por um SampleWriter em segundo plano; a thread
+        de captura nunca espera pelo disco. Com quality_gate, amostras borradas,
+        mal expostas, pequenas ou repetidas são ignoradas e a captura termina
+        assim que o filtro atinge target_samples (ou max_samples, se menor).
+        Se max_capture_time se esgotar antes (iluminação ruim, pessoa parada
+        gerando só amostras repetidas), a captura termina com as amostras já
+        obtidas e um aviso.
+        Com dataset_store, as faces vão para o dataset empacotado (identidade =
+        nome da pasta output_path) em vez de arquivos soltos.
+        
         Args:
             person_name: Nome da pessoa (será normalizado)
             output_path: Caminho para salvar faces recortadas
@@ -112,27 +227,52 @@ class FaceCaptureModule:
             max_samples: Número máximo de amostras
             capture_interval: Intervalo entre capturas (segundos)
             progress_callback: Callback(amostra_atual, total)
+            save_full_frame: Se True, grava também o frame completo em output_path_full
+            image_format: 'jpg' ou 'png'
+            jpeg_quality: Qualidade JPEG (0-100)
+            writer_workers: Threads de gravação
+            quality_gate: Filtro de qualidade/diversidade (opcional)
+            dataset_store: Dataset empacotado que recebe as faces (opcional)
+            max_capture_time: Tempo máximo da captura em segundos (None = sem limite)
         
         Returns:
-            Número de amostras capturadas
+            Número de amostras gravadas com sucesso
         """
         person_name = self.parse_name(person_name)
         
         # Cria diretórios
-        os.makedirs(output_path, exist_ok=True)
-        os.makedirs(output_path_full, exist_ok=True)
+        if dataset_store is None:
+            os.makedirs(output_path, exist_ok=True)
+        if save_full_frame:
+            os.makedirs(output_path_full, exist_ok=True)
         
         self.camera = cv2.VideoCapture(0)
         
         if not self.camera.isOpened():
             raise RuntimeError("Não foi possível abrir a câmera")
         
+        writer = SampleWriter(workers=writer_workers, image_format=image_format,
+                              jpeg_quality=jpeg_quality)
+        
         self.is_capturing = True
+        self.last_face = None
         sample = 0
         last_capture_time = time.time()
+        deadline = last_capture_time + max_capture_time if max_capture_time else None
+        packed_faces = []
+        total = max_samples
+        if quality_gate is not None:
+            quality_gate.reset()
+            total = min(max_samples, quality_gate.target_samples)
         
         try:
-            while sample < max_samples and self.is_capturing:
+            while (sample < total and self.is_capturing
+                   and not (quality_gate is not None and quality_gate.is_complete())):
+                if deadline is not None and time.time() >= deadline:
+                    print(f"⚠ Tempo máximo de captura ({max_capture_time:.0f} s) esgotado: "
+                          f"{sample} de {total} amostras obtidas")
+                    break
+                
                 ret, frame = self.camera.read()
                 
                 if not ret:
@@ -145,11 +285,13 @@ class FaceCaptureModule:
                     )
                     frame = cv2.resize(frame, (video_width, video_height))
                 
-                # Detecta face
+                # Detecta face (só copia o frame para desenhar se houver pré-visualização)
                 if self.detector_type == "ssd":
                     face_roi, processed_frame = self.detect_face_ssd(frame)
                 else:
-                    face_roi, processed_frame = self.detect_face_haarcascade(frame)
+                    face_roi, processed_frame = self.detect_face_haarcascade(
+                        frame, draw=self.frame_callback is not None
+                    )
                 
                 # Callback do frame
                 if self.frame_callback:
@@ -157,28 +299,34 @@ class FaceCaptureModule:
                 
                 # Captura automática
                 if face_roi is not None and (time.time() - last_capture_time) >= capture_interval:
-                    sample += 1
-                    image_name = f"{person_name}.{sample}.jpg"
+                    # Filtro de qualidade: amostra rejeitada não conta e não reinicia o intervalo
+                    if quality_gate is not None:
+                        face_size = min(self.last_face[2:]) if self.last_face else 0
+                        accepted, _ = quality_gate.check(face_roi, face_size)
+                        if not accepted:
+                            continue
                     
-                    # Garante que os diretórios existem
-                    os.makedirs(output_path, exist_ok=True)
-                    os.makedirs(output_path_full, exist_ok=True)
+                    image_name = f"{person_name}.{sample + 1}.{writer.extension}"
                     
-                    # Salva as imagens
-                    face_path = os.path.join(output_path, image_name)
-                    full_path = os.path.join(output_path_full, image_name)
+                    if dataset_store is not None:
+                        packed_faces.append(face_roi)
+                    # Enfileira as imagens (gravação em segundo plano)
+                    elif not writer.submit(os.path.join(output_path, image_name), face_roi, "face"):
+                        # Fila cheia: descarta esta amostra e tenta no próximo frame
+                        continue
+                    if save_full_frame:
+                        writer.submit(os.path.join(output_path_full, image_name), frame, "frame")
                     
-                    success_face = cv2.imwrite(face_path, face_roi)
-                    success_full = cv2.imwrite(full_path, frame)
-                    
-                    if not success_face or not success_full:
-                        print(f"⚠ Aviso: Erro ao salvar imagem {image_name}")
+                    # Só a amostra guardada entra no controle de diversidade
+                    if quality_gate is not None:
+                        quality_gate.add(face_roi)
+                    sample += 1
                     
                     # REMOVIDO: Beep durante captura (será apenas no final)
                     
                     # Callback de progresso
                     if progress_callback:
-                        progress_callback(sample, max_samples)
+                        progress_callback(sample, total)
                     
                     last_capture_time = time.time()
         
@@ -186,8 +334,29 @@ class FaceCaptureModule:
             self.camera.release()
             self.is_capturing = False
             
+            # Aguarda as gravações pendentes e resume o resultado
+            report = writer.close()
+            self.last_write_report = report
+            failed_faces = report['falhas'].get('face', 0)
+            sample -= failed_faces
+            if failed_faces or report['falhas'].get('frame', 0) or report['descartadas']:
+                print(f"⚠ Aviso: {sum(report['falhas'].values())} imagem(ns) com erro ao salvar, "
+                      f"{report['descartadas']} descartada(s) por fila cheia")
+                for erro in report['erros']:
+                    print(f"   - {erro}")
+            if packed_faces:
+                identity = os.path.basename(os.path.normpath(output_path))
+                try:
+                    dataset_store.append(identity, packed_faces)
+                except Exception as e:
+                    print(f"⚠ Erro ao gravar no dataset empacotado: {e}")
+                    sample = 0
+            if quality_gate is not None and quality_gate.rejections:
+                resumo = ", ".join(f"{k}: {v}" for k, v in sorted(quality_gate.rejections.items()))
+                print(f"ℹ Amostras rejeitadas pelo filtro de qualidade - {resumo}")
+            
             # Beep final quando todas as capturas terminarem
-            if sample >= max_samples:
+            if sample >= total and winsound is not None:
                 try:
                     winsound.Beep(1000, 300)  # Beep mais longo e agudo no final
                 except Exception:
@@ -200,4 +369,3 @@ class FaceCaptureModule:
         self.is_capturing = False
         if self.camera:
             self.camera.release()
-
@@ -0,0 +1,311 @@
+"""
+Fábrica de detectores de faces (SSD Caffe, SSD ONNX e YuNet)
+
+Centraliza a escolha do modelo, do backend/target do OpenCV DNN, do número
+de threads e do tamanho de entrada, que antes ficavam fixos em cada módulo.
+"""
+import os
+import cv2
+import numpy as np
+from typing import Optional, List, Tuple, Sequence
+
+# (start_x, start_y, end_x, end_y, confiança) em coordenadas da imagem
+Detection = Tuple[int, int, int, int, float]
+
+DEFAULT_PROTOTXT = "deploy.prototxt.txt"
+DEFAULT_CAFFEMODEL = "res10_300x300_ssd_iter_140000.caffemodel"
+DEFAULT_YUNET_MODEL = "face_detection_yunet_2023mar.onnx"
+
+BACKENDS = {
+    "default": cv2.dnn.DNN_BACKEND_DEFAULT,
+    "opencv": cv2.dnn.DNN_BACKEND_OPENCV,
+    "openvino": cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE,
+    "cuda": cv2.dnn.DNN_BACKEND_CUDA,
+}
+
+TARGETS = {
+    "cpu": cv2.dnn.DNN_TARGET_CPU,
+    "opencl": cv2.dnn.DNN_TARGET_OPENCL,
+    "opencl_fp16": cv2.dnn.DNN_TARGET_OPENCL_FP16,
+    "cuda": cv2.dnn.DNN_TARGET_CUDA,
+    "cuda_fp16": cv2.dnn.DNN_TARGET_CUDA_FP16,
+}
+
+
+def configure_threads(num_threads: Optional[int]):
+    """
+    Define o orçamento de threads do OpenCV (afeta DNN, resize, etc.)
+    
+    Args:
+        num_threads: Número de threads (None mantém o padrão do OpenCV)
+    """
+    if num_threads is not None:
+        cv2.setNumThreads(max(0, int(num_threads)))
+
+
+class SSDFaceDetector:
+    """Detector SSD ResNet-10 (Caffe ou ONNX quantizado) via OpenCV DNN"""
+    
+    name = "ssd"
+    
+    def __init__(self, model_path: str = DEFAULT_CAFFEMODEL,
+                 config_path: Optional[str] = DEFAULT_PROTOTXT,
+                 input_size: Tuple[int, int] = (300, 300),
+                 confidence: float = 0.7,
+                 backend: str = "default", target: str = "cpu"):
+        """
+        Inicializa o detector SSD
+        
+        Args:
+            model_path: Arquivo .caffemodel ou .onnx
+            config_path: Arquivo .prototxt (ignorado para ONNX)
+            input_size: Tamanho de entrada padrão (largura, altura)
+            confidence: Confiança mínima de detecção
+            backend: Backend do OpenCV DNN (ver BACKENDS)
+            target: Target do OpenCV DNN (ver TARGETS)
+        """
+        if model_path.lower().endswith(".onnx"):
+            self.network = cv2.dnn.readNetFromONNX(model_path)
+            self.name = "ssd_onnx"
+        else:
+            self.network = cv2.dnn.readNetFromCaffe(config_path, model_path)
+        
+        self.network.setPreferableBackend(BACKENDS[backend])
+        self.network.setPreferableTarget(TARGETS[target])
+        self.input_size = tuple(input_size)
+        self.confidence = confidence
+    
+    def _make_blob(self, images: Sequence[np.ndarray], input_size: Tuple[int, int]) -> np.ndarray:
+        resized = [cv2.resize(img, input_size) for img in images]
+        return cv2.dnn.blobFromImages(resized, 1.0, input_size, (104.0, 117.0, 123.0))
+    
+    def _parse(self, detections: np.ndarray, index: int, w: int, h: int) -> List[Detection]:
+        """Converte a saída do SSD (1, 1, N, 7) da imagem index em caixas"""
+        faces = []
+        for row in detections[0, 0]:
+            if int(row[0]) != index:
+                continue
+            confidence = float(row[2])
+            if confidence <= self.confidence:
+                continue
+            (start_x, start_y, end_x, end_y) = (row[3:7] * np.array([w, h, w, h])).astype("int")
+            
+            # Validação de limites
+            if start_x < 0 or start_y < 0 or end_x > w or end_y > h:
+                continue
+            faces.append((int(start_x), int(start_y), int(end_x), int(end_y), confidence))
+        return faces
+    
+    def forward_raw(self, image: np.ndarray, input_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Saída bruta da rede para uma imagem (coordenadas normalizadas)"""
+        self.network.setInput(self._make_blob([image], input_size or self.input_size))
+        return self.network.forward()
+    
+    def detect(self, image: np.ndarray, input_size: Optional[Tuple[int, int]] = None) -> List[Detection]:
+        """
+        Detecta faces em uma imagem BGR
+        
+        Args:
+            image: Imagem BGR
+            input_size: Tamanho de entrada desta chamada (padrão: self.input_size)
+        """
+        (h, w) = image.shape[:2]
+        return self._parse(self.forward_raw(image, input_size), 0, w, h)
+    
+    def detect_batch(self, images: Sequence[np.ndarray]) -> List[List[Detection]]:
+        """
+        Detecta faces em várias imagens com um único forward
+        
+        Returns:
+            Lista de detecções, na mesma ordem das imagens
+        """
+        if not images:
+            return []
+        self.network.setInput(self._make_blob(images, self.input_size))
+        detections = self.network.forward()
+        return [self._parse(detections, i, img.shape[1], img.shape[0])
+                for i, img in enumerate(images)]
+
+
+class YuNetFaceDetector:
+    """Detector YuNet (ONNX) via cv2.FaceDetectorYN"""
+    
+    name = "yunet"
+    
+    def __init__(self, model_path: str = DEFAULT_YUNET_MODEL,
+                 input_size: Tuple[int, int] = (320, 320),
+                 confidence: float = 0.7,
+                 backend: str = "default", target: str = "cpu"):
+        """
+        Inicializa o detector YuNet
+        
+        Args:
+            model_path: Arquivo .onnx do YuNet
+            input_size: Tamanho de entrada padrão (largura, altura)
+            confidence: Confiança mínima de detecção
+            backend: Backend do OpenCV DNN (ver BACKENDS)
+            target: Target do OpenCV DNN (ver TARGETS)
+        """
+        if not hasattr(cv2, "FaceDetectorYN"):
+            raise RuntimeError("cv2.FaceDetectorYN indisponível (requer OpenCV >= 4.5.4)")
+        
+        self.input_size = tuple(input_size)
+        self.confidence = confidence
+        self.detector = cv2.FaceDetectorYN.create(
+            model_path, "", self.input_size, confidence, 0.3, 5000,
+            BACKENDS[backend], TARGETS[target]
+        )
+    
+    def detect(self, image: np.ndarray, input_size: Optional[Tuple[int, int]] = None) -> List[Detection]:
+        """
+        Detecta faces em uma imagem BGR
+        
+        O YuNet trabalha na resolução informada; a imagem é reduzida para
+        caber em input_size mantendo a proporção (640x480 em 320x320 vira
+        320x240, sem achatar as faces) e as caixas são mapeadas de volta.
+        """
+        (h, w) = image.shape[:2]
+        box_w, box_h = input_size or self.input_size
+        scale = min(box_w / float(w), box_h / float(h))
+        in_w, in_h = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+        self.detector.setInputSize((in_w, in_h))
+        _, faces = self.detector.detect(cv2.resize(image, (in_w, in_h)))
+        
+        results = []
+        if faces is None:
+            return results
+        
+        scale_x, scale_y = w / float(in_w), h / float(in_h)
+        for face in faces:
+            x, y, fw, fh = face[:4]
+            start_x, start_y = int(x * scale_x), int(y * scale_y)
+            end_x, end_y = int((x + fw) * scale_x), int((y + fh) * scale_y)
+            if start_x < 0 or start_y < 0 or end_x > w or end_y > h:
+                continue
+            results.append((start_x, start_y, end_x, end_y, float(face[-1])))
+        return results
+    
+    def detect_batch(self, images: Sequence[np.ndarray]) -> List[List[Detection]]:
+        """YuNet não aceita lote: processa as imagens em sequência"""
+        return [self.detect(img) for img in images]
+
+
+def create_face_detector(kind: str = "ssd", model_path: Optional[str] = None,
+                         config_path: Optional[str] = None,
+                         input_size: Optional[Tuple[int, int]] = None,
+                         confidence: float = 0.7,
+                         backend: str = "default", target: str = "cpu",
+                         num_threads: Optional[int] = None):
+    """
+    Cria um detector de faces
+    
+    Args:
+        kind: 'ssd' (Caffe), 'ssd_onnx' (ex: SSD quantizado) ou 'yunet'
+        model_path: Caminho do modelo (padrão depende do tipo)
+        config_path: Caminho do .prototxt (apenas 'ssd')
+        input_size: Tamanho de entrada (largura, altura)
+        confidence: Confiança mínima de detecção
+        backend: 'default', 'opencv', 'openvino' ou 'cuda'
+        target: 'cpu', 'opencl', 'opencl_fp16', 'cuda' ou 'cuda_fp16'
+        num_threads: Orçamento de threads do OpenCV (None = padrão)
+    
+    Returns:
+        Detector com detect(image) e detect_batch(images)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inválido: {backend}")
+    if target not in TARGETS:
+        raise ValueError(f"Target inválido: {target}")
+    
+    configure_threads(num_threads)
+    
+    if kind == "ssd":
+        return SSDFaceDetector(model_path or DEFAULT_CAFFEMODEL, config_path or DEFAULT_PROTOTXT,
+                               input_size or (300, 300), confidence, backend, target)
+    if kind == "ssd_onnx":
+        if not model_path:
+            raise ValueError("Informe o caminho do modelo ONNX do SSD")
+        return SSDFaceDetector(model_path, None, input_size or (300, 300),
+                               confidence, backend, target)
+    if kind == "yunet":
+        path = model_path or DEFAULT_YUNET_MODEL
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Modelo YuNet não encontrado: {path}")
+        return YuNetFaceDetector(path, input_size or (320, 320), confidence, backend, target)
+    
+    raise ValueError(f"Detector inválido: {kind}")
+
+
+def box_iou(a: Detection, b: Detection) -> float:
+    """Interseção sobre união de duas caixas"""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / float(union) if union > 0 else 0.0
+
+
+def compare_detectors(reference, candidates: dict, frames: Sequence[np.ndarray],
+                      iou_threshold: float = 0.5, warmup: int = 3) -> dict:
+    """
+    Compara detectores contra uma referência (normalmente o SSD padrão)
+    
+    Sem anotações manuais, a "acurácia" é a concordância com a referência:
+    precisão e recall das caixas casadas por IoU.
+    
+    Args:
+        reference: Detector de referência
+        candidates: {nome: detector} a comparar
+        frames: Frames BGR de teste (webcam ou imagens)
+        iou_threshold: IoU mínimo para considerar duas caixas a mesma face
+        warmup: Frames descartados antes de medir tempo
+    
+    Returns:
+        {nome: {'ms_medio', 'ms_p95', 'fps', 'precisao', 'recall'}}
+    """
+    import time
+    
+    def run(detector):
+        for frame in frames[:warmup]:
+            detector.detect(frame)
+        outputs, times = [], []
+        for frame in frames:
+            start = time.perf_counter()
+            outputs.append(detector.detect(frame))
+            times.append(time.perf_counter() - start)
+        return outputs, times
+    
+    ref_outputs, ref_times = run(reference)
+    all_results = {'referencia': (ref_outputs, ref_times)}
+    for name, detector in candidates.items():
+        all_results[name] = run(detector)
+    
+    report = {}
+    for name, (outputs, times) in all_results.items():
+        matched = total_pred = total_ref = 0
+        for pred, ref in zip(outputs, ref_outputs):
+            total_pred += len(pred)
+            total_ref += len(ref)
+            used = set()
+            for p in pred:
+                best, best_iou = None, iou_threshold
+                for j, r in enumerate(ref):
+                    if j in used:
+                        continue
+                    iou = box_iou(p, r)
+                    if iou >= best_iou:
+                        best, best_iou = j, iou
+                if best is not None:
+                    used.add(best)
+                    matched += 1
+        
+        times_sorted = sorted(times)
+        mean = sum(times) / len(times) if times else 0.0
+        report[name] = {
+            'ms_medio': mean * 1000,
+            'ms_p95': times_sorted[int(0.95 * (len(times_sorted) - 1))] * 1000 if times else 0.0,
+            'fps': 1.0 / mean if mean > 0 else 0.0,
+            'precisao': matched / total_pred if total_pred else 1.0,
+            'recall': matched / total_ref if total_ref else 1.0,
+        }
+    return report
@@ -7,20 +7,114 @@ import pickle
 import threading
 import time
 import os
-from typing import Optional, Callable, Dict
-from database.db_manager import DatabaseManager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, List, Tuple
+from database.db_manager import DatabaseManager, DB_FILA_ESCRITA
 from utils.permissions import PermissionChecker
 from utils.notifications import NotificationManager
+from utils.profiler import StageProfiler
+from utils.metrics import REGISTRY
+from utils.ttl_cache import TTLCache
+from utils.event_bus import EventBus
+from utils.startup import StartupTimer
+from modules.roi_detection import RoiScheduler, roi_input_size
+from modules.motion_gate import MotionGate
+from modules.face_detector import create_face_detector, configure_threads
+from modules.face_tracker import FaceTracker
+from modules.access_events import RecognitionEvent, AccessEvent
+from modules.process_pipeline import ProcessPipeline, ClassifiedFace
+from modules.parallel_recognition import create_recognition_executor
+from modules.shared_gallery import SharedGallery
 from helper_functions import resize_video
 
 
+# Métricas expostas pelo endpoint opcional (utils/metrics.py)
+FRAMES_CAPTURADOS = REGISTRY.counter(
+    "webcam_frames_capturados_total", "Frames lidos da câmera")
+FRAMES_PROCESSADOS = REGISTRY.counter(
+    "webcam_frames_processados_total", "Frames que passaram pelo reconhecimento")
+FRAMES_DESCARTADOS = REGISTRY.counter(
+    "webcam_frames_descartados_total", "Frames descartados antes do reconhecimento", ["motivo"])
+LATENCIA_DETECCAO = REGISTRY.histogram(
+    "webcam_deteccao_latencia_segundos", "Latência da detecção de faces por frame")
+LATENCIA_RECONHECIMENTO = REGISTRY.histogram(
+    "webcam_reconhecimento_latencia_segundos", "Latência do predict por face")
+RECONHECIMENTOS = REGISTRY.counter(
+    "webcam_reconhecimentos_total", "Decisões de acesso por resultado", ["resultado"])
+DETECCOES_POR_MODO = REGISTRY.counter(
+    "webcam_deteccoes_total", "Detecções executadas por modo (completa ou roi)", ["modo"])
+FRACAO_IGNORADA = REGISTRY.gauge(
+    "webcam_motion_gate_fracao_ignorada", "Fração de frames sem detecção por falta de movimento")
+CPU_ECONOMIZADA = REGISTRY.counter(
+    "webcam_motion_gate_cpu_economizada_segundos_total",
+    "Estimativa de CPU poupada pelos frames pulados (custo médio de um frame processado)")
+PROCESSO_CPU = REGISTRY.gauge(
+    "webcam_processo_cpu_segundos", "Tempo de CPU consumido pelo processo")
+MODELO_TEMPO_CARGA = REGISTRY.gauge(
+    "webcam_modelo_tempo_carga_segundos", "Tempo de carga dos modelos", ["componente"])
+MODELO_INFO = REGISTRY.gauge(
+    "webcam_modelo_info", "Reconhecedor carregado e versão do arquivo treinado",
+    ["reconhecedor", "versao"])
+FACES_RASTREADAS = REGISTRY.gauge(
+    "webcam_faces_rastreadas", "Trilhas de faces ativas")
+COOLDOWNS_ATIVOS = REGISTRY.gauge(
+    "webcam_cooldowns_ativos", "Chaves em cooldown de notificação/registro")
+SUPRIMIDOS_COOLDOWN = REGISTRY.counter(
+    "webcam_decisoes_suprimidas_total", "Decisões ignoradas por estarem em cooldown", ["resultado"])
+AQUECIMENTO = REGISTRY.gauge(
+    "webcam_aquecimento_segundos", "Duração do aquecimento de cada modelo", ["componente"])
+PRIMEIRO_FRAME = REGISTRY.gauge(
+    "webcam_primeiro_frame_latencia_segundos",
+    "Primeiro frame após iniciar: tempo de processamento e tempo desde o início", ["etapa"])
+
+
+# Cooldown padrão (segundos) por resultado antes de notificar/registrar de novo
+DEFAULT_COOLDOWNS = {
+    'liberado': 10.0,
+    'negado': 10.0,
+    'desconhecido': 10.0,
+    'nenhum_usuario': 10.0,
+}
+
+
 class FaceRecognitionModule:
     """Módulo de reconhecimento facial com integração ao banco de dados"""
     
+    # Descarte do buffer da câmera ao sair do sono do modo ocioso
+    DRAIN_MAX_FRAMES = 10
+    DRAIN_WAIT_S = 0.005
+    
     def __init__(self, db_manager: DatabaseManager, 
                  recognizer_type: str = "lbph",
                  threshold: float = 10e5,
-                 max_width: int = 800):
+                 max_width: int = 800,
+                 profiling: bool = False,
+                 roi_detection: bool = False,
+                 full_scan_interval: int = 15,
+                 motion_gating: bool = False,
+                 idle_fps: float = 5.0,
+                 detector_type: str = "ssd",
+                 detector_options: Optional[Dict] = None,
+                 camera_source=0,
+                 detection_service=None,
+                 vote_window: int = 7,
+                 min_votes: int = 4,
+                 door_id: str = "principal",
+                 cooldowns: Optional[Dict[str, float]] = None,
+                 cooldown_cache: Optional[TTLCache] = None,
+                 event_bus: Optional[EventBus] = None,
+                 speech_backend: str = "auto",
+                 background_load: bool = False,
+                 startup_timer: Optional[StartupTimer] = None,
+                 warm_up_passes: int = 2,
+                 edge_client=None,
+                 processes: int = 0,
+                 ring_slots: int = 8,
+                 parallel_recognition: Optional[str] = None,
+                 recognition_workers: int = 4,
+                 shared_gallery: Optional[str] = None,
+                 detection_interval: int = 1,
+                 auto_tuner=None):
         """
         Inicializa o módulo de reconhecimento
         
@@ -29,26 +123,102 @@ class FaceRecognitionModule:
             recognizer_type: Tipo de reconhecedor ('eigenfaces', 'fisherfaces', 'lbph')
             threshold: Threshold de confiança (10e5 = sempre retorna predição)
             max_width: Largura máxima do vídeo
+            profiling: Se True, mede o tempo de cada estágio do pipeline
+            roi_detection: Se True, detecta apenas ao redor das faces já conhecidas
+            full_scan_interval: Frames entre varreduras completas no modo ROI
+            motion_gating: Se True, só detecta quando há movimento (ou em heartbeat)
+            idle_fps: Taxa de captura quando a cena está parada (modo ocioso)
+            detector_type: Detector de faces ('ssd', 'ssd_onnx' ou 'yunet')
+            detector_options: Opções repassadas a create_face_detector
+                              (model_path, input_size, backend, target, num_threads...)
+            camera_source: Índice da câmera ou URL/arquivo do stream
+            detection_service: BatchDetectionService compartilhado entre várias
+                               câmeras (None = detecção própria, frame a frame)
+            vote_window: Frames na janela de votos de cada face rastreada
+            min_votes: Votos na mesma pessoa para decidir o acesso
+            door_id: Identificação da porta/câmera (os cooldowns são por porta)
+            cooldowns: Segundos de cooldown por resultado ('liberado', 'negado',
+                       'desconhecido', 'nenhum_usuario'); sobrepõe DEFAULT_COOLDOWNS
+            cooldown_cache: TTLCache compartilhado entre portas do mesmo processo
+            event_bus: Barramento de eventos de acesso (padrão: um próprio); outros
+                       assinantes (saídas externas) podem ser registrados nele
+            speech_backend: Síntese de voz ('auto', 'win32', 'pyttsx3' ou 'none')
+            background_load: Se True, não carrega os modelos aqui; chame load_async()
+                             (ou load_models()) e acompanhe load_state
+            startup_timer: Recebe os tempos de carga de cada componente
+            warm_up_passes: Passadas de aquecimento (detecção e predict sobre imagens
+                            sintéticas) após carregar ou recarregar os modelos (0 = desliga)
+            edge_client: EdgeClient (modules/edge_protocol.py); se informado, a porta só
+                         detecta e rastreia, e o reconhecimento e a decisão ficam no
+                         servidor central (o reconhecedor local não é carregado)
+            processes: Processos de reconhecimento no modo multiprocesso (0 = tudo neste
+                       processo); a captura também ganha um processo próprio e os frames
+                       passam por um anel em memória compartilhada
+            ring_slots: Frames no anel do modo multiprocesso
+            parallel_recognition: Predict das faces de um frame em paralelo: 'thread',
+                                  'process' (modelo pré-carregado em cada worker) ou
+                                  None (sequencial)
+            recognition_workers: Threads ou processos do reconhecimento paralelo
+            shared_gallery: Diretório da galeria publicada (modules/shared_gallery.py); se
+                            informado, o reconhecedor lê as matrizes mapeadas em memória,
+                            compartilhadas entre processos, em vez de carregar o .yml
+            detection_interval: Detecta faces a cada N frames (os demais só são exibidos)
+            auto_tuner: AutoTuner (modules/auto_tuner.py) que escolhe largura, entrada do
+                        detector, intervalo de detecção e threads ao carregar os modelos
+                        e reajusta sob sobrecarga; sobrepõe max_width e detection_interval
         """
+        if processes and edge_client is not None:
+            raise ValueError("O modo multiprocesso não pode ser combinado com o modo borda")
+        if auto_tuner is not None and (processes or detection_service is not None):
+            raise ValueError("O ajuste automático requer detecção própria, no processo único")
+        if roi_detection and detection_service is not None:
+            raise ValueError("A detecção por ROI requer detecção própria (o serviço em lote "
+                             "só recebe frames inteiros)")
+        
         self.db_manager = db_manager
         self.permission_checker = PermissionChecker(db_manager)
-        self.notification_manager = NotificationManager()
+        self.startup_timer = startup_timer or StartupTimer()
+        self.notification_manager = NotificationManager(speech_backend, self.startup_timer)
         
         self.recognizer_type = recognizer_type
         self.threshold = threshold
+        self.shared_gallery = shared_gallery
         self.max_width = max_width
+        self.warm_up_passes = warm_up_passes
         
-        # Carrega o reconhecedor
-        self.face_classifier = self._load_recognizer(recognizer_type)
+        # Detecção por região de interesse (opcional)
+        self.roi_scheduler: Optional[RoiScheduler] = (
+            RoiScheduler(full_scan_interval=full_scan_interval) if roi_detection else None
+        )
         
-        # Carrega mapeamento de nomes
-        self.face_names = self._load_face_names()
+        # Porta de movimento (opcional)
+        self.motion_gate: Optional[MotionGate] = MotionGate() if motion_gating else None
+        self.idle_fps = idle_fps
+        self.last_face_count = 0
         
-        # Carrega detector SSD
-        self.network = cv2.dnn.readNetFromCaffe(
-            "deploy.prototxt.txt",
-            "res10_300x300_ssd_iter_140000.caffemodel"
-        )
+        # Intervalo de detecção (ajustável pelo AutoTuner)
+        self.detection_interval = max(1, detection_interval)
+        self._frames_since_detection = 0
+        self.auto_tuner = auto_tuner
+        self._frame_cpu_cost = 0.0  # Média móvel do tempo de CPU de um frame processado
+        
+        # Instrumentação por estágio (desligada por padrão)
+        self.profiler = StageProfiler(enabled=profiling)
+        
+        # Modelos (reconhecedor, nomes e detector): preenchidos por load_models()
+        self.face_classifier = None
+        self.face_names: Dict[int, str] = {}
+        self.detector = None
+        self.detector_type = detector_type
+        self.detector_options = detector_options or {}
+        self.detection_service = detection_service
+        self.camera_source = camera_source
+        
+        # 'pendente', 'carregando', 'pronto' ou 'erro'
+        self.load_state = 'pendente'
+        self.load_error: Optional[Exception] = None
+        self._load_done = threading.Event()
+        self._reload_lock = threading.Lock()  # Uma recarga do reconhecedor por vez
         
         # Estado do reconhecimento
         self.is_running = False
@@ -60,12 +230,220 @@ class FaceRecognitionModule:
         self.access_callback: Optional[Callable[[Dict], None]] = None
         
         # Controle de rate limiting para evitar spam de notificações
-        self.last_recognition_time = {}
-        self.recognition_cooldown = 10.0  # segundos entre reconhecimentos do mesmo usuário
+        self.door_id = door_id
+        self.cooldowns = dict(DEFAULT_COOLDOWNS, **(cooldowns or {}))
+        self.cooldown_cache = cooldown_cache if cooldown_cache is not None else TTLCache()
+        
+        # Decisões e efeitos colaterais (banco, notificações, interface) fora da thread da câmera
+        self.event_bus = event_bus if event_bus is not None else EventBus()
+        self._subscribe_handlers()
+        
+        # Rastreamento + votação: uma decisão por face por passagem
+        self.tracker = FaceTracker(window=vote_window, min_votes=min_votes)
+        
+        # Modo borda: as decisões chegam do servidor central
+        self.edge_client = edge_client
+        if edge_client is not None:
+            edge_client.on_decision = self._on_edge_decision
+        
+        # Modo multiprocesso: captura, detecção e predict fora deste processo
+        self.processes = processes
+        self.ring_slots = ring_slots
+        self.process_pipeline: Optional[ProcessPipeline] = None
+        
+        # Reconhecimento paralelo das faces de um frame (criado por load_models)
+        self.parallel_recognition = parallel_recognition
+        self.recognition_workers = recognition_workers
+        self.face_executor = None
+        
+        if not background_load:
+            self.load_models()
+    
+    def load_models(self):
+        """
+        Carrega detector, reconhecedor e mapeamento de nomes em paralelo
+        
+        Cada componente roda numa thread própria (o OpenCV libera o GIL durante
+        a leitura dos modelos) e tem o tempo registrado em startup_timer.
+        
+        Raises:
+            Exception: Erro do componente que falhou (load_state = 'erro')
+        """
+        self.load_state = 'carregando'
+        self.load_error = None
+        self._load_done.clear()
+        
+        # No modo multiprocesso, detector e reconhecedor são carregados em cada processo;
+        # com o serviço de detecção em lote, o detector é o do serviço
+        tasks = {}
+        if not self.processes and self.detection_service is None:
+            tasks['detector'] = self._load_detector
+        if self.edge_client is None:
+            if not self.processes:
+                tasks['reconhecedor'] = lambda: self._load_recognizer(self.recognizer_type)
+            tasks['nomes'] = self._load_face_names
+        
+        def timed(component, task):
+            with self.startup_timer.measure(component):
+                return task()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(tasks)), thread_name_prefix="carga") as pool:
+                futures = {name: pool.submit(timed, name, task) for name, task in tasks.items()}
+                results = {name: future.result() for name, future in futures.items()}
+        except Exception as e:
+            self.load_error = e
+            self.load_state = 'erro'
+            self._load_done.set()
+            raise
+        
+        self.detector = results.get('detector')
+        self.face_classifier = results.get('reconhecedor')
+        self.face_names = results.get('nomes', {})
+        
+        if self.parallel_recognition and self.face_classifier is not None and self.face_executor is None:
+            self.face_executor = create_recognition_executor(
+                self.parallel_recognition, self.classify_face, self.recognition_workers,
+                module_options={
+                    'recognizer_type': self.recognizer_type,
+                    'threshold': self.threshold,
+                    'warm_up_passes': self.warm_up_passes,
+                    'shared_gallery': self.shared_gallery,
+                },
+            )
+        
+        # Aquece antes de liberar: o primeiro frame real já roda em regime
+        with self.startup_timer.measure('aquecimento'):
+            self.warm_up()
         
-        # Histórico de reconhecimentos recentes (para evitar alternância)
-        self.recent_recognitions = {}  # {nome_face: timestamp}
-        self.recent_recognition_window = 2.0  # segundos para considerar reconhecimento recente
+        if self.auto_tuner is not None and self.detector is not None:
+            with self.startup_timer.measure('ajuste'):
+                classifier = self.face_classifier
+                profile = self.auto_tuner.tune(self.detector, self.detector_type,
+                                               classifier.predict if classifier is not None else None)
+            self.apply_tuning(profile)
+            print(f"Perfil de desempenho ({profile.origem}): {profile.describe()}")
+        
+        self.load_state = 'pronto'
+        self._load_done.set()
+    
+    def load_async(self, on_done: Optional[Callable[[Optional[Exception]], None]] = None):
+        """
+        Carrega os modelos em segundo plano
+        
+        Args:
+            on_done: Chamado na thread de carga com None (sucesso) ou o erro
+        """
+        def worker():
+            error = None
+            try:
+                self.load_models()
+            except Exception as e:
+                error = e
+            if on_done:
+                on_done(error)
+        
+        self.load_state = 'carregando'
+        self._load_done.clear()
+        threading.Thread(target=worker, name="carga-modelos", daemon=True).start()
+    
+    @property
+    def is_ready(self) -> bool:
+        """True se os modelos já foram carregados"""
+        return self.load_state == 'pronto'
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a carga dos modelos terminar
+        
+        Returns:
+            True se prontos; False se a carga não começou ou não terminou no prazo
+        
+        Raises:
+            RuntimeError: Se a carga falhou
+        """
+        if self.load_state == 'pendente':
+            return False
+        if not self._load_done.wait(timeout):
+            return False
+        if self.load_error is not None:
+            raise RuntimeError(f"Falha ao carregar os modelos: {self.load_error}")
+        return True
+    
+    def warm_up(self, passes: Optional[int] = None) -> Dict[str, float]:
+        """
+        Aquece detector e reconhecedor com imagens sintéticas
+        
+        O primeiro forward da rede e o primeiro predict alocam memória e
+        preparam os kernels; fazê-los aqui tira esse custo do primeiro frame
+        real. Não deve ser chamado com o reconhecimento rodando (o detector
+        não é seguro para uso concorrente).
+        
+        Args:
+            passes: Passadas por modelo (padrão: self.warm_up_passes)
+        
+        Returns:
+            Segundos gastos por componente ('detector', 'reconhecedor' e
+            'reconhecimento_paralelo', que sobe os workers do executor)
+        """
+        timings = {}
+        if self.detector is not None:
+            timings['detector'] = self._warm_up_detector(self.detector, passes)
+        if self.face_classifier is not None:
+            timings['reconhecedor'] = self._warm_up_recognizer(self.face_classifier, passes)
+        if self.face_executor is not None:
+            timings['reconhecimento_paralelo'] = self.face_executor.warm_up()
+            AQUECIMENTO.set(timings['reconhecimento_paralelo'], componente="reconhecimento_paralelo")
+        return timings
+    
+    def _warm_up_detector(self, detector, passes: Optional[int] = None) -> float:
+        """Detecções num frame preto do tamanho esperado (e numa ROI, se ativa)"""
+        passes = self.warm_up_passes if passes is None else passes
+        if passes <= 0:
+            return 0.0
+        
+        width = self.max_width or 640
+        height = width * 3 // 4
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        roi_size = roi_input_size(width // 2)
+        
+        start = time.perf_counter()
+        try:
+            for _ in range(passes):
+                detector.detect(frame)
+                if self.roi_scheduler:
+                    detector.detect(frame[:height // 2, :width // 2], (roi_size, roi_size))
+        except Exception as e:
+            print(f"⚠ Aviso: Falha no aquecimento do detector: {e}")
+        elapsed = time.perf_counter() - start
+        AQUECIMENTO.set(elapsed, componente="detector")
+        return elapsed
+    
+    def _warm_up_recognizer(self, classifier, passes: Optional[int] = None) -> float:
+        """Predições numa face sintética do tamanho usado no reconhecimento"""
+        passes = self.warm_up_passes if passes is None else passes
+        if passes <= 0:
+            return 0.0
+        
+        face = np.full((120, 90), 128, dtype=np.uint8)
+        
+        start = time.perf_counter()
+        for _ in range(passes):
+            try:
+                classifier.predict(face)
+            except Exception:
+                # Classificador vazio (nada treinado): não há o que aquecer
+                break
+        elapsed = time.perf_counter() - start
+        AQUECIMENTO.set(elapsed, componente="reconhecedor")
+        return elapsed
+    
+    def _load_detector(self):
+        """Cria o detector de faces (SSD por padrão)"""
+        load_start = time.perf_counter()
+        detector = create_face_detector(self.detector_type, **self.detector_options)
+        MODELO_TEMPO_CARGA.set(time.perf_counter() - load_start, componente="detector")
+        return detector
     
     def _load_recognizer(self, option: str):
         """Carrega o reconhecedor facial"""
@@ -76,6 +454,10 @@ class FaceRecognitionModule:
         }
         
         training_data = training_files.get(option, "lbph_classifier.yml")
+        load_start = time.perf_counter()
+        
+        if self.shared_gallery:
+            return self._load_shared_gallery(option, load_start)
         
         if option == "eigenfaces":
             face_classifier = cv2.face.EigenFaceRecognizer_create()
@@ -97,8 +479,35 @@ class FaceRecognitionModule:
             print(f"⚠ Arquivo {training_data} não encontrado.")
             print("⚠ O classificador será inicializado vazio. Cadastre e treine usuários para usar o reconhecimento.")
         
+        MODELO_TEMPO_CARGA.set(time.perf_counter() - load_start, componente="reconhecedor")
+        self._publish_model_info(option, training_data)
+        
         return face_classifier
     
+    def _load_shared_gallery(self, option: str, load_start: float) -> SharedGallery:
+        """Abre a versão ativa da galeria compartilhada (somente leitura)"""
+        gallery = SharedGallery(option, self.shared_gallery)
+        try:
+            gallery.refresh()
+        except FileNotFoundError as e:
+            print(f"⚠ {e}.")
+            print("⚠ O classificador será inicializado vazio. Treine os usuários para publicar a galeria.")
+        
+        MODELO_TEMPO_CARGA.set(time.perf_counter() - load_start, componente="reconhecedor")
+        MODELO_INFO.clear()
+        MODELO_INFO.set(1, reconhecedor=option, versao=f"compartilhada-{gallery.version or 'vazio'}")
+        return gallery
+    
+    def _publish_model_info(self, option: str, training_data: str):
+        """Publica o reconhecedor ativo e a versão (data do arquivo treinado)"""
+        if os.path.exists(training_data):
+            versao = time.strftime("%Y%m%d%H%M%S", time.localtime(os.path.getmtime(training_data)))
+        else:
+            versao = "vazio"
+        
+        MODELO_INFO.clear()
+        MODELO_INFO.set(1, reconhecedor=option, versao=versao)
+    
     def _load_face_names(self) -> Dict[int, str]:
         """Carrega o mapeamento de IDs para nomes"""
         try:
@@ -120,6 +529,70 @@ class FaceRecognitionModule:
     def set_log_callback(self, callback: Callable[[str], None]):
         """Define callback para logs"""
         self.notification_manager.set_log_callback(callback)
+        self.event_bus.error_callback = callback
+        self.profiler.set_log_callback(callback)
+    
+    def set_profiling(self, enabled: bool, show_overlay: bool = False):
+        """
+        Liga/desliga a instrumentação por estágio em tempo de execução
+        
+        Args:
+            enabled: Se True, coleta tempos de cada estágio
+            show_overlay: Se True, desenha o resumo sobre o vídeo
+        """
+        self.profiler.set_enabled(enabled)
+        self.profiler.show_overlay = show_overlay
+    
+    def apply_tuning(self, profile):
+        """
+        Aplica um perfil do AutoTuner (chamado na carga e na thread do vídeo)
+        
+        Args:
+            profile: TuningProfile com max_width, input_size, detection_interval e num_threads
+        """
+        self.max_width = profile.max_width
+        self.detection_interval = max(1, profile.detection_interval)
+        if self.detector is not None:
+            self.detector.input_size = (profile.input_size, profile.input_size)
+        configure_threads(profile.num_threads)
+    
+    def _detect_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
+        """
+        Detecta faces no frame (inteiro ou apenas na ROI das faces rastreadas)
+        
+        A confiança mínima e os limites da imagem são tratados pelo detector.
+        
+        Returns:
+            Lista de (start_x, start_y, end_x, end_y, confiança) em coordenadas do frame
+        """
+        (h, w) = frame.shape[:2]
+        
+        roi = self.roi_scheduler.plan(w, h) if self.roi_scheduler else None
+        
+        with self.profiler.stage('deteccao'):
+            detection_start = time.perf_counter()
+            if roi is None:
+                offset_x, offset_y = 0, 0
+                detections = (self.detection_service or self.detector).detect(frame)
+                DETECCOES_POR_MODO.inc(modo="completa")
+            else:
+                (x1, y1, x2, y2) = roi
+                offset_x, offset_y = x1, y1
+                size = roi_input_size(x2 - x1)
+                detections = self.detector.detect(frame[y1:y2, x1:x2], (size, size))
+                DETECCOES_POR_MODO.inc(modo="roi")
+            LATENCIA_DETECCAO.observe(time.perf_counter() - detection_start)
+        
+        # Converte para coordenadas do frame
+        faces = [
+            (start_x + offset_x, start_y + offset_y, end_x + offset_x, end_y + offset_y, conf)
+            for (start_x, start_y, end_x, end_y, conf) in detections
+        ]
+        
+        if self.roi_scheduler:
+            self.roi_scheduler.update([f[:4] for f in faces], full_scan=roi is None)
+        
+        return faces
     
     def recognize_faces(self, frame: np.ndarray) -> np.ndarray:
         """
@@ -131,112 +604,180 @@ class FaceRecognitionModule:
         Returns:
             Frame processado com anotações
         """
-        processed_frame = frame.copy()
+        if self.frame_callback is None:
+            # Sem exibição (modo headless): nada é desenhado
+            processed_frame = frame
+        else:
+            processed_frame = frame.copy()
+            # Desenha notificação visual ativa se houver
+            self.notification_manager.draw_active_notification(processed_frame)
         
-        # Desenha notificação visual ativa se houver
-        self.notification_manager.draw_active_notification(processed_frame)
+        profiler = self.profiler
         
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        (h, w) = frame.shape[:2]
+        with profiler.stage('pre_processamento'):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
-        # Detecta faces usando SSD
-        blob = cv2.dnn.blobFromImage(
-            cv2.resize(frame, (300, 300)), 
-            1.0, 
-            (300, 300), 
-            (104.0, 117.0, 123.0)
-        )
-        self.network.setInput(blob)
-        detections = self.network.forward()
-        
-        face_detected = False
+        # Detecta faces usando SSD (frame inteiro ou ROI)
+        faces = self._detect_faces(frame)
+        self.last_face_count = len(faces)
         
-        # Verifica se há faces cadastradas para reconhecer
-        if not self.face_names:
+        # Verifica se há faces cadastradas para reconhecer (no modo borda, quem sabe é o central)
+        if not self.face_names and self.edge_client is None:
             # Sem faces cadastradas, apenas detecta mas não reconhece
-            for i in range(0, detections.shape[2]):
-                confidence_detection = detections[0, 0, i, 2]
-                
-                if confidence_detection > 0.7:
-                    # Rate limiting para notificação
-                    current_time = time.time()
-                    if 'nenhum_usuario' not in self.last_recognition_time:
-                        self.last_recognition_time['nenhum_usuario'] = 0
-                    
-                    if current_time - self.last_recognition_time['nenhum_usuario'] >= self.recognition_cooldown:
-                        self.notification_manager.nenhum_usuario_cadastrado()
-                        self.last_recognition_time['nenhum_usuario'] = current_time
-                    break  # Apenas uma notificação por frame
+            if faces and self._acquire_cooldown(None, 'nenhum_usuario'):
+                self.notification_manager.nenhum_usuario_cadastrado()
             return processed_frame
         
-        # Limpa reconhecimentos antigos do histórico
-        current_time = time.time()
-        self.recent_recognitions = {
-            nome: timestamp 
-            for nome, timestamp in self.recent_recognitions.items()
-            if current_time - timestamp < self.recent_recognition_window
-        }
+        tracks = self.tracker.update([f[:4] for f in faces])
+        FACES_RASTREADAS.set(self.tracker.active_tracks)
         
-        for i in range(0, detections.shape[2]):
-            confidence_detection = detections[0, 0, i, 2]
+        pending = []
+        for (start_x, start_y, end_x, end_y, confidence_detection), track in zip(faces, tracks):
+            # Trilha já decidida nesta passagem: não precisa reconhecer de novo
+            if track.decided:
+                continue
             
-            if confidence_detection > 0.7:  # Threshold de detecção
-                bbox = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-                (start_x, start_y, end_x, end_y) = bbox.astype("int")
-                
-                # Validação de limites
-                if (start_x < 0 or start_y < 0 or end_x > w or end_y > h):
-                    continue
-                
-                face_detected = True
-                
-                # Extrai ROI da face
+            # Extrai ROI da face
+            with profiler.stage('recorte_roi'):
                 face_roi = gray[start_y:end_y, start_x:end_x]
                 face_roi = cv2.resize(face_roi, (90, 120))
-                
-                # Reconhece a face
-                try:
-                    prediction, conf = self.face_classifier.predict(face_roi)
-                    
-                    # Verifica se há reconhecimento recente do mesmo usuário
-                    has_recent_recognition = False
-                    if prediction in self.face_names:
-                        nome_face = self.face_names[prediction]
-                        if nome_face in self.recent_recognitions:
-                            has_recent_recognition = True
-                    
-                    # Processa reconhecimento se:
-                    # 1. Confiança está dentro do threshold E prediction existe, OU
-                    # 2. Há reconhecimento recente do mesmo usuário (mesmo que conf > threshold)
-                    if (conf <= self.threshold and prediction in self.face_names) or \
-                       (has_recent_recognition and prediction in self.face_names):
-                        nome_face = self.face_names[prediction]
-                        # Atualiza histórico de reconhecimentos recentes
-                        self.recent_recognitions[nome_face] = current_time
-                        self._process_recognition(nome_face, conf, prediction, 
-                                                start_x, start_y, end_x, end_y, processed_frame)
-                    else:
-                        # Face detectada mas não reconhecida
-                        # Só trata como desconhecido se não houver nenhum reconhecimento recente
-                        if not self.recent_recognitions:
-                            self._process_unknown_face(start_x, start_y, end_x, end_y, conf)
-                except Exception as e:
-                    # Erro ao reconhecer (classificador vazio ou corrompido) - nega acesso
-                    if not self.recent_recognitions:
-                        self._process_unknown_face(start_x, start_y, end_x, end_y, None)
-        
-        if not face_detected:
-            # Nenhuma face detectada
-            pass
+            
+            if self.edge_client is not None:
+                # Modo borda: o central classifica, vota e devolve a decisão depois
+                self.edge_client.send_face(track.track_id, face_roi, confidence_detection)
+                continue
+            
+            pending.append((track, (start_x, start_y, end_x, end_y), face_roi))
+        
+        # Voto do frame: a pessoa prevista só conta se passou no threshold
+        results = self.classify_faces([face_roi for _, _, face_roi in pending])
+        for (track, box, _), (label, conf) in zip(pending, results):
+            self._count_vote(track, label, conf, box, processed_frame)
         
         return processed_frame
     
+    def classify_faces(self, face_rois: List[np.ndarray]) -> List[Tuple[Optional[int], Optional[float]]]:
+        """
+        Classifica os recortes de um frame (em paralelo, se houver executor)
+        
+        Returns:
+            (face_id, confiança) de cada recorte, na ordem recebida
+        """
+        if self.face_executor is None:
+            return [self.classify_face(face_roi) for face_roi in face_rois]
+        with self.profiler.stage('predict_lote'):
+            return self.face_executor.classify_many(face_rois)
+    
+    def detect_and_classify(self, frame: np.ndarray) -> List[ClassifiedFace]:
+        """
+        Detecta e classifica todas as faces do frame, sem rastrear nem decidir
+        
+        Usado pelos processos de reconhecimento do modo multiprocesso; o
+        rastreamento e a votação ficam no processo principal (apply_classified).
+        
+        Returns:
+            Lista de (start_x, start_y, end_x, end_y, confiança da detecção, face_id, confiança)
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = self._detect_faces(frame)
+        face_rois = [cv2.resize(gray[start_y:end_y, start_x:end_x], (90, 120))
+                     for (start_x, start_y, end_x, end_y, _) in faces]
+        return [face + result for face, result in zip(faces, self.classify_faces(face_rois))]
+    
+    def apply_classified(self, faces: List[ClassifiedFace], processed_frame: Optional[np.ndarray]):
+        """
+        Rastreia e vota com faces já classificadas em outro processo
+        
+        Args:
+            faces: Resultado de detect_and_classify, na ordem dos frames
+            processed_frame: Frame em exibição (None se não há exibição)
+        """
+        self.last_face_count = len(faces)
+        
+        if not self.face_names:
+            if faces and self._acquire_cooldown(None, 'nenhum_usuario'):
+                self.notification_manager.nenhum_usuario_cadastrado()
+            return
+        
+        tracks = self.tracker.update([f[:4] for f in faces])
+        FACES_RASTREADAS.set(self.tracker.active_tracks)
+        
+        for (start_x, start_y, end_x, end_y, _, label, conf), track in zip(faces, tracks):
+            if track.decided:
+                continue
+            # Rótulo de um modelo mais novo que os nomes deste processo (recarga em andamento)
+            if label not in self.face_names:
+                label = None
+            self._count_vote(track, label, conf, (start_x, start_y, end_x, end_y), processed_frame)
+    
+    def _count_vote(self, track, label: Optional[int], conf: Optional[float],
+                    box: Tuple[int, int, int, int], processed_frame: Optional[np.ndarray]):
+        """Registra o voto do frame na trilha e publica a decisão, se houver"""
+        decision = self.tracker.vote(track, label, conf)
+        if decision is None:
+            return
+        
+        resultado, face_id, mean_conf = decision
+        if resultado == 'reconhecido':
+            self._process_recognition(self.face_names[face_id], mean_conf, face_id, *box, processed_frame)
+        else:
+            self._process_unknown_face(*box, mean_conf)
+    
+    def classify_face(self, face_roi: np.ndarray) -> Tuple[Optional[int], Optional[float]]:
+        """
+        Classifica um recorte de face 90x120 em tons de cinza
+        
+        Returns:
+            (face_id, confiança); face_id é None se a predição não passou no
+            threshold ou não tem nome, e a confiança é None se o predict falhou
+        """
+        try:
+            with self.profiler.stage('predict'):
+                predict_start = time.perf_counter()
+                prediction, conf = self.face_classifier.predict(face_roi)
+                LATENCIA_RECONHECIMENTO.observe(time.perf_counter() - predict_start)
+        except Exception:
+            # Erro ao reconhecer (classificador vazio ou corrompido) - conta como não reconhecido
+            return None, None
+        
+        if conf <= self.threshold and prediction in self.face_names:
+            return prediction, conf
+        return None, conf
+    
+    def _cooldown_key(self, nome_face: Optional[str], resultado: str) -> Tuple:
+        """Chave de cooldown: por pessoa nesta porta, ou por resultado se não houver pessoa"""
+        if nome_face is None:
+            return (self.door_id, resultado)
+        return (self.door_id, 'pessoa', nome_face)
+    
+    def _acquire_cooldown(self, nome_face: Optional[str], resultado: str) -> bool:
+        """
+        Ativa o cooldown nesta porta, se ele não estiver ativo
+        
+        Returns:
+            False se ainda em cooldown (decisão deve ser ignorada)
+        """
+        acquired = self.cooldown_cache.acquire(self._cooldown_key(nome_face, resultado),
+                                               self.cooldowns[resultado])
+        if not acquired:
+            SUPRIMIDOS_COOLDOWN.inc(resultado=resultado)
+        COOLDOWNS_ATIVOS.set(len(self.cooldown_cache))
+        return acquired
+    
+    def _start_cooldown(self, nome_face: str, resultado: str):
+        """Ativa (ou renova) o cooldown da pessoa com a duração do resultado"""
+        self.cooldown_cache.set(self._cooldown_key(nome_face, resultado), self.cooldowns[resultado])
+        COOLDOWNS_ATIVOS.set(len(self.cooldown_cache))
+    
     def _process_recognition(self, nome_face: str, conf: float, face_id: int,
                            start_x: int, start_y: int, end_x: int, end_y: int,
                            frame: np.ndarray):
         """
         Processa um reconhecimento de face
         
+        Apenas publica o evento: a consulta ao banco, a verificação de
+        permissões e os efeitos colaterais rodam nos assinantes do barramento.
+        
         Args:
             nome_face: Nome da face reconhecida
             conf: Nível de confiança
@@ -244,61 +785,11 @@ class FaceRecognitionModule:
             start_x, start_y, end_x, end_y: Coordenadas do bounding box
             frame: Frame para desenhar
         """
-        # Rate limiting - evita spam de notificações
-        current_time = time.time()
-        if nome_face in self.last_recognition_time:
-            if current_time - self.last_recognition_time[nome_face] < self.recognition_cooldown:
-                # Ainda em cooldown, não faz nada (não desenha nada)
-                return
-        
-        self.last_recognition_time[nome_face] = current_time
-        
-        # Busca usuário no banco de dados
-        usuario = self.db_manager.buscar_usuario_por_face_id(face_id)
-        
-        if not usuario:
-            # Face reconhecida mas não cadastrada no banco
-            self.notification_manager.acesso_negado("Usuário não cadastrado no sistema", nome_face)
-            self.db_manager.registrar_acesso(None, "entrada", "negado", conf, 
-                                            "Usuário não cadastrado no sistema")
+        # Rate limiting - evita spam de notificações (a duração final depende do resultado)
+        if not self._acquire_cooldown(nome_face, 'liberado'):
             return
         
-        usuario_id = usuario['id']
-        
-        # Verifica permissões
-        permitido, motivo = self.permission_checker.verificar_acesso(usuario_id)
-        
-        if permitido:
-            # Acesso liberado - apenas notificação visual, sem desenhar ao redor do rosto
-            self.notification_manager.acesso_liberado(usuario['nome'], conf)
-            self.db_manager.registrar_acesso(usuario_id, "entrada", "liberado", conf)
-            
-            # Callback de acesso
-            if self.access_callback:
-                self.access_callback({
-                    'usuario_id': usuario_id,
-                    'nome': usuario['nome'],
-                    'numero_identificacao': usuario.get('numero_identificacao', usuario.get('ra', '')),
-                    'tipo_identificacao': usuario.get('tipo_identificacao', 'RA'),
-                    'status': 'liberado',
-                    'confianca': conf
-                })
-        else:
-            # Acesso negado - apenas notificação visual, sem desenhar ao redor do rosto
-            self.notification_manager.acesso_negado(motivo, usuario['nome'])
-            self.db_manager.registrar_acesso(usuario_id, "entrada", "negado", conf, motivo)
-            
-            # Callback de acesso
-            if self.access_callback:
-                self.access_callback({
-                    'usuario_id': usuario_id,
-                    'nome': usuario['nome'],
-                    'numero_identificacao': usuario.get('numero_identificacao', usuario.get('ra', '')),
-                    'tipo_identificacao': usuario.get('tipo_identificacao', 'RA'),
-                    'status': 'negado',
-                    'confianca': conf,
-                    'motivo': motivo
-                })
+        self.event_bus.publish(RecognitionEvent(self.door_id, nome_face, face_id, conf))
     
     def _process_unknown_face(self, start_x: int, start_y: int, end_x: int, end_y: int, conf: Optional[float]):
         """
@@ -309,50 +800,196 @@ class FaceRecognitionModule:
             conf: Nível de confiança (None se houve erro)
         """
         # Rate limiting - evita spam de notificações
-        current_time = time.time()
-        if 'desconhecido' in self.last_recognition_time:
-            if current_time - self.last_recognition_time['desconhecido'] < self.recognition_cooldown:
+        if not self._acquire_cooldown(None, 'desconhecido'):
+            return
+        
+        RECONHECIMENTOS.inc(resultado="desconhecido")
+        self.event_bus.publish(AccessEvent(
+            door_id=self.door_id,
+            resultado='desconhecido',
+            status='negado',
+            confianca=conf if conf is not None else 0.0,
+            nome='Desconhecido',
+            motivo='Usuário não reconhecido'
+        ))
+    
+    def _on_edge_decision(self, decision: Dict):
+        """
+        Resposta do servidor central (modo borda; roda na thread de leitura do cliente)
+        
+        Uma decisão final encerra a trilha e segue pelo barramento como as
+        decisões locais (registro, notificação e interface).
+        """
+        resultado = decision['resultado']
+        if resultado in ('pendente', 'erro'):
+            return
+        
+        track = self.tracker.tracks.get(decision['track_id'])
+        if track is not None:
+            track.decided = True
+        
+        status = 'liberado' if resultado == 'liberado' else 'negado'
+        if resultado == 'desconhecido':
+            if not self._acquire_cooldown(None, 'desconhecido'):
+                return
+            RECONHECIMENTOS.inc(resultado="desconhecido")
+        else:
+            if not self._acquire_cooldown(decision['nome_face'], status):
                 return
+            RECONHECIMENTOS.inc(resultado=status)
         
-        self.last_recognition_time['desconhecido'] = current_time
+        self.event_bus.publish(AccessEvent(
+            door_id=self.door_id,
+            resultado=resultado,
+            status=status,
+            confianca=decision['confianca'] if decision['confianca'] is not None else 0.0,
+            usuario_id=decision['usuario_id'],
+            nome=decision['nome'] or decision['nome_face'] or 'Desconhecido',
+            motivo=decision['motivo']
+        ))
+    
+    # ========== Assinantes do barramento de eventos ==========
+    
+    def _subscribe_handlers(self):
+        """Registra os assinantes padrão (decisão, banco, notificação e callback)"""
+        bus = self.event_bus
+        bus.subscribe('decisao', self._decide_access, [RecognitionEvent])
+        bus.subscribe('registro_acesso', self._log_access, [AccessEvent], max_queue=1000,
+                      depth_gauge=DB_FILA_ESCRITA)
+        bus.subscribe('notificacao', self._notify_access, [AccessEvent], max_queue=10)
+        bus.subscribe('callback', self._deliver_access, [AccessEvent])
+    
+    def decide_access(self, event: RecognitionEvent) -> AccessEvent:
+        """
+        Busca o usuário e verifica as permissões (sem cooldown nem efeitos colaterais)
         
-        # Notifica acesso negado para usuário desconhecido
-        self.notification_manager.usuario_desconhecido()
-        self.db_manager.registrar_acesso(
-            None, 
-            "entrada", 
-            "negado", 
-            conf if conf is not None else 0.0, 
-            "Usuário não reconhecido"
+        Returns:
+            A decisão ('liberado', 'negado' ou 'nao_cadastrado')
+        """
+        profiler = self.profiler
+        
+        # Busca usuário no banco de dados
+        with profiler.stage('db_busca_usuario'):
+            usuario = self.db_manager.buscar_usuario_por_face_id(event.face_id)
+        
+        if not usuario:
+            # Face reconhecida mas não cadastrada no banco
+            return AccessEvent(
+                door_id=event.door_id,
+                resultado='nao_cadastrado',
+                status='negado',
+                confianca=event.confianca,
+                nome=event.nome_face,
+                motivo='Usuário não cadastrado no sistema'
+            )
+        
+        # Verifica permissões
+        with profiler.stage('db_permissoes'):
+            permitido, motivo = self.permission_checker.verificar_acesso(usuario['id'])
+        
+        resultado = 'liberado' if permitido else 'negado'
+        return AccessEvent(
+            door_id=event.door_id,
+            resultado=resultado,
+            status=resultado,
+            confianca=event.confianca,
+            usuario_id=usuario['id'],
+            nome=usuario['nome'],
+            numero_identificacao=usuario.get('numero_identificacao', usuario.get('ra', '')),
+            tipo_identificacao=usuario.get('tipo_identificacao', 'RA'),
+            motivo=None if permitido else motivo
         )
+    
+    def _decide_access(self, event: RecognitionEvent):
+        """Decide o acesso e publica a decisão"""
+        access = self.decide_access(event)
+        self._start_cooldown(event.nome_face, access.status)
+        RECONHECIMENTOS.inc(resultado=access.status)
+        self.event_bus.publish(access)
+    
+    def _log_access(self, event: AccessEvent):
+        """Grava a decisão no histórico de acessos"""
+        with self.profiler.stage('db_registro_acesso'):
+            self.db_manager.registrar_acesso(event.usuario_id, "entrada", event.status,
+                                             event.confianca, event.motivo)
+    
+    def _notify_access(self, event: AccessEvent):
+        """Notificação visual e de voz (sem desenhar ao redor do rosto)"""
+        with self.profiler.stage('notificacao'):
+            if event.resultado == 'liberado':
+                self.notification_manager.acesso_liberado(event.nome, event.confianca)
+            elif event.resultado == 'desconhecido':
+                self.notification_manager.usuario_desconhecido()
+            else:
+                self.notification_manager.acesso_negado(event.motivo, event.nome)
+    
+    def _deliver_access(self, event: AccessEvent):
+        """Repassa a decisão ao access_callback (a interface agenda na thread do Tk)"""
+        if self.access_callback and event.resultado != 'nao_cadastrado':
+            self.access_callback(event.to_dict())
+    
+    def _skip_frame(self, frame: np.ndarray, motivo: str = "sem_movimento") -> np.ndarray:
+        """Entrega um frame sem detecção (apenas a notificação ativa)"""
+        FRAMES_DESCARTADOS.inc(motivo=motivo)
+        if motivo == "sem_movimento":
+            FRACAO_IGNORADA.set(self.motion_gate.skipped_fraction)
+            CPU_ECONOMIZADA.inc(self._frame_cpu_cost)
+        
+        if self.frame_callback is None:
+            return frame
         
-        # Callback de acesso negado
-        if self.access_callback:
-            self.access_callback({
-                'usuario_id': None,
-                'nome': 'Desconhecido',
-                'numero_identificacao': '',
-                'tipo_identificacao': '',
-                'status': 'negado',
-                'confianca': conf if conf is not None else 0.0,
-                'motivo': 'Usuário não reconhecido'
-            })
+        processed_frame = frame.copy()
+        self.notification_manager.draw_active_notification(processed_frame)
+        return processed_frame
+    
+    def _read_frame(self, drain: bool = False) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Lê o próximo frame da câmera
+        
+        Args:
+            drain: Se True, descarta antes os frames acumulados no buffer (após o
+                   sono do modo ocioso). grab() de um frame já no buffer retorna
+                   na hora; o primeiro grab() que espera a câmera traz um frame novo.
+        """
+        if not drain:
+            return self.camera.read()
+        
+        grabbed = 0
+        while grabbed < self.DRAIN_MAX_FRAMES:
+            start = time.perf_counter()
+            if not self.camera.grab():
+                return False, None
+            grabbed += 1
+            if time.perf_counter() - start >= self.DRAIN_WAIT_S:
+                break
+        if grabbed > 1:
+            FRAMES_DESCARTADOS.inc(grabbed - 1, motivo="buffer_ocioso")
+        return self.camera.retrieve()
     
     def _video_loop(self):
         """Loop principal de processamento de vídeo (executa em thread separada)"""
-        self.camera = cv2.VideoCapture(0)
+        loop_start = time.perf_counter()
+        first_frame = True
+        self._frames_since_detection = 0
+        self.camera = cv2.VideoCapture(self.camera_source)
         
         if not self.camera.isOpened():
             self.notification_manager.erro_reconhecimento("Não foi possível abrir a câmera")
             self.is_running = False
             return
         
+        idle_wake = False
         while self.is_running:
-            ret, frame = self.camera.read()
+            ret, frame = self._read_frame(drain=idle_wake)
+            idle_wake = False
             
             if not ret:
+                FRAMES_DESCARTADOS.inc(motivo="falha_leitura")
                 continue
             
+            FRAMES_CAPTURADOS.inc()
+            busy_start = time.perf_counter()
+            
             # Redimensiona se necessário
             if self.max_width is not None:
                 video_width, video_height = resize_video(
@@ -360,24 +997,131 @@ class FaceRecognitionModule:
                 )
                 frame = cv2.resize(frame, (video_width, video_height))
             
-            # Processa reconhecimento
-            processed_frame = self.recognize_faces(frame)
+            # Porta de movimento: pula a detecção em cena parada
+            if self.motion_gate and not self.motion_gate.should_detect(
+                    frame, faces_tracked=self.last_face_count > 0):
+                processed_frame = self._skip_frame(frame)
+            elif 0 < self._frames_since_detection < self.detection_interval:
+                # Intervalo de detecção: as trilhas esperam o próximo frame detectado
+                self._frames_since_detection += 1
+                processed_frame = self._skip_frame(frame, "intervalo_deteccao")
+            else:
+                self._frames_since_detection = 1
+                # Processa reconhecimento
+                cpu_start = time.process_time()
+                frame_start = time.perf_counter()
+                with self.profiler.stage('frame_total'):
+                    processed_frame = self.recognize_faces(frame)
+                FRAMES_PROCESSADOS.inc()
+                if first_frame:
+                    now = time.perf_counter()
+                    PRIMEIRO_FRAME.set(now - frame_start, etapa="processamento")
+                    PRIMEIRO_FRAME.set(now - loop_start, etapa="desde_inicio")
+                    first_frame = False
+                self._frame_cpu_cost += 0.1 * ((time.process_time() - cpu_start) - self._frame_cpu_cost)
+                if self.motion_gate:
+                    FRACAO_IGNORADA.set(self.motion_gate.skipped_fraction)
+            
+            PROCESSO_CPU.set(time.process_time())
+            
+            # Sobrecarga sustentada: o tuner escolhe um perfil mais barato
+            if self.auto_tuner is not None:
+                profile = self.auto_tuner.observe(time.perf_counter() - busy_start)
+                if profile is not None:
+                    self.apply_tuning(profile)
+                    self.notification_manager.info(f"Desempenho reajustado: {profile.describe()}")
+            
+            # Overlay de depuração com o resumo dos estágios
+            self.profiler.draw_overlay(processed_frame)
             
             # Callback do frame processado
             if self.frame_callback:
-                self.frame_callback(processed_frame)
+                with self.profiler.stage('entrega_frame'):
+                    self.frame_callback(processed_frame)
+            
+            self.profiler.maybe_dump()
+            
+            # Modo ocioso: reduz a taxa de captura enquanto não há movimento nem faces.
+            # A câmera continua capturando durante o sono; ao acordar, os frames
+            # acumulados no buffer são descartados para processar o frame atual
+            if (self.motion_gate and self.motion_gate.is_idle and self.idle_fps > 0
+                    and self.last_face_count == 0):
+                time.sleep(1.0 / self.idle_fps)
+                idle_wake = True
         
         # Libera a câmera
         if self.camera:
             self.camera.release()
     
+    def _pipeline_loop(self):
+        """Loop do modo multiprocesso: aplica os resultados dos processos na ordem dos frames"""
+        loop_start = time.perf_counter()
+        first_frame = True
+        pipeline = self.process_pipeline
+        captured = 0
+        
+        while self.is_running:
+            try:
+                result = pipeline.next_result(timeout=0.1)
+            except RuntimeError as e:
+                self.notification_manager.erro_reconhecimento(str(e))
+                self.is_running = False
+                pipeline.stop()
+                self.process_pipeline = None
+                break
+            
+            FRAMES_CAPTURADOS.inc(pipeline.captured - captured)
+            captured = pipeline.captured
+            if result is None:
+                continue
+            
+            frame_no, _, faces = result
+            processed_frame = None
+            if self.frame_callback is not None:
+                # Cópia do anel: o slot será reutilizado pela captura
+                processed_frame = pipeline.copy_frame(frame_no)
+                if processed_frame is not None:
+                    self.notification_manager.draw_active_notification(processed_frame)
+            
+            self.apply_classified(faces, processed_frame)
+            FRAMES_PROCESSADOS.inc()
+            if first_frame:
+                PRIMEIRO_FRAME.set(time.perf_counter() - loop_start, etapa="desde_inicio")
+                first_frame = False
+            PROCESSO_CPU.set(time.process_time())
+            
+            if processed_frame is not None:
+                self.frame_callback(processed_frame)
+    
     def start_recognition(self):
         """Inicia o reconhecimento facial"""
         if self.is_running:
             return
         
+        if not self.wait_until_ready():
+            raise RuntimeError("Os modelos ainda não foram carregados")
+        
+        if self.processes:
+            self.process_pipeline = ProcessPipeline(
+                processes=self.processes,
+                camera_source=self.camera_source,
+                max_width=self.max_width,
+                slots=self.ring_slots,
+                module_options={
+                    'recognizer_type': self.recognizer_type,
+                    'threshold': self.threshold,
+                    'detector_type': self.detector_type,
+                    'detector_options': self.detector_options,
+                    'warm_up_passes': self.warm_up_passes,
+                    'shared_gallery': self.shared_gallery,
+                },
+            )
+            self.process_pipeline.start()
+        
         self.is_running = True
-        self.video_thread = threading.Thread(target=self._video_loop, daemon=True)
+        self.event_bus.start()
+        loop = self._pipeline_loop if self.processes else self._video_loop
+        self.video_thread = threading.Thread(target=loop, daemon=True)
         self.video_thread.start()
         self.notification_manager.info("Reconhecimento facial iniciado")
     
@@ -391,15 +1135,75 @@ class FaceRecognitionModule:
         if self.video_thread:
             self.video_thread.join(timeout=2.0)
         
+        if self.process_pipeline:
+            self.process_pipeline.stop()
+            self.process_pipeline = None
+        
+        # Conclui as decisões e registros pendentes
+        self.event_bus.stop()
+        
+        if self.roi_scheduler:
+            self.roi_scheduler.reset()
+        self.tracker.reset()
+        FACES_RASTREADAS.set(0)
+        if self.motion_gate:
+            self.notification_manager.info(
+                f"Detecção pulada em {self.motion_gate.skipped_fraction * 100:.1f}% dos frames (sem movimento)"
+            )
+            self.motion_gate.reset()
+        
         self.notification_manager.info("Reconhecimento facial parado")
     
-    def reload_recognizer(self):
-        """Recarrega o reconhecedor e o mapeamento de nomes"""
-        try:
-            self.face_classifier = self._load_recognizer(self.recognizer_type)
-            self.face_names = self._load_face_names()
-            self.notification_manager.info("Reconhecedor recarregado")
-        except Exception as e:
-            print(f"⚠ Erro ao recarregar reconhecedor: {e}")
-            self.notification_manager.info("Reconhecedor não pôde ser recarregado. Treine novos usuários.")
-
+    def load_recognizer(self):
+        """Carrega reconhecedor e nomes, aquecendo o novo classificador antes de trocá-lo pelo atual"""
+        classifier = self._load_recognizer(self.recognizer_type)
+        self._warm_up_recognizer(classifier)
+        self.face_classifier = classifier
+        self.face_names = self._load_face_names()
+    
+    def reload_recognizer(self) -> bool:
+        """
+        Recarrega o reconhecedor e o mapeamento de nomes
+        
+        Bloqueia enquanto houver carga em andamento e, com o reconhecimento
+        paralelo em processos, enquanto o novo pool sobe; na thread da
+        interface, use reload_async.
+        
+        Returns:
+            True se recarregado; False em caso de erro
+        """
+        with self._reload_lock:
+            # Uma carga em andamento sobrescreveria o modelo recarregado
+            if self.load_state == 'carregando':
+                self._load_done.wait()
+            if self.processes:
+                # Cada processo de reconhecimento recarrega o próprio modelo
+                self.face_names = self._load_face_names()
+                if self.process_pipeline:
+                    self.process_pipeline.reload()
+                self.notification_manager.info("Reconhecedor recarregado")
+                return True
+            try:
+                self.load_recognizer()
+                if self.face_executor is not None:
+                    self.face_executor.reload()
+                self.notification_manager.info("Reconhecedor recarregado")
+                return True
+            except Exception as e:
+                print(f"⚠ Erro ao recarregar reconhecedor: {e}")
+                self.notification_manager.info("Reconhecedor não pôde ser recarregado. Treine novos usuários.")
+                return False
+    
+    def reload_async(self, on_done: Optional[Callable[[bool], None]] = None):
+        """
+        Recarrega o reconhecedor em segundo plano (ver reload_recognizer)
+        
+        Args:
+            on_done: Chamado na thread de recarga com True (recarregado) ou False
+        """
+        def worker():
+            reloaded = self.reload_recognizer()
+            if on_done:
+                on_done(reloaded)
+        
+        threading.Thread(target=worker, name="recarga-modelo", daemon=True).start()
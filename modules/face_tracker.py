@@ -0,0 +1,160 @@
+"""
+Rastreamento de faces entre frames e votação temporal do reconhecimento
+
+Cada face detectada é associada a uma trilha (por sobreposição das caixas).
+A trilha acumula os resultados do predict em uma janela deslizante e só
+produz uma decisão quando há votos suficientes, uma única vez por passagem.
+"""
+import itertools
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from modules.face_detector import box_iou
+
+
+Box = Tuple[int, int, int, int]
+
+
+class FaceTrack:
+    """Uma face acompanhada ao longo dos frames"""
+    
+    def __init__(self, track_id: int, box: Box, window: int, now: float):
+        self.track_id = track_id
+        self.box = box
+        self.first_seen = now
+        self.last_seen = now
+        # Votos: (rótulo ou None se não reconhecido, confiança ou None se houve erro)
+        self.votes: Deque[Tuple[Optional[int], Optional[float]]] = deque(maxlen=window)
+        self.decided = False
+        self.decision: Optional[Tuple[str, Optional[int], Optional[float]]] = None
+
+
+class FaceTracker:
+    """
+    Associa detecções a trilhas e decide por maioria na janela de votos
+    
+    Uma identidade é confirmada quando aparece em pelo menos min_votes dos
+    últimos `window` frames; a face é dada como desconhecida quando a janela
+    está cheia e pelo menos unknown_votes votos são "não reconhecido".
+    """
+    
+    def __init__(self, iou_threshold: float = 0.3, max_missed_time: float = 1.0,
+                 window: int = 7, min_votes: int = 4, unknown_votes: Optional[int] = None):
+        """
+        Inicializa o rastreador
+        
+        Args:
+            iou_threshold: Sobreposição mínima para associar uma detecção a uma trilha
+            max_missed_time: Segundos sem detecção para encerrar a trilha (fim da passagem)
+            window: Tamanho da janela de votos
+            min_votes: Votos na mesma identidade para confirmá-la
+            unknown_votes: Votos "não reconhecido" (com a janela cheia) para declarar
+                           desconhecido; o padrão window - min_votes + 1 é o ponto
+                           em que nenhuma identidade pode mais ser confirmada
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed_time = max_missed_time
+        self.window = window
+        self.min_votes = min_votes
+        self.unknown_votes = (unknown_votes if unknown_votes is not None
+                              else max(1, window - min_votes + 1))
+        
+        self.tracks: Dict[int, FaceTrack] = {}
+        self._ids = itertools.count(1)
+    
+    def reset(self):
+        """Encerra todas as trilhas"""
+        self.tracks = {}
+    
+    def update(self, boxes: Sequence[Box], now: Optional[float] = None) -> List[FaceTrack]:
+        """
+        Associa as caixas do frame às trilhas existentes (ou cria novas)
+        
+        Args:
+            boxes: Caixas (start_x, start_y, end_x, end_y) detectadas no frame
+            now: Instante do frame (padrão: time.time())
+        
+        Returns:
+            Trilha de cada caixa, na mesma ordem
+        """
+        now = time.time() if now is None else now
+        
+        # Encerra trilhas que não são vistas há muito tempo
+        for track_id in [t.track_id for t in self.tracks.values()
+                         if now - t.last_seen > self.max_missed_time]:
+            del self.tracks[track_id]
+        
+        # Associação gulosa pelos pares de maior sobreposição
+        pairs = sorted(
+            ((box_iou(box, track.box), i, track.track_id)
+             for i, box in enumerate(boxes) for track in self.tracks.values()),
+            reverse=True
+        )
+        assigned: Dict[int, FaceTrack] = {}
+        used = set()
+        for overlap, i, track_id in pairs:
+            if overlap < self.iou_threshold:
+                break
+            if i in assigned or track_id in used:
+                continue
+            assigned[i] = self.tracks[track_id]
+            used.add(track_id)
+        
+        result = []
+        for i, box in enumerate(boxes):
+            track = assigned.get(i)
+            if track is None:
+                track = FaceTrack(next(self._ids), box, self.window, now)
+                self.tracks[track.track_id] = track
+            track.box = tuple(box[:4])
+            track.last_seen = now
+            result.append(track)
+        return result
+    
+    def vote(self, track: FaceTrack, label: Optional[int], confidence: Optional[float]
+             ) -> Optional[Tuple[str, Optional[int], Optional[float]]]:
+        """
+        Registra o resultado de um frame e decide, se possível
+        
+        Args:
+            track: Trilha da face
+            label: Identidade prevista (None se não passou no threshold)
+            confidence: Distância/confiança do predict (None se houve erro)
+        
+        Returns:
+            ('reconhecido', rótulo, confiança média) ou ('desconhecido', None,
+            confiança média) na primeira decisão da trilha; None enquanto não
+            houver votos suficientes ou se a trilha já decidiu
+        """
+        if track.decided:
+            return None
+        track.votes.append((label, confidence))
+        
+        counts = Counter(vote_label for vote_label, _ in track.votes)
+        
+        best_label, best_count = None, 0
+        for vote_label, count in counts.items():
+            if vote_label is not None and count > best_count:
+                best_label, best_count = vote_label, count
+        
+        if best_label is not None and best_count >= self.min_votes:
+            decision = ('reconhecido', best_label, self._mean_confidence(track, best_label))
+        elif len(track.votes) >= self.window and counts.get(None, 0) >= self.unknown_votes:
+            decision = ('desconhecido', None, self._mean_confidence(track, None))
+        else:
+            return None
+        
+        track.decided = True
+        track.decision = decision
+        return decision
+    
+    @staticmethod
+    def _mean_confidence(track: FaceTrack, label: Optional[int]) -> Optional[float]:
+        values = [conf for vote_label, conf in track.votes
+                  if vote_label == label and conf is not None]
+        return sum(values) / len(values) if values else None
+    
+    @property
+    def active_tracks(self) -> int:
+        return len(self.tracks)
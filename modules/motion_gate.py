@@ -0,0 +1,121 @@
+"""
+Porta de movimento: evita rodar a detecção em cenas estáticas
+"""
+import time
+import cv2
+import numpy as np
+from typing import Optional
+
+
+class MotionGate:
+    """
+    Decide, frame a frame, se vale a pena rodar a detecção de faces
+    
+    Usa diferença contra um fundo médio em uma versão reduzida e borrada do
+    frame (custo de poucos décimos de milissegundo). A detecção roda quando há
+    movimento, enquanto houver faces rastreadas, durante hold_time segundos
+    após o último movimento e, fora isso, a cada heartbeat_interval segundos.
+    """
+    
+    def __init__(self, downscale_width: int = 160, pixel_threshold: int = 25,
+                 motion_ratio: float = 0.01, learning_rate: float = 0.05,
+                 hold_time: float = 3.0, heartbeat_interval: float = 2.0,
+                 idle_after: float = 10.0):
+        """
+        Inicializa a porta de movimento
+        
+        Args:
+            downscale_width: Largura da imagem usada na comparação
+            pixel_threshold: Diferença mínima (0-255) para um pixel contar como movimento
+            motion_ratio: Fração mínima de pixels alterados para considerar movimento
+            learning_rate: Velocidade de adaptação do fundo
+            hold_time: Segundos em que a detecção continua após o último movimento
+            heartbeat_interval: Intervalo máximo entre detecções em cena parada
+            idle_after: Segundos sem movimento para entrar em modo ocioso
+        """
+        self.downscale_width = downscale_width
+        self.pixel_threshold = pixel_threshold
+        self.motion_ratio = motion_ratio
+        self.learning_rate = learning_rate
+        self.hold_time = hold_time
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_after = idle_after
+        
+        self._background: Optional[np.ndarray] = None
+        self._last_motion = 0.0
+        self._last_detection = 0.0
+        self._faces_tracked = False
+        
+        # Estatísticas
+        self.frames_total = 0
+        self.frames_skipped = 0
+        self.last_motion_ratio = 0.0
+    
+    def reset(self):
+        """Descarta o fundo aprendido e as estatísticas"""
+        self._background = None
+        self._last_motion = 0.0
+        self._last_detection = 0.0
+        self._faces_tracked = False
+        self.frames_total = 0
+        self.frames_skipped = 0
+    
+    def _measure_motion(self, frame: np.ndarray) -> float:
+        """Fração de pixels que mudaram em relação ao fundo"""
+        h, w = frame.shape[:2]
+        scale = self.downscale_width / float(w)
+        small = cv2.resize(frame, (self.downscale_width, max(1, int(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+        
+        if self._background is None or self._background.shape != small.shape:
+            self._background = small.astype(np.float32)
+            return 1.0  # Primeiro frame: trata como movimento
+        
+        diff = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+        cv2.accumulateWeighted(small, self._background, self.learning_rate)
+        changed = np.count_nonzero(diff > self.pixel_threshold)
+        return changed / float(diff.size)
+    
+    def should_detect(self, frame: np.ndarray, faces_tracked: bool = False) -> bool:
+        """
+        Indica se a detecção deve rodar neste frame
+        
+        Args:
+            frame: Frame BGR ou tons de cinza
+            faces_tracked: Se há faces rastreadas (pessoa parada em frente à porta)
+        
+        Returns:
+            True para rodar a detecção, False para pular
+        """
+        now = time.time()
+        self.frames_total += 1
+        self.last_motion_ratio = self._measure_motion(frame)
+        self._faces_tracked = faces_tracked
+        
+        if self.last_motion_ratio >= self.motion_ratio:
+            self._last_motion = now
+        
+        run = (
+            faces_tracked
+            or now - self._last_motion < self.hold_time
+            or now - self._last_detection >= self.heartbeat_interval
+        )
+        
+        if run:
+            self._last_detection = now
+        else:
+            self.frames_skipped += 1
+        return run
+    
+    @property
+    def is_idle(self) -> bool:
+        """True quando não há movimento há mais de idle_after segundos nem faces rastreadas"""
+        return not self._faces_tracked and time.time() - self._last_motion >= self.idle_after
+    
+    @property
+    def skipped_fraction(self) -> float:
+        """Fração de frames em que a detecção foi pulada"""
+        return self.frames_skipped / self.frames_total if self.frames_total else 0.0
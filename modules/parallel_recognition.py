@@ -0,0 +1,179 @@
+"""
+Reconhecimento paralelo das faces de um frame
+
+Quando um grupo entra, o predict de cada face rodaria em sequência. Os
+executores daqui distribuem os recortes de um frame entre workers e
+devolvem os resultados na ordem dos recortes; cada resultado depende só do
+próprio recorte e do modelo, então a votação vê exatamente o mesmo que no
+modo sequencial.
+
+- 'thread': ThreadPoolExecutor sobre o classificador do próprio módulo (o
+  predict do OpenCV libera o GIL)
+- 'process': ProcessPoolExecutor; cada worker carrega o próprio modelo ao
+  iniciar e recebe só os recortes 90x120
+"""
+import math
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from utils.metrics import REGISTRY
+
+
+FACES_POR_LOTE = REGISTRY.histogram(
+    "webcam_reconhecimento_paralelo_faces", "Faces classificadas juntas em um frame",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 20))
+LATENCIA_LOTE = REGISTRY.histogram(
+    "webcam_reconhecimento_paralelo_latencia_segundos", "Predict de todas as faces de um frame")
+
+Classification = Tuple[Optional[int], Optional[float]]
+
+
+class ThreadRecognitionExecutor:
+    """Predict das faces de um frame em paralelo, em threads do mesmo processo"""
+    
+    kind = 'thread'
+    
+    def __init__(self, classify: Callable[[np.ndarray], Classification], workers: int = 4,
+                 min_faces: int = 2):
+        """
+        Args:
+            classify: Classificação de um recorte (FaceRecognitionModule.classify_face)
+            workers: Threads do pool
+            min_faces: Abaixo disso, classifica na própria thread (evita o custo de despacho)
+        """
+        self.classify = classify
+        self.workers = workers
+        self.min_faces = min_faces
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predict")
+    
+    def classify_many(self, face_rois: Sequence[np.ndarray]) -> List[Classification]:
+        """
+        Classifica os recortes em paralelo
+        
+        Returns:
+            (face_id, confiança) de cada recorte, na mesma ordem
+        """
+        start = time.perf_counter()
+        if len(face_rois) < self.min_faces:
+            results = [self.classify(roi) for roi in face_rois]
+        else:
+            results = list(self._pool.map(self.classify, face_rois))
+        self._observe(len(face_rois), start)
+        return results
+    
+    @staticmethod
+    def _observe(count: int, start: float):
+        if count:
+            FACES_POR_LOTE.observe(count)
+            LATENCIA_LOTE.observe(time.perf_counter() - start)
+    
+    def warm_up(self) -> float:
+        """Cria as threads do pool antes do primeiro frame"""
+        start = time.perf_counter()
+        list(self._pool.map(time.sleep, [0.001] * self.workers))
+        return time.perf_counter() - start
+    
+    def reload(self):
+        """Nada a fazer: as threads usam o classificador atual do módulo"""
+    
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+# Módulo de reconhecimento de cada processo do pool (criado pelo inicializador)
+_worker_module = None
+
+
+def _init_worker(module_options: Dict):
+    """Inicializador dos processos: carrega reconhecedor e nomes uma vez por worker"""
+    global _worker_module
+    # Um núcleo por worker: o paralelismo vem dos processos
+    cv2.setNumThreads(1)
+    from modules.face_recognition_module import FaceRecognitionModule
+    
+    module = FaceRecognitionModule(None, speech_backend="none", background_load=True, **module_options)
+    module.load_recognizer()
+    _worker_module = module
+
+
+def _classify_in_worker(face_roi: np.ndarray) -> Classification:
+    return _worker_module.classify_face(face_roi)
+
+
+def _worker_ready(_) -> int:
+    return mp.current_process().pid
+
+
+class ProcessRecognitionExecutor(ThreadRecognitionExecutor):
+    """Predict das faces de um frame em paralelo, em processos com o modelo pré-carregado"""
+    
+    kind = 'process'
+    
+    def __init__(self, classify: Callable[[np.ndarray], Classification], module_options: Dict,
+                 workers: int = 4, min_faces: int = 2):
+        """
+        Args:
+            classify: Classificação local, usada abaixo de min_faces
+            module_options: Argumentos do FaceRecognitionModule de cada worker
+                            (recognizer_type, threshold, warm_up_passes...)
+            workers: Processos do pool
+            min_faces: Abaixo disso, classifica no próprio processo
+        """
+        self.classify = classify
+        self.module_options = module_options
+        self.workers = workers
+        self.min_faces = min_faces
+        self._pool = self._create_pool()
+    
+    def _create_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(self.module_options,))
+    
+    def classify_many(self, face_rois: Sequence[np.ndarray]) -> List[Classification]:
+        start = time.perf_counter()
+        if len(face_rois) < self.min_faces:
+            results = [self.classify(roi) for roi in face_rois]
+        else:
+            # Um pedaço por worker: menos idas e voltas entre processos
+            chunksize = math.ceil(len(face_rois) / self.workers)
+            results = list(self._pool.map(_classify_in_worker, face_rois, chunksize=chunksize))
+        self._observe(len(face_rois), start)
+        return results
+    
+    def warm_up(self) -> float:
+        """Sobe os processos e carrega o modelo em cada um antes do primeiro frame"""
+        start = time.perf_counter()
+        list(self._pool.map(_worker_ready, range(self.workers)))
+        return time.perf_counter() - start
+    
+    def reload(self):
+        """Troca o pool por um novo, com o modelo recém-treinado"""
+        old_pool = self._pool
+        self._pool = self._create_pool()
+        self.warm_up()
+        old_pool.shutdown(wait=True)
+
+
+def create_recognition_executor(kind: str, classify: Callable[[np.ndarray], Classification],
+                                workers: int = 4, module_options: Optional[Dict] = None,
+                                min_faces: int = 2):
+    """
+    Cria o executor do reconhecimento paralelo
+    
+    Args:
+        kind: 'thread' ou 'process'
+        classify: Classificação de um recorte no processo atual
+        workers: Threads ou processos
+        module_options: Argumentos do FaceRecognitionModule dos workers ('process')
+        min_faces: Faces mínimas no frame para despachar em paralelo
+    """
+    if kind == 'thread':
+        return ThreadRecognitionExecutor(classify, workers, min_faces)
+    if kind == 'process':
+        return ProcessRecognitionExecutor(classify, module_options or {}, workers, min_faces)
+    raise ValueError(f"Executor de reconhecimento inválido: {kind}")
@@ -0,0 +1,298 @@
+"""
+Modo multiprocesso: captura e reconhecimento em processos separados
+
+O processo de captura grava os frames num anel em memória compartilhada
+(utils/frame_ring.py). N processos de reconhecimento leem os frames por
+visões NumPy sem cópia (o frame n vai para o processo n % N), detectam e
+classificam as faces e devolvem só as caixas e os rótulos por uma fila. O
+processo principal rastreia, vota e decide na ordem dos frames, como no
+modo de processo único, sem disputar o GIL com a captura e a inferência.
+"""
+import multiprocessing as mp
+import queue
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from utils.frame_ring import FrameRing, RingReader
+from utils.metrics import REGISTRY
+from helper_functions import resize_video
+
+
+ANEL_PERDIDOS = REGISTRY.gauge(
+    "webcam_anel_frames_perdidos",
+    "Frames do anel perdidos por cada processo de reconhecimento (overrun ou sobrescrito durante o uso)",
+    ["leitor", "motivo"])
+ANEL_VAZAO = REGISTRY.gauge(
+    "webcam_anel_frames_lidos", "Frames lidos do anel por processo de reconhecimento", ["leitor"])
+MULTIPROCESSO_LATENCIA = REGISTRY.histogram(
+    "webcam_multiprocesso_latencia_segundos", "Da captura do frame até o resultado chegar ao processo principal")
+MULTIPROCESSO_INFERENCIA = REGISTRY.histogram(
+    "webcam_multiprocesso_inferencia_segundos", "Detecção e classificação de um frame num processo de reconhecimento")
+MULTIPROCESSO_ATRASADOS = REGISTRY.counter(
+    "webcam_multiprocesso_resultados_atrasados_total",
+    "Resultados descartados por chegarem depois de um frame mais novo já entregue")
+
+# Tamanho máximo do slot quando max_width é None (frames maiores são reduzidos)
+DEFAULT_FRAME_SIZE = (1080, 1920)
+
+# Face detectada e classificada: (start_x, start_y, end_x, end_y, confiança da detecção, face_id, confiança)
+ClassifiedFace = Tuple[int, int, int, int, float, Optional[int], Optional[float]]
+
+
+def _capture_main(ring_name: str, camera_source, max_width: Optional[int], stop_event, results):
+    """Processo de captura: lê a câmera e grava cada frame direto no slot do anel"""
+    ring = FrameRing.attach(ring_name)
+    camera = cv2.VideoCapture(camera_source)
+    try:
+        if not camera.isOpened():
+            results.put(('erro', -1, "Não foi possível abrir a câmera"))
+            return
+        
+        cap_height, cap_width, _ = ring.capacity
+        while not stop_event.is_set():
+            ret, frame = camera.read()
+            if not ret:
+                continue
+            
+            height, width = frame.shape[:2]
+            if max_width is not None:
+                width, height = resize_video(width, height, max_width)
+            if width > cap_width or height > cap_height:
+                scale = min(cap_width / width, cap_height / height)
+                width, height = int(width * scale), int(height * scale)
+            
+            frame_no, slot = ring.reserve(height, width)
+            if (height, width) == frame.shape[:2]:
+                slot[...] = frame
+            else:
+                cv2.resize(frame, (width, height), dst=slot)
+            ring.commit(frame_no)
+    finally:
+        camera.release()
+        slot = None
+        ring.close()
+
+
+def _recognition_main(ring_name: str, index: int, count: int, module_options: Dict,
+                      stop_event, reload_event, results):
+    """Processo de reconhecimento: detecta e classifica os frames deste leitor"""
+    # Importado aqui: o processo é criado com 'spawn' e só ele precisa dos modelos
+    from modules.face_recognition_module import FaceRecognitionModule
+    
+    ring = FrameRing.attach(ring_name)
+    view = None
+    try:
+        try:
+            module = FaceRecognitionModule(None, speech_backend="none", **module_options)
+        except Exception as e:
+            results.put(('erro', index, f"Falha ao carregar os modelos: {e}"))
+            return
+        
+        reader = RingReader(ring, index, count)
+        results.put(('pronto', index, None))
+        
+        while not stop_event.is_set():
+            if reload_event.is_set():
+                reload_event.clear()
+                module.reload_recognizer()
+            
+            view = reader.next(timeout=0.1)
+            if view is None:
+                continue
+            
+            start = time.perf_counter()
+            faces = module.detect_and_classify(view.frame)
+            elapsed = time.perf_counter() - start
+            
+            # O escritor deu a volta no anel durante o uso: o resultado não vale
+            if reader.check(view):
+                results.put(('frame', index, (view.frame_no, view.timestamp, faces, elapsed, reader.stats())))
+            else:
+                results.put(('descartado', index, (view.frame_no, reader.stats())))
+            view = None
+    finally:
+        view = None
+        ring.close()
+
+
+class ProcessPipeline:
+    """
+    Processos de captura e de reconhecimento ligados por um anel de frames
+    
+    Os resultados são entregues em ordem de frame por next_result(). Um frame
+    que falta só é esperado enquanto o processo dono dele ainda pode
+    entregá-lo (cada leitor avança em ordem crescente).
+    """
+    
+    def __init__(self, processes: int = 2, camera_source=0, max_width: Optional[int] = 800,
+                 slots: int = 8, module_options: Optional[Dict] = None):
+        """
+        Args:
+            processes: Processos de reconhecimento
+            camera_source: Índice da câmera ou URL/arquivo do stream
+            max_width: Largura máxima do frame (define o tamanho de cada slot)
+            slots: Frames guardados no anel (atraso tolerado antes de um overrun)
+            module_options: Argumentos do FaceRecognitionModule de cada processo
+                            (recognizer_type, threshold, detector_type...)
+        """
+        if processes < 1:
+            raise ValueError("O modo multiprocesso precisa de pelo menos 1 processo de reconhecimento")
+        self.processes = processes
+        self.camera_source = camera_source
+        self.max_width = max_width
+        self.slots = slots
+        self.module_options = dict(module_options or {}, max_width=max_width)
+        
+        self.ring: Optional[FrameRing] = None
+        self._context = mp.get_context("spawn")
+        self._stop_event = None
+        self._reload_events = []
+        self._results = None
+        self._workers: List = []
+        
+        # Reordenação: resultados à espera e último frame entregue por leitor
+        self._pending: Dict[int, Tuple] = {}
+        self._last_seen = [0] * processes
+        self._last_delivered = 0
+    
+    def start(self):
+        """Cria o anel e sobe os processos"""
+        if self.max_width is not None:
+            # Altura até a largura: cobre 4:3, 16:9 e imagens quadradas
+            height, width = self.max_width, self.max_width
+        else:
+            height, width = DEFAULT_FRAME_SIZE
+        self.ring = FrameRing.create(self.slots, height, width)
+        
+        ctx = self._context
+        self._stop_event = ctx.Event()
+        self._results = ctx.Queue()
+        self._reload_events = [ctx.Event() for _ in range(self.processes)]
+        self._pending.clear()
+        self._last_seen = [0] * self.processes
+        self._last_delivered = 0
+        
+        self._workers = [
+            ctx.Process(target=_recognition_main, name=f"reconhecimento-{i}", daemon=True,
+                        args=(self.ring.name, i, self.processes, self.module_options,
+                              self._stop_event, self._reload_events[i], self._results))
+            for i in range(self.processes)
+        ]
+        self._workers.append(ctx.Process(
+            target=_capture_main, name="captura", daemon=True,
+            args=(self.ring.name, self.camera_source, self.max_width, self._stop_event, self._results)))
+        for process in self._workers:
+            process.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Para os processos e remove o anel"""
+        if self.ring is None:
+            return
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        # Esvazia a fila enquanto espera: um processo com dados por enviar não termina
+        while any(p.is_alive() for p in self._workers) and time.monotonic() < deadline:
+            try:
+                self._results.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        for process in self._workers:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        self._workers = []
+        
+        self._results.close()
+        self._results.join_thread()
+        self.ring.close()
+        self.ring.unlink()
+        self.ring = None
+    
+    def reload(self):
+        """Pede a cada processo de reconhecimento que recarregue o reconhecedor"""
+        for event in self._reload_events:
+            event.set()
+    
+    @property
+    def captured(self) -> int:
+        """Frames gravados no anel desde o início"""
+        return self.ring.latest if self.ring is not None else 0
+    
+    def copy_frame(self, frame_no: int) -> Optional[np.ndarray]:
+        """Cópia do frame para exibição, se ele ainda estiver no anel"""
+        view = self.ring.read(frame_no)
+        if view is None:
+            return None
+        frame = view.frame.copy()
+        return frame if view.valid() else None
+    
+    def _record_stats(self, index: int, stats: Dict[str, int]):
+        reader = str(index)
+        ANEL_VAZAO.set(stats['frames'], leitor=reader)
+        ANEL_PERDIDOS.set(stats['overruns'], leitor=reader, motivo="overrun")
+        ANEL_PERDIDOS.set(stats['rasgados'], leitor=reader, motivo="sobrescrito")
+    
+    def _may_still_arrive(self, frame_no: int) -> bool:
+        return self._last_seen[frame_no % self.processes] < frame_no
+    
+    def _pop_ready(self) -> Optional[Tuple]:
+        """Menor resultado pendente, se nenhum frame anterior ainda puder chegar"""
+        if not self._pending:
+            return None
+        frame_no = min(self._pending)
+        waiting = any(self._may_still_arrive(n) for n in range(self._last_delivered + 1, frame_no))
+        # Um processo travado não segura os demais indefinidamente
+        if waiting and len(self._pending) <= 2 * self.processes:
+            return None
+        self._last_delivered = frame_no
+        ready = self._pending.pop(frame_no)
+        MULTIPROCESSO_LATENCIA.observe(time.time() - ready[1])
+        return ready
+    
+    def next_result(self, timeout: float = 0.1) -> Optional[Tuple[int, float, List[ClassifiedFace]]]:
+        """
+        Próximo resultado em ordem de frame
+        
+        Returns:
+            (frame_no, timestamp da captura, faces classificadas), ou None se
+            nada ficou pronto no prazo
+        
+        Raises:
+            RuntimeError: Se a câmera ou um processo de reconhecimento falhou
+        """
+        ready = self._pop_ready()
+        if ready is not None:
+            return ready
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                kind, index, payload = self._results.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                return None
+            
+            if kind == 'erro':
+                raise RuntimeError(payload)
+            if kind == 'descartado':
+                frame_no, stats = payload
+                self._record_stats(index, stats)
+                self._last_seen[index] = frame_no
+            elif kind == 'frame':
+                frame_no, timestamp, faces, elapsed, stats = payload
+                self._record_stats(index, stats)
+                MULTIPROCESSO_INFERENCIA.observe(elapsed)
+                self._last_seen[index] = frame_no
+                if frame_no > self._last_delivered:
+                    self._pending[frame_no] = (frame_no, timestamp, faces)
+                else:
+                    MULTIPROCESSO_ATRASADOS.inc()
+            
+            ready = self._pop_ready()
+            if ready is not None:
+                return ready
+            if remaining <= 0:
+                return None
@@ -0,0 +1,404 @@
+"""
+Serviço local de reconhecimento facial (HTTP)
+
+Permite que várias portas "finas" (só câmera) compartilhem uma máquina com
+CPU de sobra: cada porta envia um frame JPEG, ou o recorte da face já
+detectado, e recebe as identidades, as confianças e as decisões de acesso.
+
+O serviço não guarda estado entre pedidos: a votação temporal e os cooldowns
+continuam na porta. Rotas:
+
+    POST /reconhecer?porta=<id>[&registrar=1]       corpo: frame (JPEG/PNG)
+    POST /reconhecer-face?porta=<id>[&registrar=1]  corpo: recorte da face (JPEG/PNG)
+    POST /recarregar                                recarrega o classificador treinado
+    GET  /saude                                     estado dos modelos e das filas
+    GET  /metrics                                   métricas no formato do Prometheus
+"""
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import cv2
+import numpy as np
+
+from modules.access_events import AccessEvent, RecognitionEvent
+from modules.batch_detection import BatchDetectionService
+from modules.face_recognition_module import FaceRecognitionModule
+from utils.metrics import REGISTRY, CONTENT_TYPE
+
+
+SERVICO_PEDIDOS = REGISTRY.counter(
+    "webcam_servico_pedidos_total", "Pedidos ao serviço de reconhecimento", ["rota", "codigo"])
+SERVICO_LATENCIA = REGISTRY.histogram(
+    "webcam_servico_latencia_segundos", "Tempo de atendimento de um pedido", ["rota"])
+SERVICO_EM_ANDAMENTO = REGISTRY.gauge(
+    "webcam_servico_em_andamento", "Pedidos aceitos e ainda não respondidos")
+SERVICO_DECISOES = REGISTRY.counter(
+    "webcam_servico_decisoes_total", "Decisões devolvidas pelo serviço", ["resultado"])
+
+# Tamanho do recorte usado no treino e no predict
+FACE_SIZE = (90, 120)
+
+
+class ServiceBusy(Exception):
+    """Todos os lugares de atendimento estão ocupados"""
+
+
+class RecognitionService:
+    """
+    Reconhecimento sob demanda sobre um FaceRecognitionModule já carregado
+    
+    Cada pedido roda num pool de workers. As detecções dos pedidos simultâneos
+    são agrupadas em um único forward (BatchDetectionService), e os predicts
+    rodam em paralelo nos workers (o OpenCV libera o GIL).
+    """
+    
+    def __init__(self, module: FaceRecognitionModule, workers: int = 4,
+                 max_batch_size: int = 4, max_wait: float = 0.010,
+                 max_in_flight: int = 32, request_timeout: float = 10.0):
+        """
+        Inicializa o serviço
+        
+        Args:
+            module: Módulo com os modelos carregados (não deve estar com a câmera rodando)
+            workers: Pedidos atendidos ao mesmo tempo
+            max_batch_size: Máximo de frames por forward do detector
+            max_wait: Prazo máximo (segundos) que um frame espera por companhia no lote
+            max_in_flight: Pedidos aceitos (rodando + na fila); acima disso responde 503
+            request_timeout: Prazo de um pedido antes de responder 504
+        """
+        if not module.wait_until_ready():
+            raise RuntimeError("Os modelos do módulo de reconhecimento não foram carregados")
+        
+        self.module = module
+        self.request_timeout = request_timeout
+        self.detection = BatchDetectionService(module.detector, max_batch_size=max_batch_size,
+                                               max_wait=max_wait, max_pending=max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="servico")
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+    
+    def start(self):
+        self.detection.start()
+    
+    def stop(self):
+        self._pool.shutdown(wait=True)
+        self.detection.stop()
+    
+    def submit(self, fn, *args) -> Dict:
+        """
+        Roda fn(*args) no pool e espera o resultado
+        
+        Raises:
+            ServiceBusy: Se já há max_in_flight pedidos aceitos
+            concurrent.futures.TimeoutError: Se o pedido passou do prazo
+        """
+        return self.submit_async(fn, *args).result(timeout=self.request_timeout)
+    
+    def submit_async(self, fn, *args, block: bool = False) -> Future:
+        """
+        Roda fn(*args) no pool sem esperar o resultado
+        
+        Args:
+            block: Se True, espera um lugar livre em vez de levantar ServiceBusy
+        
+        Raises:
+            ServiceBusy: Se já há max_in_flight pedidos aceitos (e block=False)
+        """
+        if not self._slots.acquire(blocking=block):
+            raise ServiceBusy()
+        with self._lock:
+            self._in_flight += 1
+            SERVICO_EM_ANDAMENTO.set(self._in_flight)
+        
+        def release(_):
+            with self._lock:
+                self._in_flight -= 1
+                SERVICO_EM_ANDAMENTO.set(self._in_flight)
+            self._slots.release()
+        
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(release)
+        return future
+    
+    def recognize_frame(self, data: bytes, door_id: str, register: bool = False) -> Dict:
+        """Detecta e reconhece todas as faces de um frame codificado (JPEG/PNG)"""
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("Imagem inválida")
+        
+        detections = self.detection.detect(frame, timeout=self.request_timeout)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        faces = []
+        for (start_x, start_y, end_x, end_y, confidence) in detections:
+            face_roi = cv2.resize(gray[start_y:end_y, start_x:end_x], FACE_SIZE)
+            result = self.identify(face_roi, door_id, register)
+            result['caixa'] = [int(start_x), int(start_y), int(end_x), int(end_y)]
+            result['confianca_deteccao'] = float(confidence)
+            faces.append(result)
+        
+        return {'faces': faces, 'largura': frame.shape[1], 'altura': frame.shape[0]}
+    
+    def recognize_face(self, data: bytes, door_id: str, register: bool = False) -> Dict:
+        """Reconhece um recorte de face já detectado (qualquer tamanho; é redimensionado)"""
+        face = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if face is None:
+            raise ValueError("Imagem inválida")
+        
+        if (face.shape[1], face.shape[0]) != FACE_SIZE:
+            face = cv2.resize(face, FACE_SIZE)
+        return {'faces': [self.identify(face, door_id, register)]}
+    
+    def identify(self, face_roi: np.ndarray, door_id: str, register: bool = False) -> Dict:
+        """
+        Classifica um recorte 90x120 e decide o acesso
+        
+        Args:
+            face_roi: Recorte em tons de cinza
+            door_id: Porta que pediu (vai na decisão e no histórico)
+            register: Se True, grava a decisão no histórico de acessos
+        """
+        face_id, conf = self.classify(face_roi)
+        return self.decide(face_id, conf, door_id, register)
+    
+    def classify(self, face_roi: np.ndarray) -> Tuple[Optional[int], Optional[float]]:
+        """(face_id ou None, confiança) de um recorte 90x120"""
+        return self.module.classify_face(face_roi)
+    
+    def decide(self, face_id: Optional[int], conf: Optional[float], door_id: str,
+               register: bool = False) -> Dict:
+        """
+        Decide o acesso de uma face já classificada
+        
+        Args:
+            face_id: Identidade (None = não reconhecida)
+            conf: Confiança do predict (ou média dos votos)
+            door_id: Porta que pediu (vai na decisão e no histórico)
+            register: Se True, grava a decisão no histórico de acessos
+        """
+        module = self.module
+        if face_id is None:
+            nome_face = None
+            access = AccessEvent(
+                door_id=door_id,
+                resultado='desconhecido',
+                status='negado',
+                confianca=conf if conf is not None else 0.0,
+                nome='Desconhecido',
+                motivo='Usuário não reconhecido'
+            )
+        else:
+            nome_face = module.face_names.get(face_id)
+            access = module.decide_access(RecognitionEvent(door_id, nome_face, face_id, conf))
+        
+        SERVICO_DECISOES.inc(resultado=access.resultado)
+        if register:
+            module.db_manager.registrar_acesso(access.usuario_id, "entrada", access.status,
+                                               access.confianca, access.motivo)
+        
+        result = access.to_dict()
+        result.update(resultado=access.resultado, face_id=face_id, nome_face=nome_face)
+        return result
+    
+    def reload(self) -> Dict:
+        """Recarrega o classificador treinado e o mapeamento de nomes"""
+        self.module.reload_recognizer()
+        return {'identidades': len(self.module.face_names)}
+    
+    def health(self) -> Dict:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            'estado': self.module.load_state,
+            'reconhecedor': self.module.recognizer_type,
+            'identidades': len(self.module.face_names),
+            'em_andamento': in_flight,
+            'deteccao': self.detection.stats(),
+        }
+
+
+class RecognitionServer:
+    """Servidor HTTP do RecognitionService (uma thread por conexão)"""
+    
+    def __init__(self, service: RecognitionService, port: int = 8765,
+                 host: str = "127.0.0.1", max_body: int = 8 * 1024 * 1024):
+        """
+        Args:
+            service: Serviço atendido
+            port: Porta TCP (0 escolhe uma porta livre)
+            host: Interface de escuta (padrão apenas local)
+            max_body: Tamanho máximo da imagem enviada (bytes)
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self.max_body = max_body
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def _make_handler(self):
+        service = self.service
+        max_body = self.max_body
+        post_routes = {
+            '/reconhecer': service.recognize_frame,
+            '/reconhecer-face': service.recognize_face,
+        }
+        
+        class _Handler(BaseHTTPRequestHandler):
+            def _reply(self, route: str, code: int, payload: Dict, started: float):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                SERVICO_PEDIDOS.inc(rota=route, codigo=str(code))
+                SERVICO_LATENCIA.observe(time.perf_counter() - started, rota=route)
+            
+            def do_GET(self):
+                started = time.perf_counter()
+                route = urlsplit(self.path).path
+                if route == '/saude':
+                    self._reply(route, 200, service.health(), started)
+                elif route == '/metrics':
+                    body = REGISTRY.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", CONTENT_TYPE)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self._reply('outra', 404, {'erro': 'Rota não encontrada'}, started)
+            
+            def do_POST(self):
+                started = time.perf_counter()
+                url = urlsplit(self.path)
+                route = url.path
+                query = parse_qs(url.query)
+                
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > max_body:
+                    self._reply(route, 413, {'erro': 'Imagem grande demais'}, started)
+                    return
+                data = self.rfile.read(length) if length else b""
+                
+                if route == '/recarregar':
+                    call = (service.reload,)
+                elif route in post_routes:
+                    if not data:
+                        self._reply(route, 400, {'erro': 'Corpo vazio (envie a imagem)'}, started)
+                        return
+                    door_id = query.get('porta', ['servico'])[0]
+                    register = query.get('registrar', ['0'])[0] in ('1', 'true', 'sim')
+                    call = (post_routes[route], data, door_id, register)
+                else:
+                    self._reply('outra', 404, {'erro': 'Rota não encontrada'}, started)
+                    return
+                
+                try:
+                    payload = service.submit(*call)
+                except ServiceBusy:
+                    self._reply(route, 503, {'erro': 'Serviço ocupado, tente novamente'}, started)
+                except FutureTimeout:
+                    self._reply(route, 504, {'erro': 'Tempo esgotado'}, started)
+                except ValueError as e:
+                    self._reply(route, 400, {'erro': str(e)}, started)
+                except Exception as e:
+                    self._reply(route, 500, {'erro': str(e)}, started)
+                else:
+                    payload['tempo_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                    self._reply(route, 200, payload, started)
+            
+            def log_message(self, format, *args):
+                pass  # Não polui o console a cada pedido
+        
+        return _Handler
+    
+    def start(self) -> int:
+        """
+        Inicia o serviço e o servidor em thread daemon
+        
+        Returns:
+            Porta efetivamente em uso
+        """
+        if self._server is not None:
+            return self.port
+        
+        self.service.start()
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.port
+    
+    def stop(self):
+        """Para o servidor e o serviço"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self.service.stop()
+
+
+class RecognitionClient:
+    """Cliente fino para as portas (só urllib + cv2.imencode)"""
+    
+    def __init__(self, base_url: str = "http://127.0.0.1:8765", door_id: str = "principal",
+                 timeout: float = 5.0, jpeg_quality: int = 90):
+        self.base_url = base_url.rstrip("/")
+        self.door_id = door_id
+        self.timeout = timeout
+        self.jpeg_quality = jpeg_quality
+    
+    def _encode(self, image: Union[bytes, np.ndarray]) -> bytes:
+        if isinstance(image, (bytes, bytearray)):
+            return bytes(image)
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("Não foi possível codificar a imagem")
+        return buffer.tobytes()
+    
+    def _request(self, method: str, route: str, data: Optional[bytes] = None,
+                 params: Optional[Dict] = None) -> Dict:
+        url = self.base_url + route
+        if params:
+            url += "?" + urlencode(params)
+        request = urllib.request.Request(url, data=data, method=method)
+        if data is not None:
+            request.add_header("Content-Type", "image/jpeg")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get('erro', e.reason)
+            except ValueError:
+                message = e.reason
+            raise RuntimeError(f"Serviço respondeu {e.code}: {message}") from None
+    
+    def _params(self, register: bool) -> Dict:
+        return {'porta': self.door_id, 'registrar': int(register)}
+    
+    def recognize_frame(self, image: Union[bytes, np.ndarray], register: bool = False) -> List[Dict]:
+        """Envia um frame (BGR ou já codificado) e devolve as faces reconhecidas"""
+        return self._request("POST", "/reconhecer", self._encode(image), self._params(register))['faces']
+    
+    def recognize_face(self, face: Union[bytes, np.ndarray], register: bool = False) -> Dict:
+        """Envia um recorte de face e devolve a decisão"""
+        return self._request("POST", "/reconhecer-face", self._encode(face), self._params(register))['faces'][0]
+    
+    def reload(self) -> Dict:
+        return self._request("POST", "/recarregar", b"")
+    
+    def health(self) -> Dict:
+        return self._request("GET", "/saude")
@@ -0,0 +1,266 @@
+"""
+Avaliação offline dos reconhecedores sobre o dataset cadastrado
+
+Separa as faces em k dobras (ou um conjunto de teste fixo), reservando
+algumas pessoas inteiras como impostoras (fora da galeria), treina cada
+reconhecedor em cada dobra e classifica todas as faces de teste em lote com
+os matchers de modules/shared_gallery.py (mesmo rótulo e distância do
+predict do OpenCV). As distâncias de todas as dobras são então varridas por
+uma grade de thresholds, de forma vetorizada:
+
+- FRR: faces de pessoas cadastradas não aceitas como a pessoa certa
+- FAR: faces de impostores aceitas (distância <= threshold)
+- erro de identificação: faces cadastradas aceitas como outra pessoa
+- acurácia: aceitas corretamente + impostores rejeitados, sobre o total
+
+A latência por face é medida à parte, com o predict do OpenCV em sequência
+(como no reconhecimento ao vivo).
+"""
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from modules.shared_gallery import FACTORIES, create_matcher, gallery_arrays
+
+
+RECOGNIZERS = ("eigenfaces", "fisherfaces", "lbph")
+
+
+def make_splits(ids: np.ndarray, folds: int = 5, test_fraction: Optional[float] = None,
+                impostor_fraction: float = 0.2, seed: int = 0) -> List[Dict[str, np.ndarray]]:
+    """
+    Divide as faces em treino, teste de pessoas cadastradas e teste de impostores
+    
+    Args:
+        ids: Id da pessoa de cada face
+        folds: Dobras do k-fold (estratificado por pessoa)
+        test_fraction: Se informado, uma única divisão com essa fração de cada
+                       pessoa no teste (em vez do k-fold)
+        impostor_fraction: Fração das pessoas deixadas fora da galeria em cada
+                           dobra (sorteadas de novo a cada dobra)
+        seed: Semente das divisões
+    
+    Returns:
+        Uma divisão por dobra: {'treino', 'genuinas', 'impostoras'} com índices das faces
+    """
+    ids = np.asarray(ids)
+    people = np.unique(ids)
+    rng = np.random.default_rng(seed)
+    n_impostors = int(round(len(people) * impostor_fraction))
+    # A galeria precisa de pelo menos 2 pessoas (Fisherfaces)
+    n_impostors = min(n_impostors, max(0, len(people) - 2))
+    if impostor_fraction > 0 and n_impostors == 0 and len(people) >= 3:
+        n_impostors = 1
+    
+    shuffled = {person: rng.permutation(np.flatnonzero(ids == person)) for person in people}
+    n_splits = 1 if test_fraction is not None else max(2, folds)
+    
+    splits = []
+    for fold in range(n_splits):
+        impostors = set(rng.choice(people, n_impostors, replace=False).tolist()) if n_impostors else set()
+        train, genuine, impostor = [], [], []
+        for person, indices in shuffled.items():
+            if person in impostors:
+                impostor.extend(indices)
+                continue
+            if test_fraction is not None:
+                n_test = int(round(len(indices) * test_fraction))
+                test = indices[:n_test] if len(indices) - n_test >= 1 else indices[:0]
+            else:
+                test = np.array_split(indices, n_splits)[fold] if len(indices) >= 2 else indices[:0]
+            genuine.extend(test)
+            train.extend(np.setdiff1d(indices, test))
+        splits.append({
+            'treino': np.array(train, dtype=int),
+            'genuinas': np.array(genuine, dtype=int),
+            'impostoras': np.array(impostor, dtype=int),
+        })
+    return splits
+
+
+def score_split(recognizer: str, ids: np.ndarray, faces: Sequence[np.ndarray],
+                split: Dict[str, np.ndarray]) -> Dict:
+    """
+    Treina o reconhecedor com o treino da divisão e classifica os testes em lote
+    
+    Returns:
+        Dicionário com rótulos/distâncias das faces cadastradas e dos impostores,
+        tempos de treino e do lote e o modelo treinado
+    """
+    model = FACTORIES[recognizer]()
+    start = time.perf_counter()
+    model.train([faces[i] for i in split['treino']], ids[split['treino']])
+    train_s = time.perf_counter() - start
+    
+    matcher = create_matcher(recognizer, *gallery_arrays(model, recognizer))
+    probes = np.concatenate([split['genuinas'], split['impostoras']])
+    start = time.perf_counter()
+    labels, distances = matcher.predict_many([faces[i] for i in probes])
+    batch_s = time.perf_counter() - start
+    
+    n_genuine = len(split['genuinas'])
+    return {
+        'rotulos': labels[:n_genuine],
+        'verdadeiros': ids[split['genuinas']],
+        'distancias': distances[:n_genuine],
+        'distancias_impostores': distances[n_genuine:],
+        'treino_s': train_s,
+        'lote_s': batch_s,
+        'faces': len(probes),
+        'modelo': model,
+    }
+
+
+def sweep(labels: np.ndarray, true_ids: np.ndarray, distances: np.ndarray,
+          impostor_distances: np.ndarray, thresholds: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    FAR, FRR, erro de identificação e acurácia para cada threshold
+    
+    Uma face é aceita quando a distância do vizinho mais próximo é <= threshold
+    (a mesma regra de FaceRecognitionModule.classify_face).
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    correct = (labels == true_ids)[:, None]
+    accepted = distances[:, None] <= thresholds[None, :]
+    impostor_accepted = impostor_distances[:, None] <= thresholds[None, :]
+    
+    n_genuine, n_impostor = len(distances), len(impostor_distances)
+    true_accepts = (accepted & correct).sum(axis=0)
+    false_accepts = impostor_accepted.sum(axis=0)
+    return {
+        'threshold': thresholds,
+        'far': false_accepts / n_impostor if n_impostor else np.zeros(len(thresholds)),
+        'frr': 1.0 - true_accepts / n_genuine if n_genuine else np.zeros(len(thresholds)),
+        'erro_identificacao': ((accepted & ~correct).sum(axis=0) / n_genuine
+                               if n_genuine else np.zeros(len(thresholds))),
+        'acuracia': (true_accepts + (n_impostor - false_accepts)) / max(1, n_genuine + n_impostor),
+    }
+
+
+def threshold_grid(distances: np.ndarray, points: int = 200,
+                   extra: Sequence[float] = ()) -> np.ndarray:
+    """Thresholds nos quantis das distâncias observadas (mais os pedidos em extra)"""
+    distances = distances[np.isfinite(distances)]
+    if len(distances) == 0:
+        return np.array(sorted(extra), dtype=np.float64)
+    grid = np.quantile(distances, np.linspace(0.0, 1.0, points))
+    return np.unique(np.concatenate([grid, np.asarray(extra, dtype=np.float64)]))
+
+
+def measure_latency(model, faces: Sequence[np.ndarray], probes: Sequence[int]) -> np.ndarray:
+    """Milissegundos de cada predict do OpenCV, em sequência"""
+    latencies = []
+    for i in probes:
+        start = time.perf_counter()
+        model.predict(faces[i])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies)
+
+
+def summarize(curve: Dict[str, np.ndarray], rank1: float, target_far: float) -> Dict:
+    """Resumo de uma curva: EER e o maior threshold com FAR <= target_far"""
+    far, frr, thresholds = curve['far'], curve['frr'], curve['threshold']
+    eer_index = int(np.argmin(np.abs(far - frr)))
+    within = np.flatnonzero(far <= target_far)
+    at_far = int(within[-1]) if len(within) else 0
+    return {
+        'rank1': rank1,
+        'eer': float((far[eer_index] + frr[eer_index]) / 2),
+        'threshold_eer': float(thresholds[eer_index]),
+        'threshold_sugerido': float(thresholds[at_far]) if len(within) else None,
+        'far_sugerido': float(far[at_far]) if len(within) else None,
+        'frr_sugerido': float(frr[at_far]) if len(within) else None,
+        'acuracia_max': float(curve['acuracia'].max()),
+    }
+
+
+def evaluate(ids: np.ndarray, faces: Sequence[np.ndarray],
+             recognizers: Sequence[str] = RECOGNIZERS, folds: int = 5,
+             test_fraction: Optional[float] = None, impostor_fraction: float = 0.2,
+             target_far: float = 0.01, points: int = 200, extra_thresholds: Sequence[float] = (),
+             latency_probes: int = 50, workers: Optional[int] = None, seed: int = 0) -> Dict[str, Dict]:
+    """
+    Avalia os reconhecedores
+    
+    Todas as combinações (reconhecedor, dobra) rodam em paralelo em threads
+    (treino, projeção e compareHist do OpenCV/NumPy liberam o GIL). A
+    latência por face é medida depois, sem concorrência.
+    
+    Args:
+        ids, faces: Dataset (ver TrainingModule.load_training_data)
+        recognizers: Reconhecedores a avaliar
+        folds, test_fraction, impostor_fraction, seed: Ver make_splits
+        target_far: FAR máximo do threshold sugerido
+        points: Pontos da grade de thresholds
+        extra_thresholds: Thresholds incluídos na curva (ex.: o threshold em uso)
+        latency_probes: Faces usadas na medição da latência por face
+        workers: Threads (padrão: uma por combinação)
+    
+    Returns:
+        Por reconhecedor: 'resumo', 'curva', 'latencia_ms' (média, p95), 'lote_ms_por_face',
+        'treino_s', 'faces' — ou 'erro' se o treino falhou
+    """
+    ids = np.asarray(ids)
+    splits = make_splits(ids, folds, test_fraction, impostor_fraction, seed)
+    if not any(len(split['genuinas']) for split in splits):
+        raise ValueError("Amostras insuficientes para separar um conjunto de teste")
+    
+    jobs = [(recognizer, index) for recognizer in recognizers for index in range(len(splits))]
+    with ThreadPoolExecutor(max_workers=workers or len(jobs), thread_name_prefix="avaliacao") as pool:
+        futures = {job: pool.submit(score_split, job[0], ids, faces, splits[job[1]]) for job in jobs}
+    
+    results = {}
+    for recognizer in recognizers:
+        scores = []
+        try:
+            scores = [futures[(recognizer, index)].result() for index in range(len(splits))]
+        except Exception as e:
+            results[recognizer] = {'erro': str(e)}
+            continue
+        
+        labels = np.concatenate([s['rotulos'] for s in scores])
+        true_ids = np.concatenate([s['verdadeiros'] for s in scores])
+        distances = np.concatenate([s['distancias'] for s in scores])
+        impostor_distances = np.concatenate([s['distancias_impostores'] for s in scores])
+        
+        thresholds = threshold_grid(np.concatenate([distances, impostor_distances]), points, extra_thresholds)
+        curve = sweep(labels, true_ids, distances, impostor_distances, thresholds)
+        rank1 = float(np.mean(labels == true_ids)) if len(labels) else 0.0
+        
+        first = splits[0]
+        probes = np.concatenate([first['genuinas'], first['impostoras']])[:latency_probes]
+        latencies = measure_latency(scores[0]['modelo'], faces, probes)
+        
+        results[recognizer] = {
+            'resumo': summarize(curve, rank1, target_far),
+            'curva': curve,
+            'latencia_ms': (float(np.mean(latencies)), float(np.percentile(latencies, 95)))
+            if len(latencies) else (0.0, 0.0),
+            'lote_ms_por_face': sum(s['lote_s'] for s in scores) * 1000.0 / max(1, sum(s['faces'] for s in scores)),
+            'treino_s': float(np.mean([s['treino_s'] for s in scores])),
+            'faces': (len(distances), len(impostor_distances)),
+        }
+    return results
+
+
+def at_threshold(curve: Dict[str, np.ndarray], threshold: float) -> Dict[str, float]:
+    """Ponto da curva mais próximo de um threshold (ex.: o que está em uso)"""
+    index = int(np.argmin(np.abs(curve['threshold'] - threshold)))
+    return {key: float(values[index]) for key, values in curve.items()}
+
+
+def write_curves(path: str, results: Dict[str, Dict]):
+    """Grava as curvas FAR/FRR de todos os reconhecedores em CSV"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["reconhecedor", "threshold", "far", "frr", "erro_identificacao", "acuracia"])
+        for recognizer, result in results.items():
+            if 'curva' not in result:
+                continue
+            curve = result['curva']
+            for row in zip(curve['threshold'], curve['far'], curve['frr'],
+                           curve['erro_identificacao'], curve['acuracia']):
+                writer.writerow([recognizer] + [f"{value:.6g}" for value in row])
@@ -0,0 +1,103 @@
+"""
+Detecção por região de interesse (ROI) ao redor das faces conhecidas
+"""
+from typing import Optional, List, Tuple
+
+Box = Tuple[int, int, int, int]
+
+
+class RoiScheduler:
+    """
+    Decide em que região do frame a próxima detecção deve rodar
+    
+    Enquanto houver faces rastreadas, a detecção roda em um recorte ampliado
+    ao redor delas (mais resolução efetiva por face e menos pixels de corredor
+    vazio). Uma varredura do frame inteiro roda a cada full_scan_interval
+    frames ou sempre que nenhuma face estiver sendo rastreada.
+    """
+    
+    def __init__(self, full_scan_interval: int = 15, margin: float = 0.75,
+                 min_roi_size: int = 160, max_area_ratio: float = 0.6):
+        """
+        Inicializa o agendador de ROI
+        
+        Args:
+            full_scan_interval: Frames entre varreduras completas
+            margin: Margem adicionada em cada lado, proporcional ao tamanho da face
+            min_roi_size: Lado mínimo do recorte (pixels)
+            max_area_ratio: Se o recorte cobrir mais que essa fração do frame,
+                            faz varredura completa (não compensa recortar)
+        """
+        self.full_scan_interval = max(1, full_scan_interval)
+        self.margin = margin
+        self.min_roi_size = min_roi_size
+        self.max_area_ratio = max_area_ratio
+        
+        self.tracked_boxes: List[Box] = []
+        self.frames_since_full_scan = 0
+    
+    def reset(self):
+        """Esquece as faces rastreadas (força varredura completa)"""
+        self.tracked_boxes = []
+        self.frames_since_full_scan = 0
+    
+    def plan(self, frame_width: int, frame_height: int) -> Optional[Box]:
+        """
+        Escolhe a região da próxima detecção
+        
+        Args:
+            frame_width: Largura do frame
+            frame_height: Altura do frame
+        
+        Returns:
+            Recorte (x1, y1, x2, y2) ou None para varredura completa
+        """
+        if not self.tracked_boxes or self.frames_since_full_scan >= self.full_scan_interval:
+            return None
+        
+        x1 = min(b[0] for b in self.tracked_boxes)
+        y1 = min(b[1] for b in self.tracked_boxes)
+        x2 = max(b[2] for b in self.tracked_boxes)
+        y2 = max(b[3] for b in self.tracked_boxes)
+        
+        # Amplia proporcionalmente à maior face e deixa o recorte quadrado
+        # (o SSD espera entrada quadrada; evita achatar a face)
+        face_size = max(max(b[2] - b[0], b[3] - b[1]) for b in self.tracked_boxes)
+        pad = int(face_size * self.margin)
+        x1, y1, x2, y2 = x1 - pad, y1 - pad, x2 + pad, y2 + pad
+        
+        side = max(x2 - x1, y2 - y1, self.min_roi_size)
+        side = min(side, frame_width, frame_height)
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+        x1 = min(max(0, cx - side // 2), frame_width - side)
+        y1 = min(max(0, cy - side // 2), frame_height - side)
+        roi = (x1, y1, x1 + side, y1 + side)
+        
+        if side * side > self.max_area_ratio * frame_width * frame_height:
+            return None
+        return roi
+    
+    def update(self, boxes: List[Box], full_scan: bool):
+        """
+        Atualiza as faces rastreadas com o resultado da detecção
+        
+        Args:
+            boxes: Faces detectadas (coordenadas do frame)
+            full_scan: Se a detecção foi uma varredura completa
+        """
+        self.tracked_boxes = list(boxes)
+        if full_scan:
+            self.frames_since_full_scan = 0
+        else:
+            self.frames_since_full_scan += 1
+
+
+def roi_input_size(roi_side: int, max_size: int = 300, min_size: int = 128) -> int:
+    """
+    Tamanho de entrada do SSD para um recorte
+    
+    Recortes menores que a entrada padrão rodam em resolução nativa (1:1),
+    o que custa menos que 300x300 e não perde detalhe.
+    """
+    size = min(max_size, max(min_size, roi_side))
+    return int(size // 4 * 4)
@@ -0,0 +1,121 @@
+"""
+Filtro de qualidade e diversidade das amostras de cadastro
+"""
+import cv2
+import numpy as np
+from typing import Dict, List, Tuple
+
+
+def difference_hash(gray: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Hash perceptual (dHash) de uma imagem em tons de cinza
+    
+    Compara pixels vizinhos de uma miniatura (hash_size+1 x hash_size);
+    imagens parecidas geram hashes com poucos bits diferentes.
+    """
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Número de bits diferentes entre dois hashes"""
+    return bin(a ^ b).count("1")
+
+
+class SampleQualityGate:
+    """
+    Aceita apenas amostras nítidas, bem expostas, de tamanho adequado e
+    diferentes das já aceitas; indica quando o conjunto já é suficiente
+    """
+    
+    def __init__(self, target_samples: int = 15, min_sharpness: float = 60.0,
+                 min_face_size: int = 80, min_brightness: float = 50.0,
+                 max_brightness: float = 205.0, min_hash_distance: int = 6):
+        """
+        Inicializa o filtro
+        
+        Args:
+            target_samples: Amostras aceitas para encerrar o cadastro
+            min_sharpness: Variância mínima do Laplaciano (abaixo disso está borrada)
+            min_face_size: Lado mínimo da face no frame original (pixels)
+            min_brightness: Brilho médio mínimo (0-255)
+            max_brightness: Brilho médio máximo (0-255)
+            min_hash_distance: Distância mínima (bits do dHash) para as amostras
+                               já aceitas; abaixo disso é quase duplicata
+        """
+        self.target_samples = target_samples
+        self.min_sharpness = min_sharpness
+        self.min_face_size = min_face_size
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.min_hash_distance = min_hash_distance
+        
+        self.hashes: List[int] = []
+        self.rejections: Dict[str, int] = {}
+    
+    def reset(self):
+        """Esquece as amostras aceitas"""
+        self.hashes = []
+        self.rejections = {}
+    
+    def _reject(self, reason: str) -> Tuple[bool, str]:
+        self.rejections[reason] = self.rejections.get(reason, 0) + 1
+        return False, reason
+    
+    def _gray(self, face_roi: np.ndarray) -> np.ndarray:
+        return cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY) if face_roi.ndim == 3 else face_roi
+    
+    def check(self, face_roi: np.ndarray, face_size: int) -> Tuple[bool, str]:
+        """
+        Avalia uma amostra (sem registrá-la; ver add)
+        
+        Args:
+            face_roi: Recorte da face (BGR ou tons de cinza)
+            face_size: Lado da face no frame original (pixels)
+        
+        Returns:
+            Tupla (aceita, motivo)
+        """
+        if face_size < self.min_face_size:
+            return self._reject("pequena")
+        
+        gray = self._gray(face_roi)
+        
+        brightness = float(gray.mean())
+        if brightness < self.min_brightness:
+            return self._reject("escura")
+        if brightness > self.max_brightness:
+            return self._reject("clara")
+        
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+        if sharpness < self.min_sharpness:
+            return self._reject("borrada")
+        
+        sample_hash = difference_hash(gray)
+        if any(hamming_distance(sample_hash, h) < self.min_hash_distance for h in self.hashes):
+            return self._reject("repetida")
+        
+        return True, "ok"
+    
+    def add(self, face_roi: np.ndarray):
+        """
+        Registra uma amostra aceita e efetivamente guardada
+        
+        Só as amostras registradas contam para o controle de diversidade e para
+        is_complete; uma amostra aceita mas descartada depois (ex.: fila de
+        gravação cheia) não bloqueia as parecidas seguintes.
+        """
+        self.hashes.append(difference_hash(self._gray(face_roi)))
+    
+    @property
+    def accepted(self) -> int:
+        """Amostras aceitas até agora"""
+        return len(self.hashes)
+    
+    def is_complete(self) -> bool:
+        """True quando já há amostras boas e diversas suficientes"""
+        return self.accepted >= self.target_samples
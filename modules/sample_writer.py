@@ -0,0 +1,145 @@
+"""
+Gravação assíncrona das amostras capturadas no cadastro
+"""
+import os
+import queue
+import threading
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+
+class SampleWriter:
+    """
+    Pool de threads que codifica e grava imagens fora da thread de captura
+    
+    A fila é limitada: se o disco não acompanhar, novas amostras são
+    descartadas (e contadas) em vez de travar a captura.
+    """
+    
+    def __init__(self, workers: int = 2, max_queue: int = 32,
+                 image_format: str = "jpg", jpeg_quality: int = 95,
+                 png_compression: int = 3):
+        """
+        Inicializa o gravador
+        
+        Args:
+            workers: Número de threads de gravação
+            max_queue: Tamanho máximo da fila de imagens pendentes
+            image_format: 'jpg' ou 'png'
+            jpeg_quality: Qualidade JPEG (0-100)
+            png_compression: Compressão PNG (0-9)
+        """
+        if image_format not in ("jpg", "png"):
+            raise ValueError(f"Formato inválido: {image_format}")
+        
+        self.image_format = image_format
+        if image_format == "jpg":
+            self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+        else:
+            self.encode_params = [cv2.IMWRITE_PNG_COMPRESSION, int(png_compression)]
+        
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._created_dirs = set()
+        
+        # Relatório agregado
+        self.written: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.dropped = 0
+        self.errors: List[str] = []
+        
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True)
+            for _ in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    @property
+    def extension(self) -> str:
+        """Extensão dos arquivos gravados"""
+        return self.image_format
+    
+    def submit(self, path: str, image: np.ndarray, kind: str = "face") -> bool:
+        """
+        Enfileira uma imagem para gravação (não bloqueia)
+        
+        Args:
+            path: Caminho do arquivo
+            image: Imagem a gravar (não deve ser alterada depois)
+            kind: Categoria usada no relatório ('face', 'frame'...)
+        
+        Returns:
+            False se a fila estava cheia e a imagem foi descartada
+        """
+        try:
+            self._queue.put_nowait((path, image, kind))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+    
+    def _ensure_dir(self, path: str):
+        """Cria o diretório do arquivo uma única vez"""
+        directory = os.path.dirname(path)
+        if directory and directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+    
+    def _worker(self):
+        """Loop de gravação"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            
+            path, image, kind = item
+            try:
+                self._ensure_dir(path)
+                ok, buffer = cv2.imencode("." + self.image_format, image, self.encode_params)
+                if not ok:
+                    raise IOError("falha ao codificar imagem")
+                with open(path, "wb") as f:
+                    f.write(buffer.tobytes())
+                with self._lock:
+                    self.written[kind] = self.written.get(kind, 0) + 1
+            except Exception as e:
+                with self._lock:
+                    self.failed[kind] = self.failed.get(kind, 0) + 1
+                    if len(self.errors) < 10:
+                        self.errors.append(f"{os.path.basename(path)}: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def pending(self) -> int:
+        """Imagens aguardando gravação"""
+        return self._queue.qsize()
+    
+    def close(self) -> Dict:
+        """
+        Aguarda a fila esvaziar e encerra as threads
+        
+        Returns:
+            Relatório {'gravadas', 'falhas', 'descartadas', 'erros'}
+        """
+        self._queue.join()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        
+        return self.report()
+    
+    def report(self) -> Dict:
+        """Relatório agregado até o momento"""
+        with self._lock:
+            return {
+                'gravadas': dict(self.written),
+                'falhas': dict(self.failed),
+                'descartadas': self.dropped,
+                'erros': list(self.errors),
+            }
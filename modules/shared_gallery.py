@@ -0,0 +1,315 @@
+"""
+Galeria do reconhecedor compartilhada entre processos (arquivos mapeados em memória)
+
+Cada processo que carrega o .yml do LBPH/Eigen/Fisher ganha uma cópia
+privada das matrizes da galeria (histogramas, projeções, autovetores), e a
+memória cresce com o número de workers. Aqui as matrizes são publicadas uma
+vez em arquivos .npy e cada processo as abre com np.load(mmap_mode='r'): as
+páginas ficam no cache do sistema e são compartilhadas, somente leitura,
+por todos os processos.
+
+O predict é refeito sobre as matrizes mapeadas com o mesmo algoritmo do
+OpenCV (LBP estendido + histogramas por célula + qui-quadrado alternativo
+no LBPH; projeção no subespaço + distância L2 no Eigen/Fisher) e devolve o
+mesmo rótulo e a mesma distância.
+
+Layout:
+    <raiz>/<reconhecedor>/CURRENT     nome da versão ativa (trocado de forma atômica)
+    <raiz>/<reconhecedor>/v000003/    meta.json, labels.npy e as matrizes
+"""
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+DEFAULT_ROOT = "gallery_shared"
+
+TRAINING_FILES = {
+    "eigenfaces": "eigen_classifier.yml",
+    "fisherfaces": "fisher_classifier.yml",
+    "lbph": "lbph_classifier.yml",
+}
+
+FACTORIES = {
+    "eigenfaces": lambda: cv2.face.EigenFaceRecognizer_create(),
+    "fisherfaces": lambda: cv2.face.FisherFaceRecognizer_create(),
+    "lbph": lambda: cv2.face.LBPHFaceRecognizer_create(),
+}
+
+_CURRENT = "CURRENT"
+_FLT_EPSILON = np.finfo(np.float32).eps
+
+
+# ========== Publicação ==========
+
+def _versions(directory: str):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(d for d in os.listdir(directory)
+                  if d.startswith("v") and d[1:].isdigit() and os.path.isdir(os.path.join(directory, d)))
+
+
+def gallery_arrays(model, recognizer_type: str) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Matrizes e parâmetros da galeria de um reconhecedor treinado
+    
+    Returns:
+        (matrizes, parâmetros); as matrizes incluem 'labels'
+    """
+    arrays = {'labels': np.asarray(model.getLabels(), dtype=np.int32).ravel()}
+    params = {}
+    if recognizer_type == "lbph":
+        arrays['histograms'] = np.vstack(model.getHistograms()).astype(np.float32)
+        params.update(radius=model.getRadius(), neighbors=model.getNeighbors(),
+                      grid_x=model.getGridX(), grid_y=model.getGridY())
+    elif recognizer_type in ("eigenfaces", "fisherfaces"):
+        arrays['mean'] = np.asarray(model.getMean(), dtype=np.float64).ravel()
+        arrays['eigenvectors'] = np.asarray(model.getEigenVectors(), dtype=np.float64)
+        arrays['projections'] = np.vstack(model.getProjections()).astype(np.float64)
+    else:
+        raise ValueError(f"Algoritmo inválido: {recognizer_type}")
+    return arrays, params
+
+
+def create_matcher(recognizer_type: str, arrays: Dict[str, np.ndarray], params: Dict):
+    """Matcher (LBPHMatcher ou SubspaceMatcher) sobre as matrizes de gallery_arrays()"""
+    if recognizer_type == "lbph":
+        return LBPHMatcher(arrays['histograms'], arrays['labels'], params['radius'],
+                           params['neighbors'], params['grid_x'], params['grid_y'])
+    return SubspaceMatcher(arrays['mean'], arrays['eigenvectors'], arrays['projections'],
+                           arrays['labels'])
+
+
+def export_recognizer(model, recognizer_type: str, root: str = DEFAULT_ROOT,
+                      face_names: Optional[Dict[str, int]] = None, keep: int = 2) -> str:
+    """
+    Publica as matrizes de um reconhecedor treinado como uma nova versão
+    
+    A versão é gravada num diretório temporário e só então vira a ativa
+    (rename + troca atômica de CURRENT); quem já está lendo a anterior
+    continua com ela até chamar refresh().
+    
+    Args:
+        model: Reconhecedor do OpenCV já treinado (cv2.face.*)
+        recognizer_type: 'lbph', 'eigenfaces' ou 'fisherfaces'
+        root: Diretório raiz das galerias
+        face_names: Mapeamento nome -> id gravado junto (para conferência)
+        keep: Versões mantidas em disco (a ativa e as anteriores mais recentes)
+    
+    Returns:
+        Nome da versão publicada
+    """
+    directory = os.path.join(root, recognizer_type)
+    os.makedirs(directory, exist_ok=True)
+    existing = _versions(directory)
+    version = f"v{int(existing[-1][1:]) + 1 if existing else 1:06d}"
+    
+    arrays, params = gallery_arrays(model, recognizer_type)
+    meta = dict(params, reconhecedor=recognizer_type, versao=version, publicado_em=time.time(),
+                nomes=face_names or {})
+    
+    staging = os.path.join(directory, f".{version}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, name + ".npy"), np.ascontiguousarray(array))
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.rename(staging, os.path.join(directory, version))
+    
+    pointer = os.path.join(directory, _CURRENT + ".tmp")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(directory, _CURRENT))
+    
+    # Versões antigas: no Windows um arquivo ainda mapeado não pode ser removido (fica para a próxima)
+    for old in _versions(directory)[:-max(1, keep)]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+    return version
+
+
+def publish_trained(recognizer_type: str, root: str = DEFAULT_ROOT,
+                    training_file: Optional[str] = None) -> str:
+    """Publica um reconhecedor a partir do .yml treinado (ex.: lbph_classifier.yml)"""
+    model = FACTORIES[recognizer_type]()
+    model.read(training_file or TRAINING_FILES[recognizer_type])
+    return export_recognizer(model, recognizer_type, root)
+
+
+# ========== Predict sobre as matrizes mapeadas ==========
+
+def extended_lbp(face: np.ndarray, radius: int, neighbors: int) -> np.ndarray:
+    """LBP estendido (circular, com interpolação bilinear), como o elbp do OpenCV"""
+    src = face.astype(np.float32)
+    rows, cols = src.shape
+    center = src[radius:rows - radius, radius:cols - radius]
+    codes = np.zeros(center.shape, dtype=np.int32)
+    for n in range(neighbors):
+        x = np.float32(radius) * np.float32(np.cos(2.0 * np.pi * n / neighbors))
+        y = np.float32(-radius) * np.float32(np.sin(2.0 * np.pi * n / neighbors))
+        fx, fy, cx, cy = int(np.floor(x)), int(np.floor(y)), int(np.ceil(x)), int(np.ceil(y))
+        tx, ty = np.float32(x - fx), np.float32(y - fy)
+        weights = (np.float32((1 - tx) * (1 - ty)), np.float32(tx * (1 - ty)),
+                   np.float32((1 - tx) * ty), np.float32(tx * ty))
+        
+        def shifted(dy, dx):
+            return src[radius + dy:rows - radius + dy, radius + dx:cols - radius + dx]
+        
+        t = (weights[0] * shifted(fy, fx) + weights[1] * shifted(fy, cx)
+             + weights[2] * shifted(cy, fx) + weights[3] * shifted(cy, cx))
+        codes += ((t > center) | (np.abs(t - center) < _FLT_EPSILON)).astype(np.int32) << n
+    return codes
+
+
+def spatial_histogram(codes: np.ndarray, patterns: int, grid_x: int, grid_y: int) -> np.ndarray:
+    """Histogramas normalizados de cada célula da grade, concatenados (float32)"""
+    height, width = codes.shape[0] // grid_y, codes.shape[1] // grid_x
+    histogram = np.empty((grid_y, grid_x, patterns), dtype=np.float32)
+    for i in range(grid_y):
+        for j in range(grid_x):
+            cell = codes[i * height:(i + 1) * height, j * width:(j + 1) * width]
+            counts = np.bincount(cell.ravel(), minlength=patterns)[:patterns]
+            histogram[i, j] = counts.astype(np.float32) / np.float32(cell.size)
+    return histogram.reshape(-1)
+
+
+class LBPHMatcher:
+    """Predict do LBPH sobre histogramas mapeados em memória"""
+    
+    def __init__(self, histograms: np.ndarray, labels: np.ndarray, radius: int = 1,
+                 neighbors: int = 8, grid_x: int = 8, grid_y: int = 8):
+        self.histograms = histograms
+        self.labels = labels
+        self.radius = radius
+        self.neighbors = neighbors
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+    
+    def predict(self, face: np.ndarray) -> Tuple[int, float]:
+        query = spatial_histogram(extended_lbp(face, self.radius, self.neighbors),
+                                  2 ** self.neighbors, self.grid_x, self.grid_y)
+        # Uma linha por vez: compareHist é o mesmo do LBPH e não cria temporários do tamanho da galeria
+        distances = [cv2.compareHist(row, query, cv2.HISTCMP_CHISQR_ALT) for row in self.histograms]
+        best = int(np.argmin(distances))
+        return int(self.labels[best]), float(distances[best])
+    
+    def predict_many(self, faces) -> Tuple[np.ndarray, np.ndarray]:
+        """Rótulo e distância do vizinho mais próximo de cada face"""
+        results = [self.predict(face) for face in faces]
+        return (np.array([r[0] for r in results], dtype=np.int32),
+                np.array([r[1] for r in results], dtype=np.float64))
+
+
+class SubspaceMatcher:
+    """Predict do Eigenfaces/Fisherfaces sobre projeções e autovetores mapeados em memória"""
+    
+    def __init__(self, mean: np.ndarray, eigenvectors: np.ndarray, projections: np.ndarray,
+                 labels: np.ndarray):
+        self.mean = mean
+        self.eigenvectors = eigenvectors
+        self.projections = projections
+        self.labels = labels
+    
+    def predict(self, face: np.ndarray) -> Tuple[int, float]:
+        query = (face.reshape(-1).astype(np.float64) - self.mean) @ self.eigenvectors
+        distances = np.linalg.norm(self.projections - query, axis=1)
+        best = int(np.argmin(distances))
+        return int(self.labels[best]), float(distances[best])
+    
+    def predict_many(self, faces, block_elements: int = 1 << 22) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rótulo e distância do vizinho mais próximo de cada face, em lote
+        
+        Projeta todas as faces numa multiplicação de matrizes e calcula as
+        distâncias a toda a galeria em blocos de faces (cada bloco com até
+        block_elements diferenças temporárias).
+        """
+        data = np.stack([face.reshape(-1) for face in faces]).astype(np.float64)
+        queries = (data - self.mean) @ self.eigenvectors
+        chunk = max(1, block_elements // max(1, self.projections.size))
+        labels = np.empty(len(queries), dtype=np.int32)
+        distances = np.empty(len(queries), dtype=np.float64)
+        for start in range(0, len(queries), chunk):
+            block = queries[start:start + chunk]
+            all_distances = np.linalg.norm(block[:, None, :] - self.projections[None, :, :], axis=2)
+            best = np.argmin(all_distances, axis=1)
+            labels[start:start + chunk] = self.labels[best]
+            distances[start:start + chunk] = all_distances[np.arange(len(block)), best]
+        return labels, distances
+
+
+class SharedGallery:
+    """
+    Reconhecedor somente leitura sobre a versão ativa da galeria publicada
+    
+    Tem o mesmo predict(face) -> (rótulo, distância) dos reconhecedores do
+    OpenCV. A versão fica fixa até refresh(), que troca para a nova
+    versão ativa (se houver) sem afetar predicts em andamento.
+    """
+    
+    def __init__(self, recognizer_type: str, root: str = DEFAULT_ROOT):
+        if recognizer_type not in FACTORIES:
+            raise ValueError(f"Algoritmo inválido: {recognizer_type}")
+        self.recognizer_type = recognizer_type
+        self.directory = os.path.join(root, recognizer_type)
+        self.version: Optional[str] = None
+        self.meta: Dict = {}
+        self._matcher = None
+    
+    def current_version(self) -> Optional[str]:
+        """Versão ativa publicada (None se nada foi publicado)"""
+        try:
+            with open(os.path.join(self.directory, _CURRENT), "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def refresh(self) -> bool:
+        """
+        Mapeia a versão ativa, se for diferente da atual
+        
+        Returns:
+            True se trocou de versão
+        
+        Raises:
+            FileNotFoundError: Se nenhuma versão foi publicada
+        """
+        version = self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Nenhuma galeria publicada em {self.directory}")
+        if version == self.version:
+            return False
+        
+        path = os.path.join(self.directory, version)
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        
+        arrays = {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r")
+                  for name in os.listdir(path) if name.endswith(".npy")}
+        matcher = create_matcher(self.recognizer_type, arrays, meta)
+        
+        self._matcher, self.meta, self.version = matcher, meta, version
+        return True
+    
+    def predict(self, face: np.ndarray) -> Tuple[int, float]:
+        matcher = self._matcher
+        if matcher is None or len(matcher.labels) == 0:
+            raise RuntimeError("Galeria compartilhada vazia")
+        return matcher.predict(face)
+    
+    def __len__(self) -> int:
+        """Amostras da galeria na versão atual"""
+        matcher = self._matcher
+        return len(matcher.labels) if matcher is not None else 0
+    
+    def nbytes(self) -> int:
+        """Bytes das matrizes mapeadas da versão atual"""
+        matcher = self._matcher
+        if matcher is None:
+            return 0
+        return sum(value.nbytes for value in vars(matcher).values() if isinstance(value, np.ndarray))
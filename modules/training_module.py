@@ -5,21 +5,108 @@ import cv2
 import numpy as np
 import os
 import pickle
+import time
 from PIL import Image
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from modules.dataset_store import DatasetStore
+from modules.shared_gallery import DEFAULT_ROOT as SHARED_GALLERY_ROOT, export_recognizer
+
+
+RECOGNIZER_FACTORIES = {
+    'eigenfaces': lambda: cv2.face.EigenFaceRecognizer_create(),
+    'fisherfaces': lambda: cv2.face.FisherFaceRecognizer_create(),
+    'lbph': lambda: cv2.face.LBPHFaceRecognizer_create(),
+}
+
+# Resolução usada no agrupamento (k-means) das amostras de cada pessoa
+CLUSTER_SIZE = (30, 40)
+
+
+def select_prototypes(samples: List[np.ndarray], k: int, attempts: int = 3) -> List[int]:
+    """
+    Escolhe k amostras representativas de uma pessoa
+    
+    Agrupa as amostras com k-means (em resolução reduzida) e devolve, para
+    cada grupo, o índice da amostra mais próxima do centro (medoide). Usar
+    amostras reais em vez dos centros mantém imagens válidas para LBPH.
+    
+    Args:
+        samples: Faces da pessoa (mesmo tamanho)
+        k: Número de protótipos
+        attempts: Reinícios do k-means
+    
+    Returns:
+        Índices das amostras escolhidas (ordem crescente)
+    """
+    if k <= 0 or len(samples) <= k:
+        return list(range(len(samples)))
+    
+    data = np.array([cv2.resize(s, CLUSTER_SIZE, interpolation=cv2.INTER_AREA).flatten()
+                     for s in samples], dtype=np.float32)
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 50, 0.5)
+    _, labels, centers = cv2.kmeans(data, k, None, criteria, attempts, cv2.KMEANS_PP_CENTERS)
+    labels = labels.flatten()
+    
+    chosen = set()
+    for cluster, center in enumerate(centers):
+        members = np.flatnonzero(labels == cluster)
+        if len(members) == 0:
+            continue
+        distances = np.linalg.norm(data[members] - center, axis=1)
+        chosen.add(int(members[np.argmin(distances)]))
+    return sorted(chosen)
+
+
+def assign_face_ids(names: Iterable[str], known: Dict[str, int]) -> Dict[str, int]:
+    """
+    Ids estáveis para as pessoas do dataset
+    
+    Cada nome mantém o id já conhecido (face_names.pickle, ao qual os face_id
+    do banco se referem); nomes novos recebem ids depois do maior já usado, em
+    ordem alfabética. Ids de pessoas removidas nunca são reaproveitados.
+    
+    Args:
+        names: Pessoas presentes no dataset
+        known: Mapeamento nome -> id persistido
+    
+    Returns:
+        Mapeamento nome -> id das pessoas presentes
+    """
+    next_id = max(known.values(), default=0) + 1
+    assigned = {}
+    for name in sorted(names):
+        if name in known:
+            assigned[name] = known[name]
+        else:
+            assigned[name] = next_id
+            next_id += 1
+    return assigned
 
 
 class TrainingModule:
     """Módulo para treinamento de reconhecedores faciais"""
     
-    def __init__(self, training_path: str = 'dataset/'):
+    def __init__(self, training_path: str = 'dataset/', store_path: str = 'dataset_packed',
+                 prototypes_per_identity: Optional[int] = None,
+                 shared_gallery: Optional[str] = None):
         """
         Inicializa o módulo de treinamento
         
         Args:
-            training_path: Caminho para o dataset de treinamento
+            training_path: Caminho para o dataset de treinamento (pastas com imagens)
+            store_path: Diretório do dataset empacotado (ver modules/dataset_store.py)
+            prototypes_per_identity: Se definido, compacta a galeria para no máximo
+                                     este número de amostras por pessoa
+            shared_gallery: Diretório da galeria compartilhada (o mesmo de --shared-gallery
+                            dos workers); cada reconhecedor treinado também é publicado
+                            lá como nova versão, criando o diretório se preciso. None
+                            publica em gallery_shared/ apenas se esse diretório existir
         """
         self.training_path = training_path
+        self.store = DatasetStore(store_path)
+        self.prototypes_per_identity = prototypes_per_identity
+        self.shared_gallery = shared_gallery
     
     def get_image_data(self, path_train: str) -> Tuple[np.ndarray, list, Dict[str, int]]:
         """
@@ -63,6 +150,131 @@ class TrainingModule:
         
         return np.array(ids), faces, face_names
     
+    def load_training_data(self) -> Tuple[np.ndarray, list, Dict[str, int]]:
+        """
+        Carrega o dataset completo
+        
+        Identidades do dataset empacotado são lidas em bloco (memmap); pastas
+        ainda não migradas continuam sendo lidas imagem por imagem. Os ids vêm
+        de assign_face_ids: uma pessoa mantém o id entre treinamentos, mesmo
+        quando outras são cadastradas ou migradas.
+        
+        Returns:
+            Tupla (ids, faces, face_names)
+        """
+        ids, faces, face_names = self.store.load_all()
+        ids = list(ids)
+        if face_names:
+            print(f"Dataset empacotado: {len(faces)} faces de {len(face_names)} pessoa(s)")
+        
+        if os.path.isdir(self.training_path):
+            folder_ids, folder_faces, folder_names = self.get_image_data(self.training_path)
+            offset = len(face_names)
+            remap = {}
+            for name, face_id in folder_names.items():
+                if name in face_names:
+                    continue  # Já migrada: o dataset empacotado prevalece
+                offset += 1
+                remap[face_id] = offset
+                face_names[name] = offset
+            for face_id, face in zip(folder_ids, folder_faces):
+                if face_id in remap:
+                    ids.append(remap[face_id])
+                    faces.append(face)
+        
+        # Troca os ids provisórios (ordem de leitura) pelos ids persistidos
+        stable = assign_face_ids(face_names, self.get_face_names())
+        relabel = {face_id: stable[name] for name, face_id in face_names.items()}
+        return np.array([relabel[face_id] for face_id in ids]), faces, stable
+    
+    def compact_gallery(self, ids: np.ndarray, faces: list, prototypes_per_identity: int
+                        ) -> Tuple[np.ndarray, list]:
+        """
+        Reduz cada pessoa a no máximo prototypes_per_identity amostras (medoides)
+        
+        O custo do predict cresce com o tamanho da galeria, então menos
+        amostras por pessoa reduzem a latência do reconhecimento.
+        
+        Returns:
+            Tupla (ids, faces) compactada
+        """
+        ids = np.asarray(ids)
+        new_ids = []
+        new_faces = []
+        for face_id in np.unique(ids):
+            indices = np.flatnonzero(ids == face_id)
+            samples = [faces[i] for i in indices]
+            for i in select_prototypes(samples, prototypes_per_identity):
+                new_ids.append(face_id)
+                new_faces.append(samples[i])
+        return np.array(new_ids), new_faces
+    
+    def evaluate_compaction(self, ks: Iterable[Optional[int]], recognizer: str = 'lbph',
+                            test_fraction: float = 0.3, seed: int = 0) -> List[Dict]:
+        """
+        Mede acurácia e latência do reconhecimento para cada tamanho de galeria
+        
+        Separa test_fraction das amostras de cada pessoa para teste, treina o
+        reconhecedor com a galeria compactada (k=None: galeria completa) e
+        classifica as amostras de teste.
+        
+        Args:
+            ks: Protótipos por pessoa a avaliar (None = sem compactação)
+            recognizer: 'lbph', 'eigenfaces' ou 'fisherfaces'
+            test_fraction: Fração das amostras de cada pessoa usada no teste
+            seed: Semente da divisão treino/teste
+        
+        Returns:
+            Lista de dicionários com k, amostras, acuracia, ms_medio, ms_p95 e treino_s
+        """
+        ids, faces, _ = self.load_training_data()
+        rng = np.random.default_rng(seed)
+        
+        train_idx, test_idx = [], []
+        for face_id in np.unique(ids):
+            indices = rng.permutation(np.flatnonzero(ids == face_id))
+            n_test = int(round(len(indices) * test_fraction))
+            if len(indices) - n_test < 1:
+                n_test = 0
+            test_idx.extend(indices[:n_test])
+            train_idx.extend(indices[n_test:])
+        
+        if not test_idx:
+            raise ValueError("Amostras insuficientes para separar um conjunto de teste")
+        
+        train_ids = ids[train_idx]
+        train_faces = [faces[i] for i in train_idx]
+        
+        results = []
+        for k in ks:
+            if k:
+                gallery_ids, gallery_faces = self.compact_gallery(train_ids, train_faces, k)
+            else:
+                gallery_ids, gallery_faces = train_ids, train_faces
+            
+            model = RECOGNIZER_FACTORIES[recognizer]()
+            start = time.perf_counter()
+            model.train(gallery_faces, gallery_ids)
+            train_time = time.perf_counter() - start
+            
+            hits = 0
+            latencies = []
+            for i in test_idx:
+                start = time.perf_counter()
+                prediction, _ = model.predict(faces[i])
+                latencies.append((time.perf_counter() - start) * 1000.0)
+                hits += int(prediction == ids[i])
+            
+            results.append({
+                'k': k,
+                'amostras': len(gallery_faces),
+                'acuracia': hits / len(test_idx),
+                'ms_medio': float(np.mean(latencies)),
+                'ms_p95': float(np.percentile(latencies, 95)),
+                'treino_s': train_time,
+            })
+        return results
+    
     def train_all_recognizers(self, show_progress: bool = False) -> Dict[str, bool]:
         """
         Treina todos os reconhecedores
@@ -73,10 +285,10 @@ class TrainingModule:
         Returns:
             Dicionário com status de treinamento de cada reconhecedor
         """
-        if not os.path.exists(self.training_path):
+        if not os.path.exists(self.training_path) and not self.store.identities():
             raise FileNotFoundError(f"Diretório de treinamento não encontrado: {self.training_path}")
         
-        ids, faces, face_names = self.get_image_data(self.training_path)
+        ids, faces, face_names = self.load_training_data()
         
         if len(faces) == 0:
             raise ValueError("Nenhuma face encontrada no dataset")
@@ -84,9 +296,14 @@ class TrainingModule:
         print(f"\nTotal de faces: {len(faces)}")
         print(f"Total de pessoas: {len(face_names)}")
         
-        # Salva mapeamento de nomes
+        if self.prototypes_per_identity:
+            ids, faces = self.compact_gallery(ids, faces, self.prototypes_per_identity)
+            print(f"Galeria compactada: {len(faces)} protótipos "
+                  f"(até {self.prototypes_per_identity} por pessoa)")
+        
+        # Salva mapeamento de nomes (só acrescenta: pessoas removidas mantêm o id reservado)
         with open("face_names.pickle", "wb") as f:
-            pickle.dump(face_names, f)
+            pickle.dump({**self.get_face_names(), **face_names}, f)
         
         results = {}
         
@@ -96,6 +313,7 @@ class TrainingModule:
             eigen_classifier = cv2.face.EigenFaceRecognizer_create()
             eigen_classifier.train(faces, ids)
             eigen_classifier.write('eigen_classifier.yml')
+            self._publish_shared(eigen_classifier, 'eigenfaces', face_names)
             results['eigenfaces'] = True
             print('... Concluído!\n')
         except Exception as e:
@@ -116,6 +334,7 @@ class TrainingModule:
                 fisher_classifier = cv2.face.FisherFaceRecognizer_create()
                 fisher_classifier.train(faces, ids)
                 fisher_classifier.write('fisher_classifier.yml')
+                self._publish_shared(fisher_classifier, 'fisherfaces', face_names)
                 results['fisherfaces'] = True
                 print('... Concluído!\n')
         except Exception as e:
@@ -128,6 +347,7 @@ class TrainingModule:
             lbph_classifier = cv2.face.LBPHFaceRecognizer_create()
             lbph_classifier.train(faces, ids)
             lbph_classifier.write('lbph_classifier.yml')
+            self._publish_shared(lbph_classifier, 'lbph', face_names)
             results['lbph'] = True
             print('... Concluído!\n')
         except Exception as e:
@@ -136,6 +356,20 @@ class TrainingModule:
         
         return results
     
+    def _publish_shared(self, classifier, recognizer: str, face_names: Dict[str, int]):
+        """Publica o reconhecedor na galeria compartilhada, se ela estiver em uso"""
+        root = self.shared_gallery
+        if root is None:
+            if not os.path.isdir(SHARED_GALLERY_ROOT):
+                return
+            root = SHARED_GALLERY_ROOT
+        try:
+            os.makedirs(root, exist_ok=True)
+            version = export_recognizer(classifier, recognizer, root, face_names)
+            print(f'Galeria compartilhada: {recognizer} {version}')
+        except Exception as e:
+            print(f'⚠ Erro ao publicar a galeria compartilhada ({recognizer}): {e}')
+    
     def get_face_names(self) -> Dict[str, int]:
         """Carrega o mapeamento de nomes do arquivo pickle"""
         try:
@@ -143,4 +377,3 @@ class TrainingModule:
                 return pickle.load(f)
         except FileNotFoundError:
             return {}
-
@@ -0,0 +1,104 @@
+"""
+Servidor local de reconhecimento facial
+
+Carrega os modelos uma vez e atende várias portas por HTTP (ver
+modules/recognition_service.py para as rotas) e, opcionalmente, portas em
+modo borda pelo protocolo binário de recortes (modules/edge_protocol.py).
+
+Uso:
+    python recognition_server.py --port 8765 --workers 4 --batch 4
+    python recognition_server.py --port 8765 --edge-port 8766
+    curl -X POST --data-binary @frame.jpg "http://127.0.0.1:8765/reconhecer?porta=portaria"
+"""
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_manager import DatabaseManager
+from modules.face_recognition_module import FaceRecognitionModule
+from modules.recognition_service import RecognitionService, RecognitionServer
+from modules.edge_protocol import EdgeRecognitionServer
+from utils.startup import StartupTimer
+
+
+def parse_args():
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description="Servidor local de reconhecimento facial")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface de escuta (padrão: apenas local)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default="database/access_control.db", help="Caminho do banco de dados")
+    parser.add_argument("--recognizer", default="lbph", choices=["lbph", "eigenfaces", "fisherfaces"])
+    parser.add_argument("--threshold", type=float, default=100)
+    parser.add_argument("--detector", default="ssd", choices=["ssd", "ssd_onnx", "yunet"])
+    parser.add_argument("--workers", type=int, default=4, help="Pedidos atendidos ao mesmo tempo")
+    parser.add_argument("--batch", type=int, default=4, help="Máximo de frames por forward do detector")
+    parser.add_argument("--max-wait", type=float, default=0.010,
+                        help="Espera máxima (s) de um frame por companhia no lote")
+    parser.add_argument("--max-in-flight", type=int, default=32,
+                        help="Pedidos aceitos ao mesmo tempo; acima disso responde 503")
+    parser.add_argument("--edge-port", type=int, default=None,
+                        help="Porta TCP para portas em modo borda (recortes de face)")
+    parser.add_argument("--vote-window", type=int, default=7, help="Janela de votos por trilha (modo borda)")
+    parser.add_argument("--min-votes", type=int, default=4, help="Votos para decidir (modo borda)")
+    return parser.parse_args()
+
+
+def log(message: str):
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+def main():
+    """Função principal"""
+    args = parse_args()
+    stop_event = threading.Event()
+    
+    def request_stop(signum, frame):
+        log(f"Sinal {signum} recebido, encerrando...")
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    startup = StartupTimer()
+    db_manager = DatabaseManager(args.db)
+    module = FaceRecognitionModule(
+        db_manager,
+        recognizer_type=args.recognizer,
+        threshold=args.threshold,
+        detector_type=args.detector,
+        speech_backend="none",
+        startup_timer=startup,
+    )
+    module.set_log_callback(log)
+    log(startup.report())
+    
+    service = RecognitionService(module, workers=args.workers, max_batch_size=args.batch,
+                                 max_wait=args.max_wait, max_in_flight=args.max_in_flight)
+    server = RecognitionServer(service, args.port, args.host)
+    port = server.start()
+    log(f"Serviço de reconhecimento em http://{args.host}:{port} ({len(module.face_names)} identidades)")
+    
+    edge_server = None
+    if args.edge_port is not None:
+        edge_server = EdgeRecognitionServer(service, args.edge_port, args.host,
+                                            window=args.vote_window, min_votes=args.min_votes)
+        log(f"Portas em modo borda: {args.host}:{edge_server.start()}")
+    
+    try:
+        while not stop_event.wait(1.0):
+            pass
+    finally:
+        if edge_server:
+            edge_server.stop()
+        server.stop()
+        module.notification_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,7 @@ def reset_database():
     
     # Remove pastas de imagens
     print("\n1. Removendo pastas de imagens...")
-    for pasta in ['dataset', 'dataset_full']:
+    for pasta in ['dataset', 'dataset_full', 'dataset_packed']:
         if os.path.exists(pasta):
             try:
                 shutil.rmtree(pasta)
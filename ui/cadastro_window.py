@@ -12,6 +12,8 @@ from typing import Optional, Any
 
 from database.db_manager import DatabaseManager
 from modules.face_capture_module import FaceCaptureModule
+from modules.sample_quality import SampleQualityGate
+from modules.dataset_store import DatasetStore
 from modules.training_module import TrainingModule
 
 
@@ -268,14 +270,17 @@ class CadastroWindow:
                 self.captured_samples = current
                 self.window.after(0, lambda: self._update_progress(current, total))
             
-            # Captura faces
+            # Captura faces: o filtro descarta amostras ruins ou repetidas e
+            # encerra assim que houver 20 boas, então o intervalo pode ser curto
             samples = self.capture_module.capture_faces(
                 self.person_name,
                 output_path,
                 output_path_full,
                 max_samples=30,
-                capture_interval=0.33,  # 3 fotos por segundo (1/3 = 0.33)
-                progress_callback=progress_callback
+                capture_interval=0.15,
+                progress_callback=progress_callback,
+                quality_gate=SampleQualityGate(target_samples=20),
+                dataset_store=DatasetStore()
             )
             
             # Finaliza - garante que captured_samples está atualizado
@@ -318,6 +323,7 @@ class CadastroWindow:
     
     def _update_progress(self, current: int, total: int):
         """Atualiza barra de progresso"""
+        self.progress_bar['maximum'] = total
         self.progress_bar['value'] = current
         self.progress_label.config(text=f"Capturadas: {current}/{total} faces")
         # Garante que os botões permaneçam visíveis durante o progresso
@@ -530,7 +536,9 @@ class CadastroWindow:
     def _train_recognizers(self, usuario_id: int):
         """Treina reconhecedores em thread separada"""
         try:
-            training_module = TrainingModule()
+            training_module = TrainingModule(
+                shared_gallery=getattr(self.main_window, 'shared_gallery', None)
+            )
             results = training_module.train_all_recognizers()
             
             # Busca face_id do mapeamento
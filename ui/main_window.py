@@ -9,21 +9,32 @@ import numpy as np
 from typing import Optional
 from database.db_manager import DatabaseManager
 from modules.face_recognition_module import FaceRecognitionModule
+from utils.startup import StartupTimer
 
 
 class MainWindow:
     """Janela principal do sistema"""
     
-    def __init__(self, root: tk.Tk, db_manager: DatabaseManager):
+    def __init__(self, root: tk.Tk, db_manager: DatabaseManager,
+                 startup_timer: Optional[StartupTimer] = None,
+                 shared_gallery: Optional[str] = None):
         """
         Inicializa a janela principal
         
+        Os modelos do reconhecimento carregam em segundo plano: a janela aparece
+        logo e o botão de iniciar é liberado quando eles estiverem prontos.
+        
         Args:
             root: Raiz do Tkinter
             db_manager: Gerenciador do banco de dados
+            startup_timer: Recebe os tempos de inicialização por componente
+            shared_gallery: Diretório da galeria compartilhada em que cada treino
+                            do cadastro publica uma nova versão (ver TrainingModule)
         """
         self.root = root
         self.db_manager = db_manager
+        self.startup_timer = startup_timer or StartupTimer()
+        self.shared_gallery = shared_gallery
         
         self.root.title("Sistema de Controle de Acesso - Reconhecimento Facial")
         self.root.geometry("1000x700")
@@ -70,7 +81,8 @@ class MainWindow:
             left_frame, 
             text="▶ Iniciar Reconhecimento",
             command=self._start_recognition,
-            width=25
+            width=25,
+            state=tk.DISABLED  # Liberado quando os modelos terminarem de carregar
         )
         self.btn_start.grid(row=0, column=0, pady=5, sticky=tk.W+tk.E)
         
@@ -117,7 +129,7 @@ class MainWindow:
         
         self.status_label = ttk.Label(
             status_frame,
-            text="Sistema parado",
+            text="Carregando modelos...",
             font=("Arial", 10)
         )
         self.status_label.grid(row=0, column=0)
@@ -134,6 +146,16 @@ class MainWindow:
         self.access_led.grid(row=1, column=0, pady=5)
         self._draw_led("gray")
         
+        # Modo depuração: tempos por estágio no log e sobre o vídeo
+        self.profiling_var = tk.BooleanVar(value=False)
+        self.chk_profiling = ttk.Checkbutton(
+            left_frame,
+            text="⏱ Perfil de desempenho",
+            variable=self.profiling_var,
+            command=self._toggle_profiling
+        )
+        self.chk_profiling.grid(row=7, column=0, pady=5, sticky=tk.W)
+        
         # Frame direito - Vídeo e Log
         right_frame = ttk.Frame(main_frame)
         right_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -185,21 +207,46 @@ class MainWindow:
                 self.db_manager,
                 recognizer_type="lbph",
                 threshold=100,  # 10e5 = 1000000  (a large number so it will always return a prediction)
-                max_width=640
+                max_width=640,
+                background_load=True,
+                startup_timer=self.startup_timer
             )
             
             # Callbacks
             self.recognition_module.set_frame_callback(self._on_frame_received)
-            self.recognition_module.set_access_callback(self._on_access_event)
+            # Eventos de acesso chegam na thread do barramento: agenda na thread do Tk
+            self.recognition_module.set_access_callback(
+                lambda event_data: self.root.after(0, self._on_access_event, event_data)
+            )
             self.recognition_module.set_log_callback(self._log_message)
+            
+            # Detector, reconhecedor e nomes carregam em paralelo fora da thread do Tk
+            self.recognition_module.load_async(
+                lambda error: self.root.after(0, self._on_models_loaded, error)
+            )
         except Exception as e:
-            self._log_message(f"⚠ Aviso: Erro ao inicializar módulo de reconhecimento: {e}")
+            self._on_models_loaded(e)
+    
+    def _on_models_loaded(self, error: Optional[Exception]):
+        """Chamado na thread do Tk quando a carga dos modelos termina"""
+        if error is not None:
+            self.status_label.config(text="Reconhecimento indisponível")
+            self._log_message(f"⚠ Aviso: Erro ao inicializar módulo de reconhecimento: {error}")
             self._log_message("⚠ O sistema funcionará, mas o reconhecimento não estará disponível até treinar usuários.")
+        else:
+            self.status_label.config(text="Sistema parado")
+            self.btn_start.config(state=tk.NORMAL)
+            self._log_message("Modelos carregados. Reconhecimento pronto.")
+        
+        report = self.startup_timer.report()
+        print(report)
+        self._log_message(report)
     
     def _on_frame_received(self, frame: np.ndarray):
         """Callback quando um frame é processado"""
         self.current_frame = frame
-        self._update_video_display()
+        with self.recognition_module.profiler.stage('render_tk'):
+            self._update_video_display()
     
     def _update_video_display(self):
         """Atualiza a exibição do vídeo"""
@@ -242,6 +289,15 @@ class MainWindow:
             self._draw_led("red")
             self.root.after(2000, lambda: self._draw_led("gray"))
     
+    def _toggle_profiling(self):
+        """Liga/desliga a instrumentação por estágio"""
+        if not self.recognition_module:
+            return
+        
+        enabled = self.profiling_var.get()
+        self.recognition_module.set_profiling(enabled, show_overlay=enabled)
+        self._log_message("Perfil de desempenho " + ("ativado" if enabled else "desativado"))
+    
     def _draw_led(self, color: str):
         """Desenha o LED de status"""
         self.access_led.delete("all")
@@ -262,6 +318,9 @@ class MainWindow:
         if self.is_recognition_running:
             return
         
+        if not self.recognition_module or not self.recognition_module.is_ready:
+            return
+        
         try:
             self.recognition_module.start_recognition()
             self.is_recognition_running = True
@@ -326,12 +385,21 @@ class MainWindow:
     
     def _update_status(self):
         """Atualiza status do sistema"""
-        usuarios_count = len(self.db_manager.listar_usuarios(apenas_ativos=True))
+        usuarios_count = self.db_manager.contar_usuarios(apenas_ativos=True)
         self._log_message(f"Sistema inicializado. {usuarios_count} usuário(s) ativo(s) cadastrado(s).")
     
     def reload_recognizer(self):
         """Recarrega o reconhecedor (chamado após novo cadastro)"""
         if self.recognition_module:
-            self.recognition_module.reload_recognizer()
+            # A recarga espera a carga inicial e pode subir um pool de processos: fora da thread do Tk
+            self._log_message("Recarregando reconhecedor...")
+            self.recognition_module.reload_async(
+                lambda reloaded: self.root.after(0, self._on_recognizer_reloaded, reloaded)
+            )
+    
+    def _on_recognizer_reloaded(self, reloaded: bool):
+        """Chamado na thread do Tk quando a recarga do reconhecedor termina"""
+        if reloaded:
             self._log_message("Reconhecedor recarregado com sucesso")
-
+        else:
+            self._log_message("⚠ Reconhecedor não pôde ser recarregado")
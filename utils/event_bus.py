@@ -0,0 +1,193 @@
+"""
+Barramento de eventos em processo
+
+Quem publica nunca espera: cada assinante tem a sua própria thread e uma
+fila limitada. Se um assinante não acompanhar, os eventos excedentes dele
+são descartados (e contados) sem afetar os demais nem quem publica.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from utils.metrics import REGISTRY, Gauge
+
+
+EVENTOS_FILA = REGISTRY.gauge(
+    "webcam_eventos_fila", "Eventos aguardando em cada assinante", ["assinante"])
+EVENTOS_DESCARTADOS = REGISTRY.counter(
+    "webcam_eventos_descartados_total", "Eventos descartados por fila cheia", ["assinante"])
+EVENTOS_ERROS = REGISTRY.counter(
+    "webcam_eventos_erros_total", "Exceções nos assinantes", ["assinante"])
+EVENTOS_LATENCIA = REGISTRY.histogram(
+    "webcam_eventos_latencia_segundos", "Tempo entre a publicação e o fim do tratamento",
+    ["assinante"])
+
+
+class Subscription:
+    """Um assinante: fila limitada + thread própria"""
+    
+    def __init__(self, name: str, handler: Callable[[Any], None],
+                 event_types: Optional[Tuple[Type, ...]] = None, max_queue: int = 100,
+                 depth_gauge: Optional[Gauge] = None,
+                 error_callback: Optional[Callable[[str], None]] = None):
+        self.name = name
+        self.handler = handler
+        self.event_types = event_types
+        self.depth_gauge = depth_gauge
+        self.error_callback = error_callback
+        
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        
+        # Estatísticas
+        self.handled = 0
+        self.dropped = 0
+        self.errors = 0
+    
+    def accepts(self, event: Any) -> bool:
+        return self.event_types is None or isinstance(event, self.event_types)
+    
+    def _update_depth(self):
+        depth = self._queue.qsize()
+        EVENTOS_FILA.set(depth, assinante=self.name)
+        if self.depth_gauge is not None:
+            self.depth_gauge.set(depth)
+    
+    def offer(self, event: Any) -> bool:
+        """Enfileira sem bloquear; False se a fila estava cheia"""
+        try:
+            self._queue.put_nowait((event, time.perf_counter()))
+        except queue.Full:
+            self.dropped += 1
+            EVENTOS_DESCARTADOS.inc(assinante=self.name)
+            return False
+        self._update_depth()
+        return True
+    
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._worker, name=f"evento-{self.name}",
+                                        daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 2.0):
+        """Processa o que já está na fila e encerra a thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+    
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._update_depth()
+                return
+            event, published = item
+            self._update_depth()
+            try:
+                self.handler(event)
+                self.handled += 1
+            except Exception as e:
+                self.errors += 1
+                EVENTOS_ERROS.inc(assinante=self.name)
+                message = f"⚠ Erro no assinante '{self.name}': {e}"
+                if self.error_callback:
+                    self.error_callback(message)
+                else:
+                    print(message)
+            finally:
+                EVENTOS_LATENCIA.observe(time.perf_counter() - published, assinante=self.name)
+
+
+class EventBus:
+    """Distribui eventos publicados para os assinantes interessados"""
+    
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self.error_callback: Optional[Callable[[str], None]] = None
+    
+    def subscribe(self, name: str, handler: Callable[[Any], None],
+                  event_types: Optional[Sequence[Type]] = None, max_queue: int = 100,
+                  depth_gauge: Optional[Gauge] = None) -> Subscription:
+        """
+        Registra um assinante
+        
+        Args:
+            name: Nome do assinante (usado nas métricas)
+            handler: Função chamada na thread do assinante para cada evento
+            event_types: Tipos de evento aceitos (None = todos)
+            max_queue: Tamanho máximo da fila do assinante
+            depth_gauge: Gauge extra que acompanha o tamanho da fila
+        
+        Returns:
+            A assinatura criada (iniciada junto com o barramento)
+        """
+        subscription = Subscription(
+            name, handler, tuple(event_types) if event_types else None, max_queue,
+            depth_gauge, self._report_error
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+            if self._running:
+                subscription.start()
+        return subscription
+    
+    def _report_error(self, message: str):
+        if self.error_callback:
+            self.error_callback(message)
+        else:
+            print(message)
+    
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        subscription.stop()
+    
+    def publish(self, event: Any) -> int:
+        """
+        Entrega o evento às filas dos assinantes (não bloqueia)
+        
+        Returns:
+            Número de assinantes que receberam o evento
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return sum(1 for s in subscriptions if s.accepts(event) and s.offer(event))
+    
+    def start(self):
+        """Inicia as threads dos assinantes"""
+        with self._lock:
+            self._running = True
+            for subscription in self._subscriptions:
+                subscription.start()
+    
+    def stop(self, timeout: float = 2.0):
+        """Esvazia as filas e encerra as threads (pode ser iniciado de novo)"""
+        with self._lock:
+            self._running = False
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.stop(timeout)
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Estatísticas por assinante"""
+        with self._lock:
+            return {
+                s.name: {
+                    'pendentes': s.pending(),
+                    'tratados': s.handled,
+                    'descartados': s.dropped,
+                    'erros': s.errors,
+                }
+                for s in self._subscriptions
+            }
@@ -0,0 +1,266 @@
+"""
+Anel de frames em memória compartilhada entre processos
+
+Um processo escreve (captura) e um ou mais processos leem os frames por
+visões NumPy sobre a memória compartilhada, sem cópia. Cada slot tem um
+número de sequência no estilo seqlock: ímpar enquanto o escritor grava e
+2 x número do frame quando o frame está completo. O leitor confere a
+sequência ao pegar a visão e de novo depois de usá-la; se mudou, o escritor
+deu a volta no anel durante o uso (overrun) e o resultado deve ser descartado.
+
+Layout do bloco compartilhado:
+    controle  int64[6]           magic, slots, altura, largura, canais, último frame
+    slots     int64[slots, 3]    sequência, altura, largura de cada slot
+    tempos    float64[slots]     timestamp de cada frame
+    pixels    uint8[slots, altura * largura * canais]
+"""
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+MAGIC = 0x57434652  # 'WCFR'
+
+_MAGIC, _SLOTS, _HEIGHT, _WIDTH, _CHANNELS, _LAST = range(6)
+_SEQ, _SLOT_HEIGHT, _SLOT_WIDTH = range(3)
+_ALIGN = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class FrameView:
+    """Frame lido do anel (visão somente leitura sobre a memória compartilhada)"""
+    
+    __slots__ = ('ring', 'slot', 'frame_no', 'timestamp', 'frame')
+    
+    def __init__(self, ring: "FrameRing", slot: int, frame_no: int, timestamp: float,
+                 frame: np.ndarray):
+        self.ring = ring
+        self.slot = slot
+        self.frame_no = frame_no
+        self.timestamp = timestamp
+        self.frame = frame
+    
+    def valid(self) -> bool:
+        """True se o slot ainda guarda este frame (nada foi sobrescrito durante o uso)"""
+        return self.ring.holds(self.slot, self.frame_no)
+
+
+class FrameRing:
+    """
+    Anel de slots de tamanho fixo em multiprocessing.shared_memory
+    
+    Um único escritor por anel. Use FrameRing.create() no processo dono e
+    FrameRing.attach(nome) nos demais.
+    """
+    
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        
+        buffer = shm.buf
+        control = np.ndarray((6,), dtype=np.int64, buffer=buffer)
+        if control[_MAGIC] != MAGIC:
+            raise ValueError(f"Memória compartilhada '{shm.name}' não é um anel de frames")
+        
+        self.slots = int(control[_SLOTS])
+        self.capacity: Tuple[int, int, int] = (int(control[_HEIGHT]), int(control[_WIDTH]),
+                                               int(control[_CHANNELS]))
+        slot_bytes = self.capacity[0] * self.capacity[1] * self.capacity[2]
+        
+        offset = control.nbytes
+        self._meta = np.ndarray((self.slots, 3), dtype=np.int64, buffer=buffer, offset=offset)
+        offset += self._meta.nbytes
+        self._times = np.ndarray((self.slots,), dtype=np.float64, buffer=buffer, offset=offset)
+        offset = _align(offset + self._times.nbytes)
+        self._pixels = np.ndarray((self.slots, slot_bytes), dtype=np.uint8, buffer=buffer,
+                                  offset=offset)
+        self._control = control
+        self._pending: Optional[int] = None
+    
+    @staticmethod
+    def required_size(slots: int, height: int, width: int, channels: int = 3) -> int:
+        """Bytes de memória compartilhada para o anel"""
+        header = 6 * 8 + slots * 3 * 8 + slots * 8
+        return _align(header) + slots * height * width * channels
+    
+    @classmethod
+    def create(cls, slots: int, height: int, width: int, channels: int = 3,
+               name: Optional[str] = None) -> "FrameRing":
+        """
+        Cria o anel (processo dono; chame unlink() ao terminar)
+        
+        Args:
+            slots: Número de slots (frames guardados)
+            height, width, channels: Tamanho máximo de um frame
+            name: Nome da memória compartilhada (padrão: gerado pelo sistema)
+        """
+        if slots < 2:
+            raise ValueError("O anel precisa de pelo menos 2 slots")
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=cls.required_size(slots, height, width, channels))
+        control = np.ndarray((6,), dtype=np.int64, buffer=shm.buf)
+        control[:] = (MAGIC, slots, height, width, channels, 0)
+        meta = np.ndarray((slots, 3), dtype=np.int64, buffer=shm.buf, offset=control.nbytes)
+        meta[:] = 0
+        del control, meta
+        return cls(shm, owner=True)
+    
+    @classmethod
+    def attach(cls, name: str) -> "FrameRing":
+        """Abre um anel criado por outro processo"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+    
+    @property
+    def name(self) -> str:
+        return self._shm.name
+    
+    @property
+    def latest(self) -> int:
+        """Número do último frame publicado (0 = nenhum)"""
+        return int(self._control[_LAST])
+    
+    # ========== Escrita (um único processo) ==========
+    
+    def reserve(self, height: int, width: int) -> Tuple[int, np.ndarray]:
+        """
+        Reserva o próximo slot para gravação direta (ex.: cv2.resize(..., dst=visão))
+        
+        Returns:
+            (número do frame, visão gravável height x width x canais)
+        """
+        cap_height, cap_width, channels = self.capacity
+        if height > cap_height or width > cap_width:
+            raise ValueError(f"Frame {width}x{height} maior que o slot {cap_width}x{cap_height}")
+        
+        frame_no = int(self._control[_LAST]) + 1
+        slot = (frame_no - 1) % self.slots
+        meta = self._meta[slot]
+        meta[_SEQ] = 2 * frame_no - 1  # Ímpar: leitores ignoram o slot
+        meta[_SLOT_HEIGHT] = height
+        meta[_SLOT_WIDTH] = width
+        self._pending = frame_no
+        return frame_no, self._pixels[slot, :height * width * channels].reshape(height, width, channels)
+    
+    def commit(self, frame_no: int, timestamp: Optional[float] = None):
+        """Publica o frame reservado"""
+        if frame_no != self._pending:
+            raise ValueError("commit() de um frame que não foi reservado")
+        slot = (frame_no - 1) % self.slots
+        self._times[slot] = time.time() if timestamp is None else timestamp
+        self._meta[slot, _SEQ] = 2 * frame_no
+        self._control[_LAST] = frame_no
+        self._pending = None
+    
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """Copia um frame para o próximo slot e publica"""
+        frame_no, view = self.reserve(frame.shape[0], frame.shape[1])
+        view[...] = frame.reshape(view.shape)
+        self.commit(frame_no, timestamp)
+        return frame_no
+    
+    # ========== Leitura ==========
+    
+    def holds(self, slot: int, frame_no: int) -> bool:
+        return int(self._meta[slot, _SEQ]) == 2 * frame_no
+    
+    def read(self, frame_no: int) -> Optional[FrameView]:
+        """
+        Visão do frame, se ele ainda estiver no anel
+        
+        Returns:
+            FrameView (confira valid() depois de usar) ou None se o frame já
+            foi sobrescrito ou ainda não foi publicado
+        """
+        slot = (frame_no - 1) % self.slots
+        if not self.holds(slot, frame_no):
+            return None
+        height, width = int(self._meta[slot, _SLOT_HEIGHT]), int(self._meta[slot, _SLOT_WIDTH])
+        timestamp = float(self._times[slot])
+        channels = self.capacity[2]
+        frame = self._pixels[slot, :height * width * channels].reshape(height, width, channels)
+        frame.flags.writeable = False
+        if not self.holds(slot, frame_no):
+            return None
+        return FrameView(self, slot, frame_no, timestamp, frame)
+    
+    def close(self):
+        """Solta as visões e fecha o bloco neste processo"""
+        self._control = self._meta = self._times = self._pixels = None
+        self._shm.close()
+    
+    def unlink(self):
+        """Remove o bloco do sistema (apenas o dono, depois de todos fecharem)"""
+        if self.owner:
+            self._shm.unlink()
+
+
+class RingReader:
+    """
+    Cursor de leitura de um processo
+    
+    Com vários leitores, cada um fica com os frames de número
+    frame_no % count == index (os frames são divididos, não repetidos). Se o
+    leitor ficar uma volta para trás, pula para o frame mais recente dele e
+    conta os perdidos como overrun.
+    """
+    
+    def __init__(self, ring: FrameRing, index: int = 0, count: int = 1, poll_interval: float = 0.001):
+        self.ring = ring
+        self.index = index
+        self.count = count
+        self.poll_interval = poll_interval
+        self._next = self._own_at_or_after(ring.latest + 1)
+        
+        # Estatísticas
+        self.frames = 0
+        self.overruns = 0
+        self.torn = 0
+    
+    def _own_at_or_after(self, frame_no: int) -> int:
+        # Frames começam em 1; o leitor 'index' fica com frame_no % count == index
+        return frame_no + (self.index - frame_no) % self.count
+    
+    def next(self, timeout: Optional[float] = None) -> Optional[FrameView]:
+        """
+        Próximo frame deste leitor
+        
+        Returns:
+            FrameView, ou None se nada chegou no prazo
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            latest = self.ring.latest
+            if latest >= self._next:
+                # Uma volta de atraso (o slot seguinte pode estar sendo gravado): pula para o mais recente
+                if latest - self._next >= self.ring.slots - 1:
+                    newest = latest - (latest - self.index) % self.count
+                    self.overruns += (newest - self._next) // self.count
+                    self._next = newest
+                
+                frame_no = self._next
+                self._next += self.count
+                view = self.ring.read(frame_no)
+                if view is None:
+                    self.overruns += 1
+                    continue
+                self.frames += 1
+                return view
+            
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+    
+    def check(self, view: FrameView) -> bool:
+        """Confere a visão depois do uso; False (e conta) se foi sobrescrita"""
+        if view.valid():
+            return True
+        self.torn += 1
+        return False
+    
+    def stats(self) -> Dict[str, int]:
+        return {'frames': self.frames, 'overruns': self.overruns, 'rasgados': self.torn}
@@ -0,0 +1,307 @@
+"""
+Métricas do sistema no formato de texto do Prometheus
+
+Implementação mínima (sem dependências externas) de contadores, gauges e
+histogramas, com um endpoint HTTP opcional para coleta local.
+"""
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Tuple, Sequence
+
+# Buckets padrão de latência (segundos)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Formata um valor numérico como o Prometheus espera"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escapa o valor de um label"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Monta o trecho {a="1",b="2"} de uma amostra"""
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Base comum das métricas"""
+    
+    metric_type = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Converte os labels informados na chave interna"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Labels inválidos para {self.name}: {sorted(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+    
+    def render(self) -> List[str]:
+        """Retorna as linhas de exposição desta métrica"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._samples())
+        return lines
+    
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador monotônico"""
+    
+    metric_type = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not self.labelnames:
+            self._values[()] = 0.0
+    
+    def inc(self, amount: float = 1.0, **labels):
+        """Incrementa o contador"""
+        if amount < 0:
+            raise ValueError("Contadores só podem ser incrementados")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def get(self, **labels) -> float:
+        """Valor atual do contador"""
+        return self._values.get(self._key(labels), 0.0)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in items]
+
+
+class Gauge(_Metric):
+    """Valor que pode subir e descer"""
+    
+    metric_type = "gauge"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not self.labelnames:
+            self._values[()] = 0.0
+    
+    def set(self, value: float, **labels):
+        """Define o valor"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+    
+    def inc(self, amount: float = 1.0, **labels):
+        """Incrementa o valor"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels):
+        """Decrementa o valor"""
+        self.inc(-amount, **labels)
+    
+    def get(self, **labels) -> float:
+        """Valor atual"""
+        return self._values.get(self._key(labels), 0.0)
+    
+    def clear(self):
+        """Remove todas as séries (útil para métricas do tipo info)"""
+        with self._lock:
+            self._values.clear()
+            if not self.labelnames:
+                self._values[()] = 0.0
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in items]
+
+
+class Histogram(_Metric):
+    """Histograma cumulativo com buckets fixos"""
+    
+    metric_type = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # chave -> [contagens por bucket..., soma, total]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        if not self.labelnames:
+            self._values[()] = self._empty()
+    
+    def _empty(self) -> List[float]:
+        return [0.0] * (len(self.buckets) + 2)
+    
+    def observe(self, value: float, **labels):
+        """Registra uma observação"""
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._empty()
+                self._values[key] = data
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        
+        lines = []
+        for key, data in items:
+            cumulative = 0.0
+            names = self.labelnames + ("le",)
+            for i, bound in enumerate(self.buckets):
+                cumulative += data[i]
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(names, key + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {_format_value(data[-1])}")
+            base = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{base} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{base} {_format_value(data[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registro de métricas; criar uma métrica já existente devolve a mesma instância"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Métrica {name} já registrada com outro tipo")
+            return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Obtém ou cria um contador"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Obtém ou cria um gauge"""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+    
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Obtém ou cria um histograma"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+    
+    def render(self) -> str:
+        """Exposição completa no formato de texto do Prometheus"""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Registro padrão usado pelos módulos do sistema
+REGISTRY = MetricsRegistry()
+
+
+class MetricsServer:
+    """Servidor HTTP opcional que expõe /metrics"""
+    
+    def __init__(self, port: int = 9108, host: str = "127.0.0.1",
+                 registry: Optional[MetricsRegistry] = None):
+        """
+        Inicializa o servidor de métricas
+        
+        Args:
+            port: Porta TCP (0 escolhe uma porta livre)
+            host: Interface de escuta (padrão apenas local)
+            registry: Registro exposto (padrão: REGISTRY)
+        """
+        self.host = host
+        self.port = port
+        self.registry = registry or REGISTRY
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def _make_handler(self):
+        registry = self.registry
+        
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Não polui o console a cada coleta
+        
+        return _Handler
+    
+    def start(self) -> int:
+        """
+        Inicia o servidor em thread daemon
+        
+        Returns:
+            Porta efetivamente em uso
+        """
+        if self._server is not None:
+            return self.port
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.port
+    
+    def stop(self):
+        """Para o servidor"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self._thread:
+            self._thread.join(timeout=2.0)
@@ -1,76 +1,53 @@
 """
 Sistema de notificações visuais e sonoras
 """
-import winsound
 import cv2
 import numpy as np
-import threading
 import time
 from typing import Optional, Callable
 
-# Tenta importar bibliotecas de síntese de voz
+from utils.speech import SpeechWorker
+
+# winsound só existe no Windows
 try:
-    import win32com.client
-    TTS_AVAILABLE = True
-    TTS_TYPE = 'win32'
+    import winsound
 except ImportError:
-    try:
-        import pyttsx3
-        TTS_AVAILABLE = True
-        TTS_TYPE = 'pyttsx3'
-    except ImportError:
-        TTS_AVAILABLE = False
-        TTS_TYPE = None
+    winsound = None
+
+
+# Prioridades da fala (maior = mais importante)
+PRIORIDADE_ACESSO = 2
+PRIORIDADE_AVISO = 1
+PRIORIDADE_INFO = 0
 
 
 class NotificationManager:
     """Gerenciador de notificações do sistema"""
     
-    def __init__(self):
-        """Inicializa o gerenciador de notificações"""
+    def __init__(self, speech_backend: str = "auto", startup_timer=None):
+        """
+        Inicializa o gerenciador de notificações
+        
+        Args:
+            speech_backend: Síntese de voz ('auto', 'win32', 'pyttsx3' ou 'none')
+            startup_timer: StartupTimer que recebe o tempo de carga da voz
+        """
         self.callback_log: Optional[Callable[[str], None]] = None
-        self.tts_engine = None
-        self._init_tts()
+        
+        # Um único worker de voz com fila de prioridade (ver utils/speech.py)
+        self.speech = SpeechWorker(backend=speech_backend, startup_timer=startup_timer)
         
         # Controle de notificação visual ativa
         self.active_notification: Optional[dict] = None
         self.notification_duration = 5.0  # 5 segundos
     
-    def _init_tts(self):
-        """Inicializa o motor de síntese de voz"""
-        if not TTS_AVAILABLE:
-            return
-            
-        try:
-            if TTS_TYPE == 'win32':
-                self.tts_engine = win32com.client.Dispatch("SAPI.SpVoice")
-            elif TTS_TYPE == 'pyttsx3':
-                self.tts_engine = pyttsx3.init()
-                # Configura velocidade e volume
-                self.tts_engine.setProperty('rate', 150)
-                self.tts_engine.setProperty('volume', 0.8)
-        except Exception as e:
-            print(f"⚠ Aviso: Não foi possível inicializar síntese de voz: {e}")
-            self.tts_engine = None
+    def _speak(self, text: str, priority: int = PRIORIDADE_ACESSO):
+        """Enfileira um texto para a síntese de voz (não bloqueia)"""
+        self.speech.say(text.strip(), priority)
     
-    def _speak(self, text: str):
-        """Fala um texto usando síntese de voz"""
-        if not self.tts_engine:
-            return
-            
-        def speak_thread():
-            try:
-                if TTS_TYPE == 'win32':
-                    self.tts_engine.Speak(text)
-                elif TTS_TYPE == 'pyttsx3':
-                    self.tts_engine.say(text)
-                    self.tts_engine.runAndWait()
-            except Exception:
-                pass  # Ignora erros de voz
-        
-        # Executa em thread separada para não bloquear
-        thread = threading.Thread(target=speak_thread, daemon=True)
-        thread.start()
+    def close(self):
+        """Encerra o worker de voz"""
+        self.speech.stop()
     
     def _draw_notification_box(self, frame: np.ndarray, nome_usuario: str, 
                                status: str, color: tuple):
@@ -234,7 +211,7 @@ class NotificationManager:
         self._set_active_notification(nome_usuario, "LIBERADO", (0, 255, 0))
         
         # Voz ao invés de beep
-        self._speak(" ACESSO LIBERADO")
+        self._speak("ACESSO LIBERADO")
     
     def acesso_negado(self, motivo: str, nome_usuario: Optional[str] = None):
         """
@@ -293,10 +270,11 @@ class NotificationManager:
         mensagem = f"✓ Usuário {nome_usuario} cadastrado com sucesso!"
         self._log(mensagem)
         
-        try:
-            winsound.Beep(800, 300)
-        except Exception:
-            pass
+        if winsound is not None:
+            try:
+                winsound.Beep(800, 300)
+            except Exception:
+                pass
     
     def aviso(self, mensagem: str):
         """
@@ -319,7 +297,7 @@ class NotificationManager:
         self._set_active_notification("", "NENHUM USUARIO CADASTRADO", (0, 165, 255))
         
         # Voz
-        self._speak("NENHUM USUÁRIO CADASTRADO")
+        self._speak("NENHUM USUÁRIO CADASTRADO", PRIORIDADE_INFO)
     
     def usuario_desconhecido(self):
         """
@@ -0,0 +1,184 @@
+"""
+Instrumentação de tempo por estágio do pipeline de reconhecimento
+"""
+import threading
+import time
+from collections import deque
+from typing import Optional, Callable, Dict, List, Deque
+
+
+class _NullStage:
+    """Contexto vazio usado quando o profiler está desligado"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Contexto que mede a duração de um estágio"""
+    
+    __slots__ = ('profiler', 'name', 'start')
+    
+    def __init__(self, profiler: 'StageProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class StageProfiler:
+    """
+    Coleta tempos por estágio em janelas deslizantes (p50/p95/p99)
+    
+    Quando desligado, stage() devolve um contexto compartilhado que não
+    mede nada, então o custo fica em uma checagem de atributo por chamada.
+    """
+    
+    def __init__(self, enabled: bool = False, window_size: int = 500,
+                 dump_interval: float = 60.0):
+        """
+        Inicializa o profiler
+        
+        Args:
+            enabled: Se True, começa medindo imediatamente
+            window_size: Quantidade de amostras mantidas por estágio
+            dump_interval: Intervalo (segundos) entre despejos periódicos no log
+        """
+        self.enabled = enabled
+        self.window_size = window_size
+        self.dump_interval = dump_interval
+        self.show_overlay = False
+        
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._last_dump = time.time()
+        self.log_callback: Optional[Callable[[str], None]] = None
+    
+    def set_enabled(self, enabled: bool):
+        """Liga ou desliga a coleta em tempo de execução"""
+        self.enabled = enabled
+        if not enabled:
+            self.reset()
+    
+    def set_log_callback(self, callback: Callable[[str], None]):
+        """Define callback usado no despejo periódico"""
+        self.log_callback = callback
+    
+    def stage(self, name: str):
+        """
+        Retorna um contexto que mede o estágio informado
+        
+        Args:
+            name: Nome do estágio (ex: 'deteccao', 'predict')
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+    
+    def record(self, name: str, duration: float):
+        """
+        Registra uma duração (em segundos) para um estágio
+        
+        Args:
+            name: Nome do estágio
+            duration: Duração medida
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = deque(maxlen=self.window_size)
+                self._samples[name] = samples
+            samples.append(duration)
+    
+    def reset(self):
+        """Descarta todas as amostras"""
+        with self._lock:
+            self._samples.clear()
+    
+    @staticmethod
+    def _percentile(sorted_values: List[float], percentile: float) -> float:
+        """Percentil por vizinho mais próximo de uma lista ordenada"""
+        if not sorted_values:
+            return 0.0
+        index = int(round(percentile / 100.0 * (len(sorted_values) - 1)))
+        return sorted_values[index]
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Calcula estatísticas de cada estágio
+        
+        Returns:
+            {estagio: {'count', 'p50', 'p95', 'p99', 'max'}} em milissegundos
+        """
+        with self._lock:
+            snapshot = {name: list(values) for name, values in self._samples.items()}
+        
+        result = {}
+        for name, values in snapshot.items():
+            values.sort()
+            result[name] = {
+                'count': len(values),
+                'p50': self._percentile(values, 50) * 1000,
+                'p95': self._percentile(values, 95) * 1000,
+                'p99': self._percentile(values, 99) * 1000,
+                'max': (values[-1] if values else 0.0) * 1000,
+            }
+        return result
+    
+    def format_summary(self) -> List[str]:
+        """Retorna o resumo em linhas de texto (uma por estágio)"""
+        lines = []
+        for name, stats in sorted(self.summary().items()):
+            lines.append(
+                f"{name:<20} n={stats['count']:<5} p50={stats['p50']:7.2f}ms "
+                f"p95={stats['p95']:7.2f}ms p99={stats['p99']:7.2f}ms"
+            )
+        return lines
+    
+    def maybe_dump(self):
+        """Envia o resumo ao log se o intervalo de despejo tiver passado"""
+        if not self.enabled or self.log_callback is None:
+            return
+        
+        current_time = time.time()
+        if current_time - self._last_dump < self.dump_interval:
+            return
+        self._last_dump = current_time
+        
+        lines = self.format_summary()
+        if lines:
+            self.log_callback("⏱ Perfil por estágio:\n" + "\n".join(lines))
+    
+    def draw_overlay(self, frame):
+        """
+        Desenha o resumo no canto superior esquerdo do frame (modo debug)
+        
+        Args:
+            frame: Frame do OpenCV para desenhar
+        """
+        if not (self.enabled and self.show_overlay) or frame is None:
+            return
+        
+        import cv2
+        y = 18
+        for line in self.format_summary():
+            cv2.putText(frame, line, (8, y), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.4, (0, 0, 0), 3, cv2.LINE_AA)
+            cv2.putText(frame, line, (8, y), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.4, (255, 255, 255), 1, cv2.LINE_AA)
+            y += 16
@@ -0,0 +1,122 @@
+"""
+Medição do consumo de memória e CPU do processo
+"""
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.metrics import REGISTRY
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PROCESSO_MEMORIA = REGISTRY.gauge(
+    "webcam_processo_memoria_bytes", "Memória residente (RSS) do processo")
+PROCESSO_MEMORIA_PICO = REGISTRY.gauge(
+    "webcam_processo_memoria_pico_bytes", "Pico de memória residente do processo")
+
+
+def _current_rss() -> Optional[int]:
+    """RSS atual em bytes (None se não houver como medir)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss() -> Optional[int]:
+    """Pico de RSS em bytes (None se não houver como medir)"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB, macOS em bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+
+def memory_breakdown() -> Dict[str, Optional[float]]:
+    """
+    Memória do processo separando o que é compartilhado com outros processos
+    
+    Returns:
+        Dicionário com rss_mb (inclui páginas compartilhadas), pss_mb (compartilhadas
+        divididas entre os processos que as usam) e uss_mb (só deste processo);
+        None onde não houver como medir
+    """
+    values: Dict[str, Optional[int]] = {'rss': _current_rss(), 'pss': None, 'uss': None}
+    if psutil is not None:
+        try:
+            info = psutil.Process().memory_full_info()
+            values['pss'] = getattr(info, 'pss', None)
+            values['uss'] = getattr(info, 'uss', None)
+        except (psutil.AccessDenied, AttributeError):
+            pass
+    else:
+        try:
+            fields = {}
+            with open("/proc/self/smaps_rollup") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2 and parts[1].isdigit():
+                        fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+            values['pss'] = fields.get('Pss')
+            values['uss'] = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+        except OSError:
+            pass
+    return {f"{key}_mb": value / 1048576.0 if value is not None else None
+            for key, value in values.items()}
+
+
+def resource_snapshot() -> Dict[str, Optional[float]]:
+    """
+    Consumo atual do processo
+    
+    Returns:
+        Dicionário com rss_mb, pico_rss_mb, cpu_s (CPU acumulada) e threads
+    """
+    rss = _current_rss()
+    peak = _peak_rss()
+    if rss is not None:
+        PROCESSO_MEMORIA.set(rss)
+    if peak is not None:
+        PROCESSO_MEMORIA_PICO.set(peak)
+    
+    return {
+        'rss_mb': rss / 1048576.0 if rss is not None else None,
+        'pico_rss_mb': peak / 1048576.0 if peak is not None else None,
+        'cpu_s': time.process_time(),
+        'threads': threading.active_count(),
+    }
+
+
+def format_snapshot(snapshot: Dict[str, Optional[float]], elapsed: Optional[float] = None) -> str:
+    """
+    Texto de uma linha com o consumo do processo
+    
+    Args:
+        snapshot: Resultado de resource_snapshot()
+        elapsed: Segundos desde o início (para calcular o uso médio de CPU)
+    """
+    def mb(value):
+        return f"{value:.1f} MB" if value is not None else "n/d"
+    
+    text = (f"memória {mb(snapshot['rss_mb'])} (pico {mb(snapshot['pico_rss_mb'])}), "
+            f"CPU {snapshot['cpu_s']:.1f} s")
+    if elapsed:
+        text += f" ({snapshot['cpu_s'] / elapsed * 100:.1f}% de um núcleo)"
+    return text + f", {snapshot['threads']} threads"
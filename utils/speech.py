@@ -0,0 +1,221 @@
+"""
+Síntese de voz com um único worker e fila de prioridade
+
+O motor de voz (SAPI via win32com ou pyttsx3) é criado e usado sempre pela
+mesma thread: nenhum dos dois é seguro para uso concorrente, e o SAPI exige
+que o objeto COM seja usado na thread que o criou.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from utils.metrics import REGISTRY
+
+
+VOZ_MENSAGENS = REGISTRY.counter(
+    "webcam_voz_mensagens_total", "Mensagens de voz por destino", ["resultado"])
+VOZ_LATENCIA = REGISTRY.histogram(
+    "webcam_voz_latencia_segundos", "Tempo entre pedir a fala e ela começar",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0))
+VOZ_FILA = REGISTRY.gauge(
+    "webcam_voz_fila", "Mensagens de voz aguardando")
+
+
+class NullSpeechBackend:
+    """Backend sem som (servidores sem áudio ou sem biblioteca de voz)"""
+    
+    name = 'none'
+    
+    def speak(self, text: str):
+        pass
+
+
+class Win32SpeechBackend:
+    """SAPI do Windows via win32com"""
+    
+    name = 'win32'
+    
+    def __init__(self):
+        import pythoncom
+        import win32com.client
+        pythoncom.CoInitialize()
+        self.voice = win32com.client.Dispatch("SAPI.SpVoice")
+    
+    def speak(self, text: str):
+        self.voice.Speak(text)
+
+
+class Pyttsx3SpeechBackend:
+    """pyttsx3 (multiplataforma)"""
+    
+    name = 'pyttsx3'
+    
+    def __init__(self, rate: int = 150, volume: float = 0.8):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', rate)
+        self.engine.setProperty('volume', volume)
+    
+    def speak(self, text: str):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+
+SPEECH_BACKENDS = {
+    'win32': Win32SpeechBackend,
+    'pyttsx3': Pyttsx3SpeechBackend,
+    'none': NullSpeechBackend,
+}
+
+
+def create_speech_backend(kind: str = "auto"):
+    """
+    Cria o backend de voz
+    
+    Args:
+        kind: 'auto' (win32, depois pyttsx3, depois sem som), 'win32', 'pyttsx3' ou 'none'
+    """
+    if kind != "auto":
+        if kind not in SPEECH_BACKENDS:
+            raise ValueError(f"Backend de voz inválido: {kind}")
+        return SPEECH_BACKENDS[kind]()
+    
+    for candidate in ('win32', 'pyttsx3'):
+        try:
+            return SPEECH_BACKENDS[candidate]()
+        except Exception:
+            continue
+    return NullSpeechBackend()
+
+
+class SpeechWorker:
+    """
+    Fala mensagens em ordem de prioridade, uma de cada vez
+    
+    - A fila é limitada: cheia, a mensagem menos prioritária (ou a nova) é descartada
+    - Uma mensagem igual a outra ainda pendente é agrupada com ela
+    - Mensagens que esperaram mais do que o prazo são descartadas sem falar
+    """
+    
+    def __init__(self, backend: str = "auto", max_queue: int = 4, max_age: float = 3.0,
+                 backend_factory: Optional[Callable[[], object]] = None,
+                 startup_timer=None):
+        """
+        Inicializa o worker (o backend é criado na thread do worker)
+        
+        Args:
+            backend: Backend passado a create_speech_backend
+            max_queue: Máximo de mensagens pendentes
+            max_age: Prazo padrão (segundos) para uma mensagem começar a ser falada
+            backend_factory: Fábrica alternativa do backend
+            startup_timer: StartupTimer (utils/startup.py) que recebe o tempo de
+                           criação do backend como componente 'voz'
+        """
+        self.max_queue = max_queue
+        self.max_age = max_age
+        self._factory = backend_factory or (lambda: create_speech_backend(backend))
+        self._startup_timer = startup_timer
+        
+        # Heap de (-prioridade, ordem, texto, enfileirada_em, prazo)
+        self._heap: List[Tuple[int, int, str, float, float]] = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._running = True
+        self.backend_name: Optional[str] = None
+        self._ready = threading.Event()
+        
+        self._thread = threading.Thread(target=self._worker, name="voz", daemon=True)
+        self._thread.start()
+    
+    @property
+    def available(self) -> bool:
+        """True se há um backend com som"""
+        self._ready.wait(timeout=5.0)
+        return self.backend_name not in (None, 'none')
+    
+    def say(self, text: str, priority: int = 1, max_age: Optional[float] = None) -> bool:
+        """
+        Enfileira uma mensagem (não bloqueia)
+        
+        Args:
+            text: Texto a falar
+            priority: Maior = mais importante
+            max_age: Prazo em segundos (padrão: self.max_age)
+        
+        Returns:
+            False se a mensagem foi agrupada ou descartada
+        """
+        now = time.monotonic()
+        deadline = now + (self.max_age if max_age is None else max_age)
+        
+        with self._cond:
+            # Agrupa com uma mensagem igual ainda pendente (mantém a mais prioritária)
+            for i, (neg_priority, order, pending_text, enqueued, old_deadline) in enumerate(self._heap):
+                if pending_text == text:
+                    self._heap[i] = (min(neg_priority, -priority), order, text,
+                                     enqueued, max(old_deadline, deadline))
+                    heapq.heapify(self._heap)
+                    VOZ_MENSAGENS.inc(resultado="agrupada")
+                    return False
+            
+            if len(self._heap) >= self.max_queue:
+                worst = max(self._heap)  # menor prioridade; entre iguais, a mais recente
+                if worst[0] <= -priority:
+                    VOZ_MENSAGENS.inc(resultado="descartada")
+                    return False
+                self._heap.remove(worst)
+                heapq.heapify(self._heap)
+                VOZ_MENSAGENS.inc(resultado="descartada")
+            
+            heapq.heappush(self._heap, (-priority, next(self._order), text, now, deadline))
+            VOZ_FILA.set(len(self._heap))
+            self._cond.notify()
+        return True
+    
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+    
+    def _worker(self):
+        start = time.perf_counter()
+        try:
+            backend = self._factory()
+        except Exception as e:
+            print(f"⚠ Aviso: Não foi possível inicializar síntese de voz: {e}")
+            backend = NullSpeechBackend()
+        if self._startup_timer is not None:
+            self._startup_timer.record('voz', start, time.perf_counter())
+        self.backend_name = backend.name
+        self._ready.set()
+        
+        while True:
+            with self._cond:
+                while self._running and not self._heap:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                _, _, text, enqueued, deadline = heapq.heappop(self._heap)
+                VOZ_FILA.set(len(self._heap))
+            
+            now = time.monotonic()
+            if now > deadline:
+                VOZ_MENSAGENS.inc(resultado="expirada")
+                continue
+            
+            VOZ_LATENCIA.observe(now - enqueued)
+            try:
+                backend.speak(text)
+                VOZ_MENSAGENS.inc(resultado="falada")
+            except Exception:
+                VOZ_MENSAGENS.inc(resultado="erro")
+    
+    def stop(self, timeout: float = 2.0):
+        """Descarta as mensagens pendentes e encerra o worker"""
+        with self._cond:
+            self._running = False
+            self._heap = []
+            VOZ_FILA.set(0)
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
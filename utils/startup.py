@@ -0,0 +1,65 @@
+"""
+Tempos de inicialização por componente
+
+Os componentes podem carregar em paralelo (threads diferentes); o relatório
+mostra quando cada um começou e quanto durou, em relação ao início do programa.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from utils.metrics import REGISTRY
+
+
+INICIALIZACAO_TEMPO = REGISTRY.gauge(
+    "webcam_inicializacao_segundos", "Duração de cada etapa da inicialização", ["componente"])
+
+
+class StartupTimer:
+    """Registra início e duração de cada componente da inicialização"""
+    
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Args:
+            origin: Instante (time.perf_counter) tomado como início do programa
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self._timings: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, component: str, start: float, end: float):
+        """Registra um componente medido com time.perf_counter()"""
+        with self._lock:
+            self._timings[component] = (start - self.origin, end - start)
+        INICIALIZACAO_TEMPO.set(end - start, componente=component)
+    
+    @contextmanager
+    def measure(self, component: str):
+        """Mede o bloco como o componente informado (registra mesmo se falhar)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(component, start, time.perf_counter())
+    
+    def timings(self) -> Dict[str, Tuple[float, float]]:
+        """Componente -> (início relativo, duração) em segundos"""
+        with self._lock:
+            return dict(self._timings)
+    
+    def report(self) -> str:
+        """Relatório de várias linhas, em ordem de início"""
+        timings = sorted(self.timings().items(), key=lambda item: item[1][0])
+        if not timings:
+            return "Inicialização: nenhum componente medido"
+        
+        width = max(len(name) for name, _ in timings)
+        lines = ["Inicialização:"]
+        for name, (offset, duration) in timings:
+            lines.append(f"  {name:<{width}}  {duration * 1000:8.1f} ms  (início +{offset * 1000:.0f} ms)")
+        
+        total = max(offset + duration for _, (offset, duration) in timings)
+        busy = sum(duration for _, (_, duration) in timings)
+        lines.append(f"  {'total':<{width}}  {total * 1000:8.1f} ms  (soma das etapas {busy * 1000:.0f} ms)")
+        return "\n".join(lines)
@@ -0,0 +1,119 @@
+"""
+Mapa de chaves com expiração (cooldowns de notificação e registro)
+"""
+import heapq
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Conjunto de chaves que expiram após um tempo de vida próprio
+    
+    As expirações ficam em um heap; cada consulta remove apenas as entradas
+    já vencidas do topo (custo amortizado O(log n) por chave inserida), de
+    modo que a memória acompanha o número de cooldowns ativos e não o número
+    de chaves já vistas. max_size limita o pior caso: ao estourar, as chaves
+    que venceriam primeiro são descartadas.
+    """
+    
+    def __init__(self, max_size: int = 10000, clock: Callable[[], float] = time.monotonic):
+        """
+        Inicializa o mapa
+        
+        Args:
+            max_size: Número máximo de chaves ativas
+            clock: Relógio monotônico (substituível para simulações)
+        """
+        self.max_size = max_size
+        self.clock = clock
+        
+        self._expiry: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = 0  # Desempate no heap (chaves podem não ser comparáveis)
+        self._lock = threading.Lock()
+    
+    def _purge(self, now: float):
+        """Remove as chaves vencidas (e entradas obsoletas do heap)"""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expiry, _, key = heapq.heappop(heap)
+            if self._expiry.get(key) == expiry:
+                del self._expiry[key]
+        
+        # Entradas substituídas ficam no heap até vencer; compacta se acumularem
+        if len(heap) > 2 * len(self._expiry) + 64:
+            self._heap = [(exp, i, key) for i, (key, exp) in enumerate(self._expiry.items())]
+            heapq.heapify(self._heap)
+            self._counter = len(self._heap)
+    
+    def _set(self, key: Hashable, ttl: float, now: float):
+        """Ativa a chave (chamado com o lock adquirido)"""
+        if ttl <= 0:
+            self._expiry.pop(key, None)
+            return
+        
+        expiry = now + ttl
+        self._expiry[key] = expiry
+        self._counter += 1
+        heapq.heappush(self._heap, (expiry, self._counter, key))
+        
+        while len(self._expiry) > self.max_size:
+            old_expiry, _, old_key = heapq.heappop(self._heap)
+            if self._expiry.get(old_key) == old_expiry:
+                del self._expiry[old_key]
+    
+    def set(self, key: Hashable, ttl: float):
+        """Ativa (ou renova) a chave por ttl segundos"""
+        with self._lock:
+            now = self.clock()
+            self._purge(now)
+            self._set(key, ttl, now)
+    
+    def remaining(self, key: Hashable) -> float:
+        """Segundos até a chave expirar (0 se não estiver ativa)"""
+        with self._lock:
+            now = self.clock()
+            self._purge(now)
+            expiry = self._expiry.get(key)
+            return expiry - now if expiry is not None else 0.0
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self.remaining(key) > 0
+    
+    def acquire(self, key: Hashable, ttl: float) -> bool:
+        """
+        Ativa a chave se ela não estiver ativa
+        
+        Returns:
+            True se a chave foi ativada agora; False se ainda estava em cooldown
+        """
+        with self._lock:
+            now = self.clock()
+            self._purge(now)
+            if key in self._expiry:
+                return False
+            self._set(key, ttl, now)
+            return True
+    
+    def discard(self, key: Hashable):
+        """Desativa a chave (a entrada do heap é descartada ao vencer)"""
+        with self._lock:
+            self._expiry.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._expiry.clear()
+            self._heap = []
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge(self.clock())
+            return len(self._expiry)
+    
+    def get(self, key: Hashable) -> Optional[float]:
+        """Instante (no relógio do mapa) em que a chave expira, ou None"""
+        with self._lock:
+            self._purge(self.clock())
+            return self._expiry.get(key)